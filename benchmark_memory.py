@@ -0,0 +1,200 @@
+"""Measure the memory used per cached station.
+
+Builds a synthetic cache of 100k stations with the current classes and with
+a copy of the previous dict based classes, then reports bytes per station.
+The current classes are measured again once every station has been
+serialized, as queries leave the serialized form cached on each location.
+A synthetic UK refresh is also parsed through the CMA parser with and
+without string interning.
+Run with: python benchmark_memory.py [station count]
+"""
+
+import asyncio
+import gc
+import json
+import logging
+import random
+import sys
+import tracemalloc
+
+from contextlib import contextmanager
+from datetime import datetime
+
+from pyfuelprices import fuel as fuel_module
+from pyfuelprices import fuel_locations as fuel_locations_module
+from pyfuelprices.fuel import Fuel
+from pyfuelprices.fuel_locations import FuelLocation
+from pyfuelprices.sources import Source
+from pyfuelprices.sources.uk import CMAParserMixIn
+
+_LOGGER = logging.getLogger(__name__)
+
+STATIONS = 100_000
+UK_STATIONS = 8_500
+FUEL_TYPES = ["E10", "E5", "B7", "SDV"]
+UK_BRANDS = [
+    "ASDA", "BP", "ESSO", "SHELL", "TEXACO", "TESCO", "SAINSBURY'S",
+    "MORRISONS", "JET", "GULF", "APPLEGREEN", "MFG", "RONTEC", "ASCONA", "MURCO"
+]
+
+
+class LegacyFuel:
+    """Fuel as it was stored before __slots__."""
+
+    _fuel_type: str
+    _cost: float
+    _props: dict
+
+    def __init__(self, fuel_type: str, cost: float, props: dict = None):
+        self._fuel_type = fuel_type
+        self._cost = cost
+        self._props = props
+
+
+class LegacyFuelLocation:
+    """FuelLocation as it was stored before __slots__."""
+
+    _id = ""
+    _name = ""
+    _address = ""
+    lat = 0.0
+    long = 0.0
+    _brand = ""
+    available_fuels: list = []
+    _currency = ""
+    _postal_code: str | None = None
+    last_updated: datetime | None = None
+    next_update: datetime | None = None
+    last_access: datetime | None = None
+    props: dict = {}
+
+
+def build(location_cls, fuel_cls, count: int) -> dict:
+    """Build a synthetic location cache."""
+    random.seed(0)
+    now = datetime.now()
+    cache = {}
+    for i in range(count):
+        location = location_cls()
+        location._id = f"provider_{i}"
+        location._name = f"Station {i}"
+        location._address = f"{i} High Street"
+        location.lat = random.uniform(50.0, 58.0)
+        location.long = random.uniform(-5.0, 1.5)
+        location._brand = random.choice(["BP", "SHELL", "ESSO", "TEXACO"])
+        location.available_fuels = [
+            fuel_cls(fuel_type, round(random.uniform(1.3, 1.7), 3), {})
+            for fuel_type in FUEL_TYPES
+        ]
+        location._currency = "GBP"
+        location._postal_code = f"AB{i % 100} {i % 10}CD"
+        location.last_updated = now
+        location.props = {"source": "provider"}
+        cache[location._id] = location
+    return cache
+
+
+def measure(location_cls, fuel_cls, count: int, serialize: bool = False) -> float:
+    """Return the bytes still allocated per station once the cache is built."""
+    gc.collect()
+    tracemalloc.start()
+    cache = build(location_cls, fuel_cls, count)
+    if serialize:
+        for location in cache.values():
+            location.serialized()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del cache
+    return size / count
+
+
+class BenchmarkCMASource(CMAParserMixIn, Source):
+    """A CMA source parsing a local payload."""
+
+    provider_name = "benchmark"
+    location_cache: dict[str, FuelLocation] = {}
+
+
+def uk_payload(count: int) -> str:
+    """Return a synthetic CMA payload as served by the UK retailers."""
+    random.seed(0)
+    return json.dumps({"stations": [
+        {
+            "site_id": f"gb{i}",
+            "brand": random.choice(UK_BRANDS),
+            "address": f"{i} High Street",
+            "postcode": f"AB{i % 100} {i % 10}CD",
+            "location": {
+                "latitude": random.uniform(50.0, 58.0),
+                "longitude": random.uniform(-5.0, 1.5)
+            },
+            "prices": {
+                fuel_type: round(random.uniform(130, 170), 1)
+                for fuel_type in FUEL_TYPES
+            }
+        }
+        for i in range(count)
+    ]})
+
+
+@contextmanager
+def interning_disabled():
+    """Temporarily replace string interning with a no-op."""
+    def identity(value):
+        return value
+    original = fuel_module.intern_string
+    fuel_module.intern_string = identity
+    fuel_locations_module.intern_string = identity
+    try:
+        yield
+    finally:
+        fuel_module.intern_string = original
+        fuel_locations_module.intern_string = original
+
+
+async def uk_refresh(payload: str, refreshes: int = 2) -> int:
+    """Return the bytes retained after parsing a UK refresh a number of times."""
+    BenchmarkCMASource.location_cache = {}
+    source = BenchmarkCMASource()
+    gc.collect()
+    tracemalloc.start()
+    for _ in range(refreshes):
+        await source.parse_response(json.loads(payload))
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    await source._client_session.close()
+    BenchmarkCMASource.location_cache = {}
+    return size
+
+
+def main():
+    """Run the benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else STATIONS
+    payload = uk_payload(UK_STATIONS)
+    with interning_disabled():
+        uk_before = asyncio.run(uk_refresh(payload))
+    uk_after = asyncio.run(uk_refresh(payload))
+    before = measure(LegacyFuelLocation, LegacyFuel, count)
+    after = measure(FuelLocation, Fuel, count)
+    serialized = measure(FuelLocation, Fuel, count, serialize=True)
+    _LOGGER.info("Stations: %s (Python %s.%s)", count, *sys.version_info[:2])
+    _LOGGER.info("Before: %.0f bytes per station", before)
+    _LOGGER.info("After: %.0f bytes per station (%+.0f%%)",
+                 after, 100 * (after - before) / before)
+    _LOGGER.info("After, serialized form cached: %.0f bytes per station (%+.0f%%)",
+                 serialized, 100 * (serialized - before) / before)
+    _LOGGER.info("UK refresh of %s stations: %.0f bytes per station without interning, "
+                 "%.0f interned (%+.0f%%)",
+                 UK_STATIONS, uk_before / UK_STATIONS, uk_after / UK_STATIONS,
+                 100 * (uk_after - uk_before) / uk_before)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(name)s %(levelname)s: %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+    main()
@@ -2,21 +2,50 @@
 
 import logging
 import asyncio
+import heapq
+import itertools
 
+from collections.abc import Callable, Hashable, Mapping
 from datetime import timedelta
 
 import aiohttp
 
 from pyfuelprices.sources import (
     Source,
-    UpdateFailedError
+    UpdateFailedError,
+    nearest_locations
 )
 from pyfuelprices.sources.mapping import SOURCE_MAP, COUNTRY_MAP, FULL_COUNTRY_MAP
-from .const import PROP_FUEL_LOCATION_SOURCE
+from .access import ACCESS_CLOCK
+from .areas import EXPANSION_FACTOR, MAX_EXPANSION_STEPS
+from .const import (
+    PROP_AREA_LAT,
+    PROP_AREA_LONG,
+    PROP_AREA_RADIUS,
+    PROP_FUEL_LOCATION_DYNAMIC_BUILD,
+    PROP_FUEL_LOCATION_SOURCE,
+    PROP_QUERY_FUEL_TYPE,
+    CONF_SHARED_SNAPSHOT_ATTACH,
+    CONF_SHARED_SNAPSHOT_PUBLISH,
+    CONF_SNAPSHOT_PATH
+)
+from .delta import UpdateDelta
+from .distances import (
+    bounding_box,
+    haversine,
+    segment_offsets,
+    sites_within_radius,
+    within_radius
+)
 from .enum import SupportsConfigType
 from .helpers import geocoder
+from .paging import encode_cursor, select_page
+from .query_cache import RadiusQueryCache
 from .fuel_locations import FuelLocation
 from .schemas import BASE_CONFIG_SCHEMA
+from .shared import SharedSnapshotReader, build_shared_snapshot, publish_shared_snapshot
+from .snapshot import read_snapshot, write_snapshot
+from .spatial import GridIndex
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,73 +53,407 @@ class FuelPrices:
     """The base fuel prices entry class."""
 
     configured_sources: dict[str, Source] = {}
-    configured_areas: list[dict] = []
+    _configured_areas: list[dict] = []
     _global_config: dict = {}
     _accessed_sites: dict[str, str] = {}
+    location_tree: GridIndex = None
+    query_cache: RadiusQueryCache = None
+    snapshot_path: str | None = None
+    _snapshot_loaded: bool = False
+    shared_snapshot_dir: str | None = None
+    _shared_generation: int | None = None
+    shared_snapshot: SharedSnapshotReader | None = None
     client_session: aiohttp.ClientSession = None
     _semaphore: asyncio.Semaphore = asyncio.Semaphore(4)
-    async def update(self, force: bool=False):
-        """Main data fetch / update handler."""
+
+    @property
+    def configured_areas(self) -> list[dict]:
+        """Return the configured areas."""
+        return self._configured_areas
+
+    @configured_areas.setter
+    def configured_areas(self, new_val: list[dict]):
+        """Set the configured areas of this instance and every configured source."""
+        self._configured_areas = new_val or []
+        for src in self.configured_sources.values():
+            src.configured_areas = self._configured_areas
+
+    async def update(self, force: bool=False) -> dict[str, UpdateDelta]:
+        """Main data fetch / update handler.
+
+        Returns the changes made to each source cache since the previous
+        update, sources without changes are left out. If any source fails
+        the changes are kept and returned by the next successful update.
+        Instances attached to a shared snapshot never fetch, they only swap
+        to the latest published generation. A configured snapshot is loaded
+        by the first update and only written again after an update changed
+        a source cache, the same applies to publishing a shared snapshot.
+        """
         async def update_src(s: Source, a: list[dict], f: bool):
             """Update source."""
             try:
                 async with self._semaphore:
                     await s.update(areas=a, force=f)
+                s.evict_cache()
             except TimeoutError as err:
                 _LOGGER.warning("Timeout updating %s: %s", s.provider_name, err)
             except (ValueError, TypeError) as err:
                 _LOGGER.exception(err)
+        if self.shared_snapshot is not None:
+            self.shared_snapshot.refresh()
+            return {}
+        if self.snapshot_path is not None and not self._snapshot_loaded:
+            await self.load_snapshot()
+        # reads made from here on are recorded against a new access tick
+        ACCESS_CLOCK.advance()
         coros = [
             update_src(s, self.configured_areas, force) for s in self.configured_sources.values()
         ]
         exceptions = await asyncio.gather(*coros, return_exceptions=True)
+        changed = any(src.has_changes for src in self.configured_sources.values())
+        if self.snapshot_path is not None and changed:
+            await self.save_snapshot()
+        if self.shared_snapshot_dir is not None and (changed or self._shared_generation is None):
+            await self.publish_shared_snapshot()
         for exc in exceptions:
             if isinstance(exc, Exception):
                 raise UpdateExceptionGroup([x for x in exceptions if isinstance(x, Exception)])
+        deltas = {}
+        for source_id, src in self.configured_sources.items():
+            delta = src.take_delta()
+            if delta:
+                deltas[source_id] = delta
+        return deltas
+
+    async def save_snapshot(self, path: str | None = None):
+        """Persist the cache of every configured source for a warm start.
+
+        Locations are converted and written in a worker thread.
+        """
+        path = path or self.snapshot_path
+        sources = {
+            source_id: src.snapshot() for source_id, src in self.configured_sources.items()
+        }
+        try:
+            await asyncio.to_thread(write_snapshot, path, sources)
+        except (OSError, RuntimeError, TypeError, ValueError) as err:
+            _LOGGER.warning("Unable to save snapshot to %s: %s", path, err)
+
+    async def load_snapshot(self, path: str | None = None) -> int:
+        """Restore the caches of configured sources from a snapshot.
+
+        The file is read and decoded in a worker thread.
+        """
+        path = path or self.snapshot_path
+        self._snapshot_loaded = True
+        restored = 0
+        for source_id, state in (await asyncio.to_thread(read_snapshot, path)).items():
+            src = self.configured_sources.get(source_id)
+            if src is not None:
+                restored += src.load_snapshot(state)
+        _LOGGER.debug("Restored %s locations from %s", restored, path)
+        return restored
+
+    async def publish_shared_snapshot(self, directory: str | None = None) -> int | None:
+        """Publish every source cache as a new shared snapshot generation.
+
+        Returns the generation written, other processes can then query it
+        through attach_shared_snapshot. The snapshot is built from copies of
+        the caches and written in a worker thread.
+        """
+        directory = directory or self.shared_snapshot_dir
+        caches = {
+            source_id: dict(src.location_cache)
+            for source_id, src in self.configured_sources.items()
+        }
+
+        def build_and_publish() -> int:
+            """Encode the copied caches and publish them."""
+            return publish_shared_snapshot(directory, build_shared_snapshot(caches))
+
+        try:
+            self._shared_generation = await asyncio.to_thread(build_and_publish)
+        except (OSError, RuntimeError) as err:
+            _LOGGER.warning("Unable to publish shared snapshot to %s: %s", directory, err)
+            return None
+        return self._shared_generation
+
+    def attach_shared_snapshot(self, directory: str) -> SharedSnapshotReader:
+        """Answer queries from the snapshots another process publishes to a directory."""
+        self.shared_snapshot = SharedSnapshotReader(directory)
+        return self.shared_snapshot
 
     async def get_fuel_location(self, site_id: str, source_id: str) -> FuelLocation:
         """Retrieve a single fuel location (supporting dynamic parse)."""
         if site_id not in self._accessed_sites:
             self._accessed_sites[site_id] = source_id
+        if self.shared_snapshot is not None:
+            snapshot = self.shared_snapshot.current()
+            site = None if snapshot is None else snapshot.get(site_id, source_id)
+            if site is None:
+                raise KeyError(site_id)
+            return site
         return await self.configured_sources[source_id].get_site(site_id)
 
+    def _query_index(self,
+                     source_id: str = "") -> tuple[GridIndex, Callable[[Hashable], FuelLocation | None]]:
+        """Return the spatial index to query and a function resolving its keys."""
+        if self.shared_snapshot is not None:
+            return self.shared_snapshot.query_index(source_id)
+        for src in self.configured_sources.values():
+            src.sync_location_tree()
+
+        def resolve(key) -> FuelLocation | None:
+            if source_id not in ("", key[0]):
+                return None
+            src = self.configured_sources.get(key[0])
+            if src is None:
+                return None
+            return src.location_cache.get(key[1])
+
+        return self.location_tree, resolve
+
+    async def _sites_from_tree(self,
+                               coordinates,
+                               radius: float,
+                               source_id: str = "") -> list[tuple[FuelLocation, float]]:
+        """Return (site, miles) across all sources using the shared spatial index."""
+        if self.shared_snapshot is not None:
+            snapshot = self.shared_snapshot.current()
+            if snapshot is None:
+                return []
+            return snapshot.sites_within(coordinates, radius, source_id)
+        tree, resolve = self._query_index(source_id)
+        candidates = [
+            site for site in map(resolve, list(tree.query_radius(
+                coordinates[0], coordinates[1], radius
+            ))) if site is not None
+        ]
+        sites = sites_within_radius(coordinates, candidates, radius)
+        for site, _ in sites:
+            site.last_access = ACCESS_CLOCK.tick
+            await site.dynamic_build_fuels()
+        return sites
+
+    async def _search_location_tree(self,
+                                    coordinates,
+                                    radius: float,
+                                    source_id: str = "") -> list[dict]:
+        """Search all configured sources at once using the shared spatial index."""
+        if self.shared_snapshot is not None:
+            self.shared_snapshot.current()
+            version = (source_id, self.shared_snapshot.generation)
+        else:
+            for src in self.configured_sources.values():
+                src.sync_location_tree()
+            version = tuple(
+                (s_id, src.cache_version) for s_id, src in self.configured_sources.items()
+            )
+        sites = self.query_cache.get(coordinates, radius, version)
+        if sites is not None:
+            for site, _ in sites:
+                site.last_access = ACCESS_CLOCK.tick
+        else:
+            sites = await self._sites_from_tree(coordinates, radius, source_id)
+            if not any(
+                (site.props or {}).get(PROP_FUEL_LOCATION_DYNAMIC_BUILD, False)
+                for site, _ in sites
+            ):
+                self.query_cache.put(coordinates, radius, version, sites)
+        return [
+            site.as_result(distance=dist)
+            for site, dist in sites
+        ]
+
+    async def _sources_for_point(self, coordinates) -> list[Source]:
+        """Return the configured sources covering the country of a point."""
+        try:
+            geocoded = await geocoder.country_code_lookup(coordinates)
+        except Exception as e:
+            _LOGGER.error(f"Geocoding failed: {e}")
+            return [] # Or handle the error as appropriate
+        if geocoded is None or geocoded.upper() not in FULL_COUNTRY_MAP:
+            raise ValueError("No data source exists for the given coordinates.", geocoded)
+        return [
+            self.configured_sources[src]
+            for src in FULL_COUNTRY_MAP.get(geocoded.upper(), [])
+            if src in self.configured_sources
+        ]
+
+    async def _find_sites(self,
+                          coordinates,
+                          radius: float,
+                          source_id: str = "") -> list[tuple[FuelLocation, float]]:
+        """Return (site, miles) within a radius, fetching on miss where supported."""
+        if self.shared_snapshot is not None:
+            return await self._sites_from_tree(coordinates, radius, source_id)
+        if source_id != "":
+            return await self.configured_sources[source_id].find_sites(coordinates, radius)
+        sites = await self._sites_from_tree(coordinates, radius)
+        if len(sites) > 0:
+            return sites
+        for src in await self._sources_for_point(coordinates):
+            sites.extend(await src.find_sites(coordinates, radius))
+        return sites
+
+    async def _expand_sites(self,
+                            coordinates,
+                            radius: float,
+                            source_id: str,
+                            min_results: int,
+                            max_radius: float | None = None,
+                            fuel_type: str | None = None) -> list[tuple[FuelLocation, float]]:
+        """Grow the search radius until at least min_results sites are found.
+
+        Each step first checks the local index at the larger radius, fetch on
+        miss sources are then only asked for the ring that was just added.
+        """
+        def count(sites: list[tuple[FuelLocation, float]]) -> int:
+            if fuel_type is None:
+                return len(sites)
+            matched = 0
+            for site, _ in sites:
+                try:
+                    matched += site.get_fuel(fuel_type).cost > 0
+                except ValueError:
+                    continue
+            return matched
+
+        if max_radius is None:
+            max_radius = radius * EXPANSION_FACTOR ** MAX_EXPANSION_STEPS
+        sites = await self._find_sites(coordinates, radius, source_id)
+        while count(sites) < min_results and radius < max_radius:
+            inner, radius = radius, min(radius * EXPANSION_FACTOR, max_radius)
+            _LOGGER.debug("Found %s of %s results, expanding search at %s to %s miles.",
+                          count(sites), min_results, coordinates, radius)
+            sites = await self._sites_near(coordinates, radius, source_id)
+            if count(sites) >= min_results:
+                break
+            await self._fetch_annulus(coordinates, inner, radius, source_id)
+            sites = await self._sites_near(coordinates, radius, source_id)
+        return sites
+
+    async def _sites_near(self,
+                          coordinates,
+                          radius: float,
+                          source_id: str = "") -> list[tuple[FuelLocation, float]]:
+        """Return (site, miles) from the local caches only."""
+        if self.shared_snapshot is not None:
+            return await self._sites_from_tree(coordinates, radius, source_id)
+        if source_id != "":
+            return await self.configured_sources[source_id].find_sites(
+                coordinates, radius, fetch=False
+            )
+        return await self._sites_from_tree(coordinates, radius)
+
+    async def _fetch_annulus(self, coordinates, inner: float, outer: float, source_id: str = ""):
+        """Ask fetch on miss sources to populate the ring between two radii."""
+        if self.shared_snapshot is not None:
+            return
+        if source_id != "":
+            sources = [self.configured_sources[source_id]]
+        else:
+            sources = await self._sources_for_point(coordinates)
+
+        async def fetch(s: Source):
+            """Fetch the ring for a single source."""
+            async with self._semaphore:
+                await s.fetch_annulus(coordinates, inner, outer)
+
+        results = await asyncio.gather(
+            *[fetch(src) for src in sources if src.fetch_on_miss],
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                _LOGGER.error("Fetching search ring failed: %s", result)
+
+    def _locations_page(self,
+                        sites: list[tuple[FuelLocation, float]],
+                        limit: int | None,
+                        offset: int,
+                        cursor: str | None) -> list[dict]:
+        """Return a single page of locations ordered by distance."""
+        page = select_page(
+            [((dist, site.id), site) for site, dist in sites],
+            key=lambda row: row[0],
+            limit=limit,
+            offset=offset,
+            cursor=cursor
+        )
+        return [
+            site.as_result(
+                distance=key[0],
+                cursor=encode_cursor(key)
+            )
+            for key, site in page
+        ]
+
     async def find_fuel_locations_from_point(self,
-                                       coordinates,
-                                       radius: float,
-                                       source_id: str = "") -> list[dict]:
-        """Retrieve all fuel locations from a single point."""
+                                             coordinates,
+                                             radius: float,
+                                             source_id: str = "",
+                                             limit: int | None = None,
+                                             offset: int = 0,
+                                             cursor: str | None = None,
+                                             min_results: int | None = None,
+                                             max_radius: float | None = None) -> list[dict]:
+        """Retrieve all fuel locations from a single point.
+
+        When limit, offset or cursor are given, only that page of the results
+        (ordered by distance) is returned and each result includes a cursor
+        that can be passed back to continue after it. When min_results is
+        given the radius is grown (up to max_radius) until enough are found.
+        """
         _LOGGER.debug("Searching for all fuel locations at point %s with a %s "
                       "mile radius for source %s.",
                       coordinates,
                       radius,
                       source_id if source_id != "" else "any")
-        if source_id != "":
+        if min_results is not None:
+            return self._locations_page(
+                await self._expand_sites(coordinates, radius, source_id, min_results, max_radius),
+                limit, offset, cursor
+            )
+        if limit is not None or offset != 0 or cursor is not None:
+            return self._locations_page(
+                await self._find_sites(coordinates, radius, source_id),
+                limit, offset, cursor
+            )
+        if source_id != "" and self.shared_snapshot is None:
             return await self.configured_sources[source_id].search_sites(
                 coordinates=coordinates,
                 radius=radius
             )
-        try:
-            geocoded = (await geocoder.geocode_reverse_lookup(coordinates)).raw['address']['country_code']
-        except Exception as e:
-            _LOGGER.error(f"Geocoding failed: {e}")
-            return [] # Or handle the error as appropriate
-        if geocoded.upper() not in FULL_COUNTRY_MAP:
-            raise ValueError("No data source exists for the given coordinates.", geocoded)
+        locations = await self._search_location_tree(coordinates, radius, source_id)
+        if len(locations) > 0 or self.shared_snapshot is not None:
+            return locations
+        # nothing cached nearby, find the country to allow sources to fetch on miss
         locations = []
-        for src in FULL_COUNTRY_MAP.get(geocoded.upper(), []):
-            if src in self.configured_sources:
-                locations.extend(await self.configured_sources[src].search_sites(
-                    coordinates=coordinates,
-                    radius=radius
-                ))
+        for src in await self._sources_for_point(coordinates):
+            locations.extend(await src.search_sites(
+                coordinates=coordinates,
+                radius=radius
+            ))
         return locations
 
     async def find_fuel_from_point(self,
-                             coordinates,
-                             radius: float,
-                             fuel_type: str,
-                             source_id: str = "") -> list[dict]:
-        """Retrieve the fuel cost from a single point."""
+                                   coordinates,
+                                   radius: float,
+                                   fuel_type: str,
+                                   source_id: str = "",
+                                   limit: int | None = None,
+                                   offset: int = 0,
+                                   cursor: str | None = None,
+                                   min_results: int | None = None,
+                                   max_radius: float | None = None) -> list[dict]:
+        """Retrieve the fuel cost from a single point.
+
+        When limit, offset or cursor are given, only that page of the results
+        (ordered by cost) is built and each result includes a cursor that can
+        be passed back to continue after it. When min_results is given the
+        radius is grown (up to max_radius) until enough sites sell the fuel.
+        """
         async def dynamic_build(l: dict):
             """Function for asyncio to retrieve fuels quickly."""
             async with self._semaphore:
@@ -100,12 +463,26 @@ class FuelPrices:
                 )
 
         _LOGGER.debug("Searching for fuel %s", fuel_type)
+        if min_results is not None:
+            return await self._find_fuel_page(
+                await self._expand_sites(
+                    coordinates, radius, source_id, min_results, max_radius, fuel_type
+                ),
+                fuel_type, limit, offset, cursor
+            )
+        if limit is not None or offset != 0 or cursor is not None:
+            return await self._find_fuel_page(
+                await self._find_sites(coordinates, radius, source_id),
+                fuel_type, limit, offset, cursor
+            )
         locations = await self.find_fuel_locations_from_point(
             coordinates,
             radius,
             source_id)
-        coros = [dynamic_build(l) for l in locations]
-        await asyncio.gather(*coros)
+        if self.shared_snapshot is None:
+            # shared stations already hold the fuels built by the publisher
+            coros = [dynamic_build(l) for l in locations]
+            await asyncio.gather(*coros)
         fuels: list = []
         for loc in locations:
             if loc["id"] not in self._accessed_sites:
@@ -121,6 +498,297 @@ class FuelPrices:
                     })
         return sorted(fuels, key=lambda item: item["cost"])
 
+    async def _find_fuel_page(self,
+                              sites: list[tuple[FuelLocation, float]],
+                              fuel_type: str,
+                              limit: int | None,
+                              offset: int,
+                              cursor: str | None) -> list[dict]:
+        """Return a single page of fuel prices, only serializing that page."""
+        async def dynamic_build(site: FuelLocation):
+            """Function for asyncio to retrieve fuels quickly."""
+            async with self._semaphore:
+                await self.get_fuel_location(
+                    site.id,
+                    str(site.props[PROP_FUEL_LOCATION_SOURCE]).lower()
+                )
+
+        if self.shared_snapshot is None:
+            await asyncio.gather(*[dynamic_build(site) for site, _ in sites])
+        rows = []
+        for site, dist in sites:
+            if site.id not in self._accessed_sites:
+                self._accessed_sites[site.id] = site.props[PROP_FUEL_LOCATION_SOURCE]
+            try:
+                cost = site.get_fuel(fuel_type).cost
+            except ValueError:
+                continue
+            if cost > 0:
+                rows.append(((cost, dist, site.id), site))
+        page = select_page(rows, key=lambda row: row[0], limit=limit, offset=offset, cursor=cursor)
+        return [
+            site.as_result(
+                cost=key[0],
+                distance=key[1],
+                cursor=encode_cursor(key)
+            )
+            for key, site in page
+        ]
+
+    async def find_cheapest_fuel(self,
+                                 coordinates,
+                                 radius: float,
+                                 fuel_type: str,
+                                 limit: int | None = 10,
+                                 source_id: str = "") -> list[dict]:
+        """Retrieve the cheapest cached prices for a fuel within a radius.
+
+        Each source walks its price index from the lowest price, so only
+        around limit stations are visited per source.
+        """
+        _LOGGER.debug("Searching for the %s cheapest %s within %s miles of %s.",
+                      limit if limit is not None else "all",
+                      fuel_type,
+                      radius,
+                      coordinates)
+        if self.shared_snapshot is not None:
+            snapshot = self.shared_snapshot.current()
+            cheapest = iter(()) if snapshot is None else iter(
+                snapshot.cheapest_sites(coordinates, radius, fuel_type, limit, source_id)
+            )
+        else:
+            if source_id != "":
+                sources = [self.configured_sources[source_id]]
+            else:
+                sources = list(self.configured_sources.values())
+            cheapest = heapq.merge(
+                *[src.cheapest_sites(coordinates, radius, fuel_type, limit) for src in sources],
+                key=lambda item: item[0]
+            )
+        fuels = []
+        for cost, dist, site in itertools.islice(cheapest, limit):
+            location = site.as_result(cost=cost, distance=dist)
+            if location["id"] not in self._accessed_sites:
+                self._accessed_sites[location["id"]] = location["props"][PROP_FUEL_LOCATION_SOURCE]
+            fuels.append(location)
+        return fuels
+
+    async def find_nearest(self,
+                           coordinates,
+                           k: int,
+                           fuel_type: str | None = None,
+                           max_radius: float | None = None,
+                           source_id: str = "") -> list[dict]:
+        """Retrieve the k nearest fuel locations to a point across all sources."""
+        _LOGGER.debug("Searching for the %s nearest fuel locations to %s selling %s.",
+                      k,
+                      coordinates,
+                      fuel_type if fuel_type is not None else "any fuel")
+        if source_id != "" and self.shared_snapshot is None:
+            return await self.configured_sources[source_id].find_nearest(
+                coordinates=coordinates,
+                k=k,
+                fuel_type=fuel_type,
+                max_radius=max_radius
+            )
+        tree, resolve = self._query_index(source_id)
+        locations = await nearest_locations(
+            tree=tree,
+            resolve=resolve,
+            coordinates=coordinates,
+            k=k,
+            fuel_type=fuel_type,
+            max_radius=max_radius
+        )
+        for loc in locations:
+            if loc["id"] not in self._accessed_sites:
+                self._accessed_sites[loc["id"]] = loc["props"][PROP_FUEL_LOCATION_SOURCE]
+        return locations
+
+    def _match_points(self,
+                      queries: list[dict],
+                      sites: dict[Hashable, int],
+                      columns: tuple[list, list, list]) -> list[list[tuple[int, float]]]:
+        """Match a batch of areas against the shared spatial index.
+
+        Each station touched is resolved once into the shared columns
+        (sites, lats, longs), returns a list of (row, distance) per query.
+        """
+        locations, lats, longs = columns
+        tree, resolve = self._query_index()
+        matches = []
+        for query in queries:
+            rows = []
+            for key in tree.query_radius(
+                query[PROP_AREA_LAT], query[PROP_AREA_LONG], query[PROP_AREA_RADIUS]
+            ):
+                row = sites.get(key)
+                if row is None:
+                    site = resolve(key)
+                    if site is None:
+                        continue
+                    try:
+                        lat, long = float(site.lat), float(site.long)
+                    except (TypeError, ValueError):
+                        continue
+                    row = sites[key] = len(locations)
+                    locations.append(site)
+                    lats.append(lat)
+                    longs.append(long)
+                rows.append(row)
+            matches.append([
+                (rows[index], dist) for index, dist in within_radius(
+                    (query[PROP_AREA_LAT], query[PROP_AREA_LONG]),
+                    [lats[r] for r in rows],
+                    [longs[r] for r in rows],
+                    query[PROP_AREA_RADIUS]
+                )
+            ])
+        return matches
+
+    async def _fetch_missing_areas(self, areas: list[dict]):
+        """Ask fetch on miss sources to populate a batch of empty areas."""
+        by_source: dict[str, list[dict]] = {}
+        for area in areas:
+            try:
+                country_code = await geocoder.country_code_lookup(
+                    (area[PROP_AREA_LAT], area[PROP_AREA_LONG])
+                )
+            except Exception as e:
+                _LOGGER.error(f"Geocoding failed: {e}")
+                continue
+            if country_code is None:
+                continue
+            for src in FULL_COUNTRY_MAP.get(country_code.upper(), []):
+                if src in self.configured_sources and self.configured_sources[src].fetch_on_miss:
+                    if area not in by_source.setdefault(src, []):
+                        by_source[src].append(area)
+
+        async def fetch(s: Source, a: list[dict]):
+            """Fetch areas for a single source."""
+            async with self._semaphore:
+                await s.fetch_areas(a)
+
+        results = await asyncio.gather(
+            *[fetch(self.configured_sources[s], a) for s, a in by_source.items()],
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                _LOGGER.error("Fetching missing areas failed: %s", result)
+
+    async def find_fuel_from_points(self, queries: list[dict]) -> list[list[dict]]:
+        """Retrieve fuel costs for many points at once.
+
+        Each query is an area (latitude, longitude, radius) with a fuel_type,
+        the result is one list of fuel locations per query sorted by cost.
+        Stations are resolved, built and serialized once no matter how many
+        queries they match, and empty areas are fetched together.
+        """
+        _LOGGER.debug("Searching for fuel from %s points", len(queries))
+        sites: dict[Hashable, int] = {}
+        columns = ([], [], [])
+        matches = self._match_points(queries, sites, columns)
+        missed = [i for i, m in enumerate(matches) if len(m) == 0]
+        if len(missed) > 0 and self.shared_snapshot is None:
+            await self._fetch_missing_areas([queries[i] for i in missed])
+            for i, m in zip(missed, self._match_points([queries[i] for i in missed], sites, columns)):
+                matches[i] = m
+
+        locations = columns[0]
+        payloads: dict[int, Mapping] = {}
+        results = []
+        for query, query_matches in zip(queries, matches):
+            fuel_type = query[PROP_QUERY_FUEL_TYPE]
+            fuels = []
+            for row, dist in query_matches:
+                if row not in payloads:
+                    locations[row].last_access = ACCESS_CLOCK.tick
+                    await locations[row].dynamic_build_fuels()
+                    payloads[row] = locations[row].as_result()
+                    if payloads[row]["id"] not in self._accessed_sites:
+                        self._accessed_sites[payloads[row]["id"]] = (
+                            payloads[row]["props"][PROP_FUEL_LOCATION_SOURCE]
+                        )
+                cost = payloads[row]["available_fuels"].get(fuel_type, 0)
+                if cost is not None and cost > 0:
+                    fuels.append({
+                        **payloads[row],
+                        "cost": cost,
+                        "distance": dist
+                    })
+            results.append(sorted(fuels, key=lambda item: item["cost"]))
+        return results
+
+    async def find_fuel_along_route(self,
+                                    polyline: list[tuple[float, float]],
+                                    corridor_width: float,
+                                    fuel_type: str) -> list[dict]:
+        """Retrieve fuel prices for stations along a route.
+
+        polyline is a list of (lat, long) points and corridor_width the
+        maximum distance (miles) a station may be from the route. Results
+        are ordered by cost and include the distance from the route and
+        the distance along the route to the station.
+        """
+        _LOGGER.debug("Searching for fuel %s along a route of %s points.",
+                      fuel_type,
+                      len(polyline))
+        if len(polyline) == 0:
+            return []
+        tree, resolve = self._query_index()
+        segments = list(zip(polyline, polyline[1:])) or [(polyline[0], polyline[0])]
+        matched: dict[Hashable, tuple[float, float]] = {}
+        travelled = 0.0
+        for start, end in segments:
+            start_box = bounding_box(float(start[0]), float(start[1]), corridor_width)
+            end_box = bounding_box(float(end[0]), float(end[1]), corridor_width)
+            keys = []
+            lats = []
+            longs = []
+            for key in set(tree.query_bbox(
+                min(start_box[0], end_box[0]),
+                min(start_box[1], end_box[1]),
+                max(start_box[2], end_box[2]),
+                max(start_box[3], end_box[3])
+            )):
+                site = resolve(key)
+                if site is None:
+                    continue
+                try:
+                    lat, long = float(site.lat), float(site.long)
+                except (TypeError, ValueError):
+                    continue
+                keys.append(key)
+                lats.append(lat)
+                longs.append(long)
+            length = haversine(float(start[0]), float(start[1]), float(end[0]), float(end[1]))
+            for index, offset, fraction in segment_offsets(start, end, lats, longs, corridor_width):
+                key = keys[index]
+                if key not in matched or offset < matched[key][0]:
+                    matched[key] = (offset, travelled + fraction * length)
+            travelled += length
+
+        fuels: list = []
+        for key, (offset, along) in matched.items():
+            site = resolve(key)
+            site.last_access = ACCESS_CLOCK.tick
+            await site.dynamic_build_fuels()
+            try:
+                cost = site.get_fuel(fuel_type).cost
+            except ValueError:
+                continue
+            if cost <= 0:
+                continue
+            if site.id not in self._accessed_sites:
+                self._accessed_sites[site.id] = key[0]
+            fuels.append(site.as_result(
+                cost=cost,
+                distance=offset,
+                distance_along_route=along
+            ))
+        return sorted(fuels, key=lambda item: item["cost"])
+
     @staticmethod
     def get_source_config_schema(source_shortcode: str):
         """Return the config schema for a given source."""
@@ -168,6 +836,8 @@ class FuelPrices:
                 )
             )
 
+        self.location_tree = GridIndex()
+        self.query_cache = RadiusQueryCache()
         if enabled_sources is None:
             enabled_sources=COUNTRY_MAP.get(configuration.get("country_code", "").upper(), [])
 
@@ -185,13 +855,19 @@ class FuelPrices:
                 continue
             self.configured_sources[src] = (
                 SOURCE_MAP.get(src)[0](
+                    configured_areas=self.configured_areas,
                     update_interval=timedelta(hours=configuration.get(
                         "update_interval", 24
                     )),
                     client_session=self.client_session,
                     configuration=configuration["providers"].get(src, {}))
                 )
+            self.configured_sources[src].share_location_tree(self.location_tree)
         self._global_config = configuration.get("global", {})
+        self.snapshot_path = configuration.get(CONF_SNAPSHOT_PATH)
+        self.shared_snapshot_dir = configuration.get(CONF_SHARED_SNAPSHOT_PUBLISH)
+        if configuration.get(CONF_SHARED_SNAPSHOT_ATTACH) is not None:
+            self.attach_shared_snapshot(configuration[CONF_SHARED_SNAPSHOT_ATTACH])
         return self
 
 class UpdateExceptionGroup(Exception):
@@ -0,0 +1,43 @@
+"""Coarse access tracking for cached locations."""
+
+import time
+
+from array import array
+from bisect import bisect_right
+from datetime import timedelta
+
+
+class AccessClock:
+    """A coarse monotonic tick recorded by every read of a location.
+
+    The scheduler advances the tick once per update cycle, so a read only
+    copies an integer instead of calling datetime.now(). The start time of
+    each tick is kept so ages in ticks can be compared against a TTL.
+    """
+
+    __slots__ = ("tick", "_starts")
+
+    def __init__(self):
+        """Create a new clock at tick 0."""
+        self.tick = 0
+        self._starts = array("d", [time.monotonic()])
+
+    def advance(self) -> int:
+        """Start a new tick."""
+        self._starts.append(time.monotonic())
+        self.tick += 1
+        return self.tick
+
+    def tick_at(self, when: float) -> int:
+        """Return the tick that was current at a time.monotonic() value."""
+        return max(bisect_right(self._starts, when) - 1, 0)
+
+    def expiry_tick(self, ttl: timedelta) -> int:
+        """Return the oldest tick that could hold an access within ttl.
+
+        Every tick before it ended more than ttl ago.
+        """
+        return self.tick_at(time.monotonic() - ttl.total_seconds())
+
+
+ACCESS_CLOCK = AccessClock()
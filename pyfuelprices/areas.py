@@ -0,0 +1,208 @@
+"""Area planning to reduce upstream requests."""
+
+import math
+
+from collections.abc import Hashable, Mapping
+
+from geopy import distance
+
+from .const import PROP_AREA_LAT, PROP_AREA_LONG, PROP_AREA_RADIUS
+from .distances import haversine, sites_within_radius
+
+# overlapping circles are only merged if the merged circle does not cover
+# much more ground than the largest area it replaces, this also stops chains
+# of small circles (such as a search ring) growing into one large circle.
+MERGE_AREA_RATIO = 1.5
+# merged circles are grown by this fraction, the centre is interpolated and
+# sources measure distance on the ellipsoid, both of which can leave a thin
+# sliver of the original areas uncovered.
+MERGE_RADIUS_MARGIN = 0.01
+# progressive searches double the radius at most this many times by default.
+EXPANSION_FACTOR = 2.0
+MAX_EXPANSION_STEPS = 3
+
+
+def _merge(first: tuple[float, float, float],
+           second: tuple[float, float, float],
+           max_radius: float | None,
+           largest: float) -> tuple[float, float, float] | None:
+    """Return a circle covering two circles, or None if they should not merge."""
+    lat1, long1, r1 = first
+    lat2, long2, r2 = second
+    dist = haversine(lat1, long1, lat2, long2)
+    if dist + r2 <= r1:
+        return first
+    if dist + r1 <= r2:
+        return second
+    if dist >= r1 + r2:
+        return None
+    radius = (dist + r1 + r2) / 2
+    # move from the first centre towards the second, short distances only
+    # so interpolating the coordinates is close enough.
+    ratio = (radius - r1) / dist
+    d_long = (long2 - long1 + 180.0) % 360.0 - 180.0
+    lat = lat1 + (lat2 - lat1) * ratio
+    long = (long1 + d_long * ratio + 180.0) % 360.0 - 180.0
+    # size the circle from where its centre actually ended up
+    radius = max(
+        haversine(lat, long, lat1, long1) + r1,
+        haversine(lat, long, lat2, long2) + r2
+    ) * (1 + MERGE_RADIUS_MARGIN)
+    if max_radius is not None and radius > max_radius:
+        return None
+    if radius ** 2 > MERGE_AREA_RATIO * largest ** 2:
+        return None
+    return lat, long, radius
+
+
+def plan_areas(areas: list[dict],
+               max_radius: float | None = None) -> list[tuple[dict, list[dict]]]:
+    """Coalesce overlapping or contained areas into fewer covering areas.
+
+    Returns (covering area, [original areas]) pairs so results can be
+    attributed back. Areas are never grown beyond max_radius, areas already
+    larger than it are left as they are, and areas without a radius are
+    passed through untouched.
+    """
+    circles: list[tuple[tuple[float, float, float], dict | None, float, list[dict]]] = []
+    plan: list[tuple[dict, list[dict]]] = []
+    for area in areas:
+        try:
+            circle = (
+                float(area[PROP_AREA_LAT]),
+                float(area[PROP_AREA_LONG]),
+                float(area[PROP_AREA_RADIUS])
+            )
+        except (KeyError, TypeError, ValueError):
+            plan.append((area, [area]))
+            continue
+        circles.append((circle, area, circle[2], [area]))
+
+    merged = True
+    while merged:
+        merged = False
+        for i in range(len(circles)):
+            for j in range(i + 1, len(circles)):
+                largest = max(circles[i][2], circles[j][2])
+                circle = _merge(circles[i][0], circles[j][0], max_radius, largest)
+                if circle is None:
+                    continue
+                # an area fully containing the other is requested as it was
+                if circle is circles[i][0]:
+                    original = circles[i][1]
+                elif circle is circles[j][0]:
+                    original = circles[j][1]
+                else:
+                    original = None
+                circles[i] = (circle, original, largest, circles[i][3] + circles[j][3])
+                del circles[j]
+                merged = True
+                break
+            if merged:
+                break
+
+    for circle, original, _, covered in circles:
+        if original is not None:
+            plan.append((original, covered))
+            continue
+        plan.append(({
+            PROP_AREA_LAT: circle[0],
+            PROP_AREA_LONG: circle[1],
+            PROP_AREA_RADIUS: circle[2]
+        }, covered))
+    return plan
+
+
+def attribute_sites(areas: list[dict], sites: Mapping[Hashable, object]) -> list[set]:
+    """Return the keys of the sites inside each area.
+
+    Sites are any objects with lat / long, areas without a valid centre and
+    radius are attributed no sites.
+    """
+    keys = {id(site): key for key, site in sites.items()}
+    attributed = []
+    for area in areas:
+        try:
+            coordinates = (float(area[PROP_AREA_LAT]), float(area[PROP_AREA_LONG]))
+            radius = float(area[PROP_AREA_RADIUS])
+        except (KeyError, TypeError, ValueError):
+            attributed.append(set())
+            continue
+        attributed.append({
+            keys[id(site)] for site, _ in sites_within_radius(coordinates, sites.values(), radius)
+        })
+    return attributed
+
+
+def _ring_spread(inner: float, outer: float, count: int) -> float:
+    """Return the circle radius needed to cover a band using count circles."""
+    middle = (inner + outer) / 2
+    angle = math.cos(math.pi / count)
+    return max(
+        math.sqrt(max(r ** 2 + middle ** 2 - 2 * r * middle * angle, 0.0))
+        for r in (inner, outer)
+    )
+
+
+def annulus_areas(lat: float,
+                  long: float,
+                  inner: float,
+                  outer: float,
+                  max_radius: float | None = None) -> list[dict]:
+    """Return areas covering the ring between inner and outer miles of a point.
+
+    The ring is split into bands no wider than max_radius allows, each band
+    is then covered by circles placed evenly around its middle.
+    """
+    if outer <= inner:
+        return []
+    if inner <= 0:
+        if max_radius is None or outer <= max_radius:
+            return [{PROP_AREA_LAT: lat, PROP_AREA_LONG: long, PROP_AREA_RADIUS: outer}]
+        return [
+            {PROP_AREA_LAT: lat, PROP_AREA_LONG: long, PROP_AREA_RADIUS: max_radius},
+            *annulus_areas(lat, long, max_radius, outer, max_radius)
+        ]
+    bands = 1
+    if max_radius is not None:
+        bands = math.ceil((outer - inner) / (max_radius * math.sqrt(2)))
+    width = (outer - inner) / bands
+    areas = []
+    for band in range(bands):
+        band_inner = inner + band * width
+        band_outer = band_inner + width
+        middle = (band_inner + band_outer) / 2
+        count = max(math.ceil(math.pi / math.asin(min(1.0, width / 2 / middle))), 2)
+        radius = _ring_spread(band_inner, band_outer, count)
+        while max_radius is not None and radius > max_radius and count < 360:
+            count += 1
+            radius = _ring_spread(band_inner, band_outer, count)
+        for step in range(count):
+            point = distance.distance(miles=middle).destination((lat, long), 360 * step / count)
+            areas.append({
+                PROP_AREA_LAT: point.latitude,
+                PROP_AREA_LONG: point.longitude,
+                PROP_AREA_RADIUS: radius
+            })
+    return areas
+
+
+def expansion_areas(lat: float,
+                    long: float,
+                    inner: float,
+                    outer: float,
+                    max_radius: float | None = None) -> list[dict]:
+    """Return the cheapest areas to fetch when a search grows from inner to outer.
+
+    Covering a thin ring with circles can request more ground than simply
+    asking for the full outer circle again, so whichever covers the least
+    total area (then the fewest requests) is used.
+    """
+    def cost(areas: list[dict]) -> tuple[float, int]:
+        return sum(a[PROP_AREA_RADIUS] ** 2 for a in areas), len(areas)
+
+    return min(
+        annulus_areas(lat, long, inner, outer, max_radius),
+        annulus_areas(lat, long, 0, outer, max_radius),
+        key=cost
+    )
@@ -8,7 +8,23 @@ PROP_FUEL_LOCATION_PREVENT_CACHE_CLEANUP = "prevent_cache_cleanup"
 PROP_AREA_LAT = "latitude"
 PROP_AREA_LONG = "longitude"
 PROP_AREA_RADIUS = "radius"
+PROP_QUERY_FUEL_TYPE = "fuel_type"
 
 
 ANDROID_USER_AGENT = "Dalvik/2.1.0 (Linux; U; Android 13; Pixel 4 XL Build/TQ3A.230705.001.B4)"
 DESKTOP_USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64; rv:120.0) Gecko/20100101 Firefox/120.0"
+
+CONF_PAYLOAD_RETENTION = "payload_retention"
+CONF_PAYLOAD_KEYS = "payload_keys"
+CONF_FUEL_PAYLOAD_KEYS = "fuel_payload_keys"
+PAYLOAD_RETENTION_NONE = "none"
+PAYLOAD_RETENTION_SELECTED = "selected"
+PAYLOAD_RETENTION_COMPRESSED = "compressed"
+PAYLOAD_RETENTION_FULL = "full"
+CONF_CACHE_TTL = "cache_ttl_hours"
+CONF_CACHE_MAX_SITES = "cache_max_sites"
+CONF_CACHE_MAX_BYTES = "cache_max_bytes"
+CONF_PRICE_HISTORY_SIZE = "price_history_size"
+CONF_SNAPSHOT_PATH = "snapshot_path"
+CONF_SHARED_SNAPSHOT_PUBLISH = "shared_snapshot_publish"
+CONF_SHARED_SNAPSHOT_ATTACH = "shared_snapshot_attach"
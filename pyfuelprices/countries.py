@@ -0,0 +1,114 @@
+"""Offline country resolution using bundled country boundaries.
+
+Boundaries are the Natural Earth 1:110m admin 0 countries (public domain),
+keyed by ISO 3166-1 alpha-2 code with coordinates stored as [long, lat].
+"""
+
+import gzip
+import json
+import math
+import os
+
+COUNTRY_DATA = os.path.join(os.path.dirname(__file__), "data", "countries.json.gz")
+# the simplified boundaries can be several miles out, anything closer than
+# this to another country is treated as ambiguous.
+BORDER_MARGIN = 10.0  # miles
+MILES_PER_DEGREE = 69.09
+
+
+class _Ring:
+    """A single boundary ring with its bounding box."""
+
+    __slots__ = ("points", "lon_min", "lat_min", "lon_max", "lat_max")
+
+    def __init__(self, points: list[list[float]]):
+        self.points = [(p[0], p[1]) for p in points]
+        self.lon_min = min(p[0] for p in self.points)
+        self.lon_max = max(p[0] for p in self.points)
+        self.lat_min = min(p[1] for p in self.points)
+        self.lat_max = max(p[1] for p in self.points)
+
+    def near(self, lat: float, long: float, lat_margin: float, lon_margin: float) -> bool:
+        """Bounding box check with a margin in degrees."""
+        return (self.lat_min - lat_margin <= lat <= self.lat_max + lat_margin and
+                self.lon_min - lon_margin <= long <= self.lon_max + lon_margin)
+
+    def crossings(self, lat: float, long: float) -> int:
+        """Return the number of ray crossings for an even-odd test."""
+        count = 0
+        points = self.points
+        x_j, y_j = points[-1]
+        for x_i, y_i in points:
+            if (y_i > lat) != (y_j > lat):
+                if long < (x_j - x_i) * (lat - y_i) / (y_j - y_i) + x_i:
+                    count += 1
+            x_j, y_j = x_i, y_i
+        return count
+
+    def edge_distance(self, lat: float, long: float) -> float:
+        """Return the approximate distance in miles to the closest edge."""
+        scale = math.cos(math.radians(lat))
+        best = math.inf
+        points = self.points
+        x_j, y_j = points[-1]
+        for x_i, y_i in points:
+            ax, ay = (x_j - long) * scale, y_j - lat
+            bx, by = (x_i - long) * scale, y_i - lat
+            dx, dy = bx - ax, by - ay
+            length = dx * dx + dy * dy
+            t = 0.0 if length == 0 else max(0.0, min(1.0, -(ax * dx + ay * dy) / length))
+            px, py = ax + t * dx, ay + t * dy
+            best = min(best, px * px + py * py)
+            x_j, y_j = x_i, y_i
+        return math.sqrt(best) * MILES_PER_DEGREE
+
+
+class CountryResolver:
+    """Resolve coordinates into a country code without network access."""
+
+    def __init__(self, path: str = COUNTRY_DATA, margin: float = BORDER_MARGIN):
+        """Create a resolver, boundaries are loaded on first use."""
+        self._path = path
+        self.margin = margin
+        self._countries: dict[str, list[_Ring]] | None = None
+
+    def _load(self) -> dict[str, list[_Ring]]:
+        """Load the bundled boundaries."""
+        if self._countries is None:
+            with gzip.open(self._path, "rt", encoding="utf-8") as data:
+                self._countries = {
+                    code: [_Ring(ring) for ring in rings]
+                    for code, rings in json.load(data).items()
+                }
+        return self._countries
+
+    def lookup(self, coordinates) -> str | None:
+        """Return the lowercase ISO country code for a point.
+
+        None is returned when the point is within the border margin of
+        another country or outside every country, callers should fall back
+        to a full reverse geocode in that case.
+        """
+        lat = float(coordinates[0])
+        long = float(coordinates[1])
+        lat_margin = self.margin / MILES_PER_DEGREE
+        lon_margin = lat_margin / max(math.cos(math.radians(lat)), 0.01)
+        inside = set()
+        nearby = set()
+        for code, rings in self._load().items():
+            crossings = 0
+            for ring in rings:
+                if not ring.near(lat, long, lat_margin, lon_margin):
+                    continue
+                crossings += ring.crossings(lat, long)
+                if code not in nearby and ring.edge_distance(lat, long) <= self.margin:
+                    nearby.add(code)
+            if crossings % 2 == 1:
+                inside.add(code)
+        candidates = inside | nearby
+        if len(candidates) == 1:
+            return candidates.pop().lower()
+        return None
+
+
+countries = CountryResolver()
@@ -0,0 +1,94 @@
+"""Change-only deltas of source caches."""
+
+from collections.abc import Hashable
+
+
+class UpdateDelta:
+    """The changes made to a source cache since the delta was started.
+
+    Sites are recorded as added, removed (including evictions) or relocated
+    and prices as (old, new) per site and fuel type, None meaning the fuel
+    did not exist. Repeated changes are merged so each site or fuel appears
+    once with its first old value and its latest new value, and changes that
+    cancel out are dropped. A site removed and added again is listed in
+    both, consumers should apply removed before added.
+    """
+
+    __slots__ = ("added", "removed", "relocated", "prices")
+
+    def __init__(self):
+        """Create an empty delta."""
+        self.added: set[Hashable] = set()
+        self.removed: set[Hashable] = set()
+        self.relocated: dict[Hashable, tuple[tuple, tuple]] = {}
+        self.prices: dict[Hashable, dict[str, tuple[float | None, float | None]]] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.relocated or self.prices)
+
+    def __repr__(self) -> str:
+        return (f"UpdateDelta(added={len(self.added)}, removed={len(self.removed)}, "
+                f"relocated={len(self.relocated)}, prices={len(self.prices)})")
+
+    def site_added(self, site_id: Hashable):
+        """Record a site inserted into the cache."""
+        self.added.add(site_id)
+        # the new site is read in full, earlier changes no longer matter
+        self.relocated.pop(site_id, None)
+        self.prices.pop(site_id, None)
+
+    def site_removed(self, site_id: Hashable):
+        """Record a site removed from the cache."""
+        if site_id in self.added:
+            self.added.discard(site_id)
+        else:
+            self.removed.add(site_id)
+        self.relocated.pop(site_id, None)
+        self.prices.pop(site_id, None)
+
+    def site_moved(self, site_id: Hashable, old: tuple, new: tuple):
+        """Record a site whose (lat, long) changed."""
+        if site_id in self.added:
+            return
+        if site_id in self.relocated:
+            old = self.relocated[site_id][0]
+        if old == new:
+            self.relocated.pop(site_id, None)
+        else:
+            self.relocated[site_id] = (old, new)
+
+    def price_changed(self,
+                      site_id: Hashable,
+                      fuel_type: str,
+                      old: float | None,
+                      new: float | None):
+        """Record a fuel price that changed, was added or was removed."""
+        if site_id in self.added:
+            return
+        fuels = self.prices.setdefault(site_id, {})
+        if fuel_type in fuels:
+            old = fuels[fuel_type][0]
+        if old == new:
+            fuels.pop(fuel_type, None)
+            if len(fuels) == 0:
+                del self.prices[site_id]
+        else:
+            fuels[fuel_type] = (old, new)
+
+    def to_dict(self) -> dict:
+        """Convert the delta to a dict."""
+        return {
+            "added": list(self.added),
+            "removed": list(self.removed),
+            "relocated": {
+                site_id: {"old": old, "new": new}
+                for site_id, (old, new) in self.relocated.items()
+            },
+            "prices": {
+                site_id: {
+                    fuel_type: {"old": old, "new": new}
+                    for fuel_type, (old, new) in fuels.items()
+                }
+                for site_id, fuels in self.prices.items()
+            }
+        }
@@ -0,0 +1,138 @@
+"""Batch distance calculations for radius queries."""
+
+import math
+
+from array import array
+from collections.abc import Iterable, Sequence
+
+from geopy import distance
+
+EARTH_RADIUS_MILES = 3958.7613
+# Spherical (haversine) distances are within ~0.56% of the WGS-84 geodesic,
+# anything closer than this to the radius is re-checked with geopy.
+GEODESIC_TOLERANCE = 0.006
+
+
+def bounding_box(lat: float, long: float, radius: float) -> tuple[float, float, float, float]:
+    """Return (lat_min, lon_min, lat_max, lon_max) enclosing a radius in miles.
+
+    Longitudes are not wrapped, callers must handle the antimeridian.
+    """
+    lat_delta = math.degrees(radius / EARTH_RADIUS_MILES)
+    parallel = math.cos(math.radians(min(abs(lat) + lat_delta, 90.0)))
+    if parallel <= 1e-9:
+        lon_delta = 180.0
+    else:
+        lon_delta = min(lat_delta / parallel, 180.0)
+    return lat - lat_delta, long - lon_delta, lat + lat_delta, long + lon_delta
+
+
+def haversine(lat1: float, long1: float, lat2: float, long2: float) -> float:
+    """Return the great circle distance in miles between two points."""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2 +
+         math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(long2 - long1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_MILES * math.asin(min(1.0, math.sqrt(a)))
+
+
+def within_radius(coordinates,
+                  lats: Sequence[float],
+                  longs: Sequence[float],
+                  radius: float | Sequence[float],
+                  inclusive: bool = False,
+                  exact: bool = True) -> list[tuple[int, float]]:
+    """Return (index, miles) for every point within radius of coordinates.
+
+    lats and longs are parallel float arrays (ideally array('d')). radius may
+    be a single value or one value per point. Points are first rejected using
+    a bounding box, the rest use haversine, and when exact is set, points near
+    the radius boundary are refined with a geodesic distance.
+    """
+    lat0 = float(coordinates[0])
+    long0 = float(coordinates[1])
+    if isinstance(radius, Sequence):
+        radii = radius
+        max_radius = max(radii, default=0.0)
+    else:
+        radii = None
+        max_radius = radius
+    lat_min, lon_min, lat_max, _ = bounding_box(
+        lat0, long0, max_radius * (1 + GEODESIC_TOLERANCE)
+    )
+    lon_delta = long0 - lon_min
+    phi0 = math.radians(lat0)
+    cos_phi0 = math.cos(phi0)
+    sin = math.sin
+    cos = math.cos
+    radians = math.radians
+    matches = []
+    for index, (lat, long) in enumerate(zip(lats, longs)):
+        if lat < lat_min or lat > lat_max:
+            continue
+        d_long = (long - long0 + 180.0) % 360.0 - 180.0
+        if abs(d_long) > lon_delta:
+            continue
+        phi = radians(lat)
+        a = (sin((phi - phi0) / 2) ** 2 +
+             cos_phi0 * cos(phi) * sin(radians(d_long) / 2) ** 2)
+        dist = 2 * EARTH_RADIUS_MILES * math.asin(min(1.0, math.sqrt(a)))
+        limit = max_radius if radii is None else radii[index]
+        if exact and math.isfinite(limit) and abs(dist - limit) <= limit * GEODESIC_TOLERANCE:
+            dist = distance.distance((lat0, long0), (lat, long)).miles
+        if dist < limit or (inclusive and dist == limit):
+            matches.append((index, dist))
+    return matches
+
+
+def sites_within_radius(coordinates,
+                        sites: Iterable,
+                        radius: float) -> list[tuple[object, float]]:
+    """Return (site, miles) for every object with lat / long inside radius.
+
+    Sites with coordinates that cannot be converted to floats are ignored.
+    """
+    candidates = []
+    lats = array("d")
+    longs = array("d")
+    for site in sites:
+        try:
+            lat, long = float(site.lat), float(site.long)
+        except (TypeError, ValueError):
+            continue
+        candidates.append(site)
+        lats.append(lat)
+        longs.append(long)
+    return [
+        (candidates[index], dist)
+        for index, dist in within_radius(coordinates, lats, longs, radius)
+    ]
+
+
+def segment_offsets(start,
+                    end,
+                    lats: Sequence[float],
+                    longs: Sequence[float],
+                    width: float) -> list[tuple[int, float, float]]:
+    """Return (index, miles, fraction) for every point within width of a segment.
+
+    miles is the distance from the point to the closest point on the segment
+    and fraction is how far along the segment (0 - 1) that closest point is.
+    Uses a local equirectangular projection around the segment start, which
+    is accurate for the short segments found in route polylines.
+    """
+    lat0, long0 = float(start[0]), float(start[1])
+    miles_per_degree = math.radians(1) * EARTH_RADIUS_MILES
+    scale = math.cos(math.radians(lat0)) * miles_per_degree
+    seg_x = ((float(end[1]) - long0 + 180.0) % 360.0 - 180.0) * scale
+    seg_y = (float(end[0]) - lat0) * miles_per_degree
+    length = seg_x * seg_x + seg_y * seg_y
+    matches = []
+    for index, (lat, long) in enumerate(zip(lats, longs)):
+        x = ((long - long0 + 180.0) % 360.0 - 180.0) * scale
+        y = (lat - lat0) * miles_per_degree
+        fraction = 0.0 if length == 0 else max(0.0, min(1.0, (x * seg_x + y * seg_y) / length))
+        offset = math.hypot(x - fraction * seg_x, y - fraction * seg_y)
+        if offset <= width:
+            matches.append((index, offset, fraction))
+    return matches
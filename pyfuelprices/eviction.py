@@ -0,0 +1,140 @@
+"""Eviction of cached locations by age, count and estimated size."""
+
+import sys
+
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterator, Mapping
+
+from .fuel_locations import FuelLocation
+
+FUEL_SIZE_ESTIMATE = 200  # bytes for a Fuel and a small props dict
+
+
+def estimate_size(location: FuelLocation) -> int:
+    """Return a rough estimate of the bytes held by a cached location."""
+    size = sys.getsizeof(location)
+    for fuel in location._fuels.values():
+        size += FUEL_SIZE_ESTIMATE
+        if fuel.history is not None:
+            size += fuel.history.nbytes
+    for value in (location._id, location._name, location._address, location._postal_code):
+        if value is not None:
+            size += sys.getsizeof(value)
+    if location.props is not None:
+        size += sys.getsizeof(location.props)
+    return size
+
+
+class CacheEvictor:
+    """Track cached locations in least recently used order.
+
+    Sites are queued with the access clock tick they were last seen at. A
+    read made directly on a FuelLocation only records the tick in its
+    last_access, so a site found at the head of a queue with a newer
+    last_access is moved to the back instead of being evicted. Each site is
+    looked at once per access, so a cycle costs O(evicted) amortized rather
+    than a scan of the whole cache.
+
+    Sites exempt from the TTL are kept in their own queue so that expiry only
+    ever looks at the head of the expiring queue, both queues are merged by
+    age when a size cap has to be enforced. Pinned sites are dropped from
+    the queues when they reach the head and are never evicted.
+    """
+
+    def __init__(self,
+                 max_sites: int | None = None,
+                 max_bytes: int | None = None):
+        """Create a new evictor."""
+        self.max_sites = max_sites
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._sizes: dict[Hashable, int] = {}
+        self._expiring: OrderedDict[Hashable, int] = OrderedDict()
+        self._kept: OrderedDict[Hashable, int] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def track(self, key: Hashable, site: FuelLocation, tick: int, ttl_exempt: bool = False):
+        """Record a site that was inserted or updated in the cache.
+
+        An update refreshes the tick the site is queued with, so sites the
+        provider keeps returning are not expired between updates.
+        """
+        size = estimate_size(site)
+        self.total_bytes += size - self._sizes.get(key, 0)
+        self._sizes[key] = size
+        queue, other = (self._kept, self._expiring) if ttl_exempt else (self._expiring, self._kept)
+        queued = queue.pop(key, None)
+        if queued is None:
+            queued = other.pop(key, None)
+        if queued is None:
+            queue[key] = tick if site.last_access is None else site.last_access
+        else:
+            queue[key] = max(queued, tick)
+
+    def discard(self, key: Hashable):
+        """Stop tracking a site."""
+        self.total_bytes -= self._sizes.pop(key, 0)
+        self._expiring.pop(key, None)
+        self._kept.pop(key, None)
+
+    def clear(self):
+        """Stop tracking every site."""
+        self.total_bytes = 0
+        self._sizes.clear()
+        self._expiring.clear()
+        self._kept.clear()
+
+    def _over_cap(self, count: int) -> bool:
+        """Return True if a size cap is exceeded."""
+        if self.max_sites is not None and count > self.max_sites:
+            return True
+        return self.max_bytes is not None and self.total_bytes > self.max_bytes
+
+    def _oldest(self) -> OrderedDict | None:
+        """Return the queue holding the least recently used site."""
+        if len(self._kept) == 0:
+            return self._expiring or None
+        if len(self._expiring) == 0:
+            return self._kept
+        if next(iter(self._kept.values())) < next(iter(self._expiring.values())):
+            return self._kept
+        return self._expiring
+
+    def candidates(self,
+                   cache: Mapping[Hashable, FuelLocation],
+                   expiry_tick: int | None,
+                   pinned: Callable[[Hashable, FuelLocation], bool]) -> Iterator[Hashable]:
+        """Yield keys to evict until the cache is within its limits.
+
+        Sites last seen before expiry_tick have expired, None disables the
+        TTL. The caller must remove each key from the cache and call discard
+        before asking for the next one.
+        """
+        while True:
+            if self._over_cap(len(cache)):
+                queue = self._oldest()
+            elif (
+                expiry_tick is not None and len(self._expiring) > 0
+                and next(iter(self._expiring.values())) < expiry_tick
+            ):
+                queue = self._expiring
+            else:
+                return
+            if queue is None:
+                return
+            key, queued = next(iter(queue.items()))
+            site = cache.get(key)
+            if site is None:
+                self.discard(key)
+                continue
+            if pinned(key, site):
+                del queue[key]
+                continue
+            if site.last_access is not None and site.last_access > queued:
+                queue.move_to_end(key)
+                queue[key] = site.last_access
+                continue
+            yield key
+            self.discard(key)
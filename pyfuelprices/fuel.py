@@ -1,23 +1,29 @@
 """Representation of a single fuel."""
 
+from .history import PriceHistory
+from .interning import intern_string
+
 class Fuel:
     """Individual Fuel."""
 
-    _fuel_type: str
-    _cost: float
-    _props: dict
+    __slots__ = ("_fuel_type", "_cost", "_props", "_owner")
 
     def __init__(self, fuel_type: str, cost: float, props: dict=None):
         """Initalize a fuel price."""
-        self._fuel_type = fuel_type
+        self._fuel_type: str = intern_string(fuel_type)
         if cost is None:
-            self._cost = 0
+            self._cost: float = 0
         else:
-            self._cost = cost
-        self._props = props
+            self._cost: float = cost
+        self._props: dict | None = props
+        self._owner = None  # the location holding this fuel, it reports changes to its source
 
     @property
     def __dict__(self) -> dict:
+        """Convert to a dict."""
+        return self.to_dict()
+
+    def to_dict(self) -> dict:
         """Convert to a dict."""
         return {
             "type": self._fuel_type,
@@ -27,12 +33,20 @@ class Fuel:
 
     def update(self, fuel_type: str, cost: float, props: dict):
         """Update this instance of data."""
-        self._fuel_type = fuel_type
+        old_fuel_type = self._fuel_type
+        old_cost = self._cost
+        old_props = self._props
+        self._fuel_type = intern_string(fuel_type)
         if cost is None:
             self._cost = 0
         else:
             self._cost = cost
         self._props = props
+        if self._owner is not None and (
+            old_fuel_type != self._fuel_type or old_cost != self._cost
+            or (props is not old_props and props != old_props)
+        ):
+            self._owner._fuel_changed(self, old_fuel_type, old_cost)
 
     @property
     def fuel_type(self) -> str:
@@ -45,3 +59,10 @@ class Fuel:
     @property
     def props(self) -> dict | None:
         return self._props
+
+    @property
+    def history(self) -> PriceHistory | None:
+        """Return the price history kept by the source caching this fuel."""
+        if self._owner is None:
+            return None
+        return self._owner.fuel_history(self._fuel_type)
@@ -1,33 +1,63 @@
 """pyfuelprices locations."""
 
+from array import array
 from typing import final
 from datetime import datetime
 
-from .const import PROP_FUEL_LOCATION_DYNAMIC_BUILD
+from .access import ACCESS_CLOCK
+from .const import PROP_FUEL_LOCATION_DYNAMIC_BUILD, PROP_FUEL_LOCATION_SOURCE
 from .fuel import Fuel
+from .history import PriceHistory
+from .interning import intern_string
+from .retention import FrozenDict, contains_compressed, frozen_payload, plain_payload
 
 class FuelLocation:
     """Represents an invidual location."""
 
-    _id = ""
-    _name = ""
-    _address = ""
-    lat = 0.0
-    long = 0.0
-    _brand = ""
-    available_fuels: list[Fuel] = []
-    _currency = ""
-    _postal_code: str | None = None
-    last_updated: datetime | None = None
-    next_update: datetime | None = None
-    last_access: datetime | None = None
-    props: dict = {}
+    __slots__ = (
+        "_id",
+        "_name",
+        "_address",
+        "lat",
+        "long",
+        "_brand",
+        "_fuels",
+        "_currency",
+        "_postal_code",
+        "last_updated",
+        "next_update",
+        "last_access",
+        "area_check",
+        "props",
+        "_serialized",
+        "_owner"
+    )
+
+    def __init__(self):
+        """Create an empty location, use create to populate one."""
+        self._id: str = ""
+        self._name: str = ""
+        self._address: str = ""
+        self.lat: float = 0.0
+        self.long: float = 0.0
+        self._brand: str = ""
+        self._fuels: dict[str, Fuel] = {}
+        self._currency: str = ""
+        self._postal_code: str | None = None
+        self.last_updated: datetime | None = None
+        self.next_update: datetime | None = None
+        self.last_access: int | None = None  # access clock tick of the last read
+        self.area_check: tuple | None = None  # (areas generation, lat, long, in area)
+        self.props: dict = {}
+        # (lat, long, last_updated, next_update, props, read only dict, holds compressed payloads)
+        self._serialized: tuple | None = None
+        self._owner = None  # the source caching this location
 
     @final
     @property
     def id(self) -> str:
         """Return site_id."""
-        self.last_access = datetime.now()
+        self.last_access = ACCESS_CLOCK.tick
         return self._id
 
     @final
@@ -35,12 +65,13 @@ class FuelLocation:
     def id(self, new_val):
         """Set site_id"""
         self._id = new_val
+        self._serialized = None
 
     @final
     @property
     def name(self) -> str:
         """Return site name."""
-        self.last_access = datetime.now()
+        self.last_access = ACCESS_CLOCK.tick
         return self._name
 
     @final
@@ -48,13 +79,14 @@ class FuelLocation:
     def name(self, new_val):
         """Set site name."""
         self._name = new_val
+        self._serialized = None
 
 
     @final
     @property
     def address(self) -> str:
         """Return site address."""
-        self.last_access = datetime.now()
+        self.last_access = ACCESS_CLOCK.tick
         return self._address
 
     @final
@@ -62,38 +94,41 @@ class FuelLocation:
     def address(self, new_val):
         """Set site address."""
         self._address = new_val
+        self._serialized = None
 
     @final
     @property
     def brand(self) -> str:
         """Return fuel brand."""
-        self.last_access = datetime.now()
+        self.last_access = ACCESS_CLOCK.tick
         return self._brand
 
     @final
     @brand.setter
     def brand(self, new_val):
         """Set fuel brand."""
-        self._brand = new_val
+        self._brand = intern_string(new_val)
+        self._serialized = None
 
     @final
     @property
     def currency(self) -> str:
         """Return site name."""
-        self.last_access = datetime.now()
+        self.last_access = ACCESS_CLOCK.tick
         return self._currency
 
     @final
     @currency.setter
     def currency(self, new_val):
         """Set site currency."""
-        self._currency = new_val
+        self._currency = intern_string(new_val)
+        self._serialized = None
 
     @final
     @property
     def postal_code(self) -> str:
         """Return site postal code."""
-        self.last_access = datetime.now()
+        self.last_access = ACCESS_CLOCK.tick
         return self._postal_code
 
     @final
@@ -101,14 +136,98 @@ class FuelLocation:
     def postal_code(self, new_val):
         """Set site postal code."""
         self._postal_code = new_val
+        self._serialized = None
+
+    @final
+    @property
+    def available_fuels(self) -> list[Fuel]:
+        """Return the available fuels in the order they were added."""
+        return list(self._fuels.values())
+
+    @final
+    @available_fuels.setter
+    def available_fuels(self, new_val):
+        """Replace all available fuels."""
+        old_fuels = self._fuels
+        self._fuels = {}
+        self._serialized = None
+        for fuel in new_val or []:
+            self.add_or_update_fuel(fuel)
+        if self._owner is not None:
+            for fuel_type in old_fuels.keys() - self._fuels.keys():
+                self._owner._fuel_removed(self._id, fuel_type)
 
     @final
     @property
     def __dict__(self) -> dict:
         """Convert the object to a dict."""
+        return self.to_dict()
+
+    @final
+    def to_dict(self) -> dict:
+        """Convert the object to a dict.
+
+        This is a plain copy with compressed payloads decoded, so it can be
+        changed freely or passed to json.dumps. Queries return as_result
+        instead, which shares the serialized form.
+        """
+        payload = dict(self.serialized())
+        payload["available_fuels"] = dict(payload["available_fuels"])
+        payload["fuel_details"] = plain_payload(payload["fuel_details"])
+        payload["props"] = plain_payload(payload["props"])
+        return payload
+
+    @final
+    def as_result(self, **extra) -> dict:
+        """Return the dict handed to query callers, extra keys are added to it.
+
+        Nested values are shared with the serialized form and can not be
+        changed. Only sites holding compressed payloads pay for a copy, as
+        those are decoded for each result.
+        """
+        payload = self.serialized()
+        result = {**payload, **extra}
+        if self._serialized[6]:
+            result["fuel_details"] = plain_payload(payload["fuel_details"])
+            result["props"] = plain_payload(payload["props"])
+        return result
+
+    @final
+    def serialized(self) -> FrozenDict:
+        """Return the dict form as a read only dict shared between calls.
+
+        Nested fuels, fuel details and props are read only copies too, use
+        to_dict for a plain copy to change.
+
+        It is rebuilt only after the location or one of its fuels changed, the
+        plain attributes (coordinates, timestamps and props) are compared on
+        every call as they can be assigned directly. Props changed in place
+        are not picked up, assign a new dict to change them.
+        """
+        cached = self._serialized
+        # compared field by field, a check tuple kept per site costs 80 bytes
+        if (
+            cached is not None and cached[0] == self.lat and cached[1] == self.long
+            and cached[2] == self.last_updated and cached[3] == self.next_update
+            and (cached[4] is self.props or cached[4] == self.props)
+        ):
+            return cached[5]
+        payload = frozen_payload(self._build_dict())
+        compressed = (
+            contains_compressed(payload["props"]) or contains_compressed(payload["fuel_details"])
+        )
+        self._serialized = (
+            self.lat, self.long, self.last_updated, self.next_update, self.props,
+            payload, compressed
+        )
+        return payload
+
+    @final
+    def _build_dict(self) -> dict:
+        """Build the dict form of this location."""
         fuels = {}
         fuel_props = {}
-        for fuel in self.available_fuels:
+        for fuel in self._fuels.values():
             fuels[fuel.fuel_type] = fuel.cost
             fuel_props[fuel.fuel_type] = fuel.props
         return {
@@ -143,38 +262,71 @@ class FuelLocation:
 
         if (
             updated.props.get(PROP_FUEL_LOCATION_DYNAMIC_BUILD, False)
-            and len(self.available_fuels)>0):
+            and len(self._fuels)>0):
             await updated.dynamic_build_fuels()
         for fuel in updated.available_fuels:
-            try:
-                self.get_fuel(fuel.fuel_type).update(fuel.fuel_type, fuel.cost, fuel.props)
-            except ValueError:
-                self.available_fuels.append(fuel)
+            self.add_or_update_fuel(fuel)
+        self._serialized = None
 
     @final
     def get_fuel(self, f_type: str) -> Fuel:
         """Return a fuel instance."""
-        for fuel in self.available_fuels:
-            if fuel.fuel_type == f_type:
-                return fuel
-        raise ValueError(f"No existing fuel data found for {f_type}")
+        fuel = self._fuels.get(f_type)
+        if fuel is None:
+            raise ValueError(f"No existing fuel data found for {f_type}")
+        return fuel
+
+    @final
+    def price_history(self,
+                      f_type: str,
+                      start: datetime | None = None,
+                      end: datetime | None = None) -> tuple[array, array]:
+        """Return (timestamps, prices) recorded for a fuel between two times.
+
+        Timestamps are epoch seconds and prices thousandths of the currency
+        unit, both are empty when no history is kept for the fuel.
+        """
+        history = self.fuel_history(self.get_fuel(f_type).fuel_type)
+        if history is None:
+            return array("I"), array("i")
+        return history.slice(start, end)
+
+    @final
+    def fuel_history(self, f_type: str) -> PriceHistory | None:
+        """Return the price history the caching source keeps for a fuel type."""
+        if self._owner is None:
+            return None
+        return self._owner.history_for(self._id, f_type)
 
     @final
     async def async_get_fuel(self, f_type: str) -> Fuel:
         """Return a fuel instance."""
         if self.props.get(PROP_FUEL_LOCATION_DYNAMIC_BUILD, False):
             await self.dynamic_build_fuels()
-        for fuel in self.available_fuels:
-            if fuel.fuel_type == f_type:
-                return fuel
-        raise ValueError(f"No existing fuel data found for {f_type}")
+        return self.get_fuel(f_type)
 
     @final
     def add_or_update_fuel(self, fuel: Fuel):
         """Create or update a given fuel."""
-        if fuel.fuel_type not in self.available_fuels:
-            self.available_fuels.append(fuel)
-        self.get_fuel(fuel.fuel_type).update(fuel.fuel_type, fuel.cost, fuel.props)
+        existing = self._fuels.get(fuel.fuel_type)
+        if existing is None:
+            self._fuels[fuel.fuel_type] = fuel
+            fuel._owner = self
+            self._serialized = None
+            if self._owner is not None:
+                self._owner._fuel_added(self._id, fuel)
+        else:
+            existing.update(fuel.fuel_type, fuel.cost, fuel.props)
+
+    @final
+    def _fuel_changed(self, fuel: Fuel, old_fuel_type: str, old_cost: float):
+        """Called by one of this location's fuels after it was updated."""
+        self._serialized = None
+        if old_fuel_type != fuel.fuel_type and self._fuels.get(old_fuel_type) is fuel:
+            del self._fuels[old_fuel_type]
+            self._fuels[fuel.fuel_type] = fuel
+        if self._owner is not None:
+            self._owner._fuel_changed(self._id, fuel, old_fuel_type, old_cost)
 
     async def dynamic_build_fuels(self):
         """Dynamic build of fuels for when accessing this data would normally be costly."""
@@ -202,11 +354,13 @@ class FuelLocation:
         location._name = name
         location.lat = lat
         location.long = long
-        location._brand = brand
+        location._brand = intern_string(brand)
         location.available_fuels = available_fuels
         location._postal_code = postal_code
-        location._currency = currency
+        location._currency = intern_string(currency)
         location.last_updated = last_updated
+        if props is not None and PROP_FUEL_LOCATION_SOURCE in props:
+            props[PROP_FUEL_LOCATION_SOURCE] = intern_string(props[PROP_FUEL_LOCATION_SOURCE])
         location.props = props
         location.next_update = next_update
         return location
@@ -13,6 +13,7 @@ from geopy import (
 )
 
 from ._version import __version__ as VERSION
+from .countries import countries
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -68,6 +69,21 @@ class GeoCodeHandler:
                     coordinates, exactly_one=True, timeout=15, addressdetails=True
                 )
 
+    async def country_code_lookup(self, coordinates: tuple) -> str | None:
+        """Return the lowercase ISO country code for coordinates.
+
+        Uses the bundled country boundaries, only falling back to a reverse
+        geocode near borders or where the boundaries give no answer.
+        """
+        country_code = countries.lookup(coordinates)
+        if country_code is not None:
+            return country_code
+        _LOGGER.debug("Offline country lookup ambiguous for %s, using Nominatim", coordinates)
+        geocoded = await self.geocode_reverse_lookup(coordinates)
+        if geocoded is None:
+            return None
+        return geocoded.raw["address"].get("country_code")
+
     def get_bounding_box(self, latitude_in_degrees, longitude_in_degrees, half_side_in_miles):
         """Return a bounding box from lat/long/radius"""
         assert half_side_in_miles > 0
@@ -0,0 +1,106 @@
+"""Bounded price history for fuels."""
+
+import time
+
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+
+PRICE_HISTORY_SCALE = 1000  # prices are kept as integer thousandths of the currency unit
+_MAX_PRICE = 2 ** 31 - 1
+
+
+class PriceHistory:
+    """A fixed capacity ring buffer of (timestamp, price) pairs.
+
+    Timestamps are whole seconds since the epoch and prices integer
+    thousandths of the currency unit, both held in arrays allocated up front
+    so memory is fixed by the capacity (8 bytes per entry). A price is only
+    appended when it differs from the last one recorded, once full the
+    oldest entry is overwritten.
+    """
+
+    __slots__ = ("capacity", "_times", "_prices", "_start", "_count")
+
+    def __init__(self, capacity: int):
+        """Create an empty history."""
+        if capacity <= 0:
+            raise ValueError("Price history capacity must be positive.", capacity)
+        self.capacity = capacity
+        self._times = array("I", [0]) * capacity
+        self._prices = array("i", [0]) * capacity
+        self._start = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        """Return the bytes held by the buffers."""
+        return self.capacity * (self._times.itemsize + self._prices.itemsize)
+
+    def append(self, cost, when: float | None = None) -> bool:
+        """Record a price, returns False if it was invalid or unchanged."""
+        try:
+            price = round(float(cost) * PRICE_HISTORY_SCALE)
+        except (TypeError, ValueError, OverflowError):
+            return False
+        if not 0 < price <= _MAX_PRICE:
+            return False
+        when = int(time.time() if when is None else when)
+        if self._count > 0:
+            last = (self._start + self._count - 1) % self.capacity
+            if self._prices[last] == price:
+                return False
+            # keep the buffer ordered even if the clock steps backwards
+            when = max(when, self._times[last])
+        if self._count < self.capacity:
+            index = (self._start + self._count) % self.capacity
+            self._count += 1
+        else:
+            index = self._start
+            self._start = (self._start + 1) % self.capacity
+        self._times[index] = when
+        self._prices[index] = price
+        return True
+
+    @classmethod
+    def restore(cls, capacity: int, times, prices) -> 'PriceHistory':
+        """Create a history from (timestamps, prices) returned by slice.
+
+        Only the newest entries are kept when there are more than capacity.
+        """
+        history = cls(capacity)
+        times = array("I", times)[-capacity:]
+        prices = array("i", prices)[-capacity:]
+        if len(times) != len(prices):
+            raise ValueError("Price history timestamps and prices differ in length.")
+        history._times[:len(times)] = times
+        history._prices[:len(prices)] = prices
+        history._count = len(times)
+        return history
+
+    def _ordered(self) -> tuple[array, array]:
+        """Return both buffers oldest first."""
+        end = self._start + self._count
+        if end <= self.capacity:
+            return self._times[self._start:end], self._prices[self._start:end]
+        wrapped = end - self.capacity
+        return (
+            self._times[self._start:] + self._times[:wrapped],
+            self._prices[self._start:] + self._prices[:wrapped]
+        )
+
+    def slice(self,
+              start: datetime | None = None,
+              end: datetime | None = None) -> tuple[array, array]:
+        """Return (timestamps, prices) recorded between two times, oldest first.
+
+        Both are arrays (epoch seconds and thousandths of the currency unit)
+        which can be handed straight to numeric code.
+        """
+        times, prices = self._ordered()
+        low = 0 if start is None else bisect_left(times, start.timestamp())
+        high = len(times) if end is None else bisect_right(times, end.timestamp())
+        return times[low:high], prices[low:high]
@@ -0,0 +1,14 @@
+"""Interning for low cardinality strings repeated across stations."""
+
+import sys
+
+
+def intern_string(value):
+    """Return a shared copy of a string, any other value is returned unchanged.
+
+    Used for values such as fuel types, brands, currencies and provider names
+    that repeat across thousands of stations in every parsed response.
+    """
+    if type(value) is str:
+        return sys.intern(value)
+    return value
@@ -0,0 +1,59 @@
+"""Partial selection and cursors for paginated results."""
+
+import base64
+import binascii
+import heapq
+import json
+
+from collections.abc import Callable, Iterable
+
+
+def encode_cursor(key: tuple) -> str:
+    """Return an opaque cursor for the sort key of a result."""
+    return base64.urlsafe_b64encode(
+        json.dumps(list(key), separators=(",", ":")).encode("utf-8")
+    ).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Return the sort key stored in a cursor."""
+    try:
+        return tuple(json.loads(base64.urlsafe_b64decode(cursor.encode("ascii"))))
+    except (binascii.Error, UnicodeError, ValueError, TypeError) as err:
+        raise ValueError("Invalid cursor.", cursor) from err
+
+
+def _comparable(first: tuple, second: tuple) -> bool:
+    """Return True if two sort keys hold the same kind of value in each field."""
+    if len(first) != len(second):
+        return False
+    for left, right in zip(first, second):
+        if isinstance(left, (int, float)) and isinstance(right, (int, float)):
+            continue
+        if type(left) is not type(right):
+            return False
+    return True
+
+
+def select_page(items: Iterable,
+                key: Callable,
+                limit: int | None = None,
+                offset: int = 0,
+                cursor: str | None = None) -> list:
+    """Return one page of items in key order.
+
+    Only the first offset + limit items are selected using a heap, so the
+    cost is O(n log k) rather than sorting everything. A cursor skips every
+    item up to and including the item it was created from.
+    """
+    if cursor is not None:
+        after = decode_cursor(cursor)
+        keyed = [(tuple(key(item)), item) for item in items]
+        if len(keyed) > 0 and not _comparable(after, keyed[0][0]):
+            raise ValueError("Invalid cursor.", cursor)
+        items = [item for item_key, item in keyed if item_key > after]
+    if limit is None:
+        return sorted(items, key=key)[offset:]
+    if limit <= 0:
+        return []
+    return heapq.nsmallest(offset + limit, items, key=key)[offset:]
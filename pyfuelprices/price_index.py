@@ -0,0 +1,168 @@
+"""Per fuel type price ordering for cheapest fuel queries."""
+
+import heapq
+
+from bisect import bisect_left, insort
+from collections.abc import Callable, Hashable, Iterable, Iterator
+
+from .fuel import Fuel
+
+
+class PriceIndex:
+    """Keep site keys sorted by price for each fuel type and grid cell.
+
+    Sources report cost changes of their cached fuels through fuel_updated,
+    so the ordering stays current without rescanning. Only fuels with a
+    positive cost are indexed. cell_of returns the spatial index cell of a
+    key, prices are kept sorted per cell so an update only shifts one cell
+    and a query merges only the cells it covers.
+
+    on_change is called with (key, fuel_type, old, new) whenever a tracked
+    fuel changes cost or a site gains or loses a fuel, None marking a fuel
+    that did not exist.
+    """
+
+    def __init__(self,
+                 on_change: Callable[[Hashable, str, float | None, float | None], None] | None = None,
+                 cell_of: Callable[[Hashable], Hashable] | None = None):
+        """Create a new price index."""
+        # fuel type -> cell -> sorted (cost, key)
+        self._prices: dict[str, dict[Hashable, list[tuple[float, Hashable]]]] = {}
+        self._entries: dict[Hashable, dict[str, float]] = {}
+        self._cells: dict[Hashable, Hashable] = {}  # key -> cell its prices are kept in
+        self.on_change = on_change
+        self.cell_of = cell_of
+
+    def __len__(self) -> int:
+        return sum(
+            len(prices) for cells in self._prices.values() for prices in cells.values()
+        )
+
+    def _cost(self, key: Hashable, fuel_type: str) -> float | None:
+        """Return the indexed price of a fuel type at a site."""
+        return self._entries.get(key, {}).get(fuel_type)
+
+    def _insert(self, key: Hashable, fuel_type: str, cost: float, cell: Hashable):
+        """Insert a price into the sorted prices of a cell."""
+        insort(self._prices.setdefault(fuel_type, {}).setdefault(cell, []), (cost, key))
+
+    def _delete(self, key: Hashable, fuel_type: str, cost: float, cell: Hashable):
+        """Delete a price from the sorted prices of a cell."""
+        cells = self._prices[fuel_type]
+        prices = cells[cell]
+        item = (cost, key)
+        index = bisect_left(prices, item)
+        if index < len(prices) and prices[index] == item:
+            del prices[index]
+        if len(prices) == 0:
+            del cells[cell]
+            if len(cells) == 0:
+                del self._prices[fuel_type]
+
+    def set(self, key: Hashable, fuel_type: str, cost: float):
+        """Set the price of a fuel type at a site."""
+        self._discard(key, fuel_type)
+        try:
+            cost = float(cost)
+        except (TypeError, ValueError):
+            return
+        if not cost > 0:
+            return
+        cell = None if self.cell_of is None else self.cell_of(key)
+        entry = self._entries.setdefault(key, {})
+        old_cell = self._cells.get(key, cell)
+        if old_cell != cell:
+            # the site moved, its other fuel types follow it to the new cell
+            for f_type, f_cost in entry.items():
+                self._delete(key, f_type, f_cost, old_cell)
+                self._insert(key, f_type, f_cost, cell)
+        self._insert(key, fuel_type, cost, cell)
+        entry[fuel_type] = cost
+        self._cells[key] = cell
+
+    def _discard(self, key: Hashable, fuel_type: str):
+        """Remove a single fuel type for a site."""
+        entry = self._entries.get(key)
+        if entry is None or fuel_type not in entry:
+            return
+        self._delete(key, fuel_type, entry.pop(fuel_type), self._cells[key])
+        if len(entry) == 0:
+            del self._entries[key]
+            del self._cells[key]
+
+    def remove(self, key: Hashable, fuel_type: str | None = None):
+        """Remove a site from the index, or only one of its fuel types."""
+        if fuel_type is not None:
+            self._discard(key, fuel_type)
+            return
+        for f_type in list(self._entries.get(key, ())):
+            self._discard(key, f_type)
+
+    def remove_fuel(self, key: Hashable, fuel_type: str):
+        """Remove a fuel type a tracked site no longer sells, reporting the change."""
+        old_cost = self._cost(key, fuel_type)
+        self._discard(key, fuel_type)
+        if self.on_change is not None:
+            self.on_change(key, fuel_type, old_cost, None)
+
+    def clear(self):
+        """Remove all prices from the index."""
+        self._prices.clear()
+        self._entries.clear()
+        self._cells.clear()
+
+    def add(self, key: Hashable, fuel: Fuel):
+        """Index a fuel added to a site."""
+        old_cost = self._cost(key, fuel.fuel_type)
+        self.set(key, fuel.fuel_type, fuel.cost)
+        if self.on_change is not None:
+            self.on_change(key, fuel.fuel_type, old_cost, fuel.cost)
+
+    def track(self, key: Hashable, fuels: list[Fuel]):
+        """Index all fuels of a site, replacing what was indexed for it before."""
+        fuel_types = set()
+        for fuel in fuels:
+            old_cost = self._cost(key, fuel.fuel_type)
+            fuel_types.add(fuel.fuel_type)
+            self.set(key, fuel.fuel_type, fuel.cost)
+            if self.on_change is not None and old_cost != self._cost(key, fuel.fuel_type):
+                self.on_change(key, fuel.fuel_type, old_cost, fuel.cost)
+        for f_type in list(self._entries.get(key, ())):
+            if f_type not in fuel_types:
+                old_cost = self._cost(key, f_type)
+                self._discard(key, f_type)
+                if self.on_change is not None:
+                    self.on_change(key, f_type, old_cost, None)
+
+    def fuel_updated(self,
+                     key: Hashable,
+                     old_fuel_type: str,
+                     fuel: Fuel,
+                     old_cost: float | None = None):
+        """Called when the type or cost of an indexed fuel changes."""
+        if old_fuel_type != fuel.fuel_type:
+            self._discard(key, old_fuel_type)
+            if self.on_change is not None:
+                self.on_change(key, old_fuel_type, old_cost, None)
+                old_cost = None
+        self.set(key, fuel.fuel_type, fuel.cost)
+        if self.on_change is not None:
+            self.on_change(key, fuel.fuel_type, old_cost, fuel.cost)
+
+    def cheapest(self,
+                 fuel_type: str,
+                 cells: Iterable[Hashable] | None = None) -> Iterator[tuple[float, Hashable]]:
+        """Yield (cost, key) for a fuel type from the lowest price upward.
+
+        Only keys in the given cells are yielded, None yields every key. The
+        index must not be changed while the iterator is in use.
+        """
+        buckets = self._prices.get(fuel_type, {})
+        if cells is None:
+            prices = list(buckets.values())
+        else:
+            prices = [buckets[cell] for cell in cells if cell in buckets]
+        if len(prices) == 1:
+            yield from prices[0]
+            return
+        yield from heapq.merge(*prices)
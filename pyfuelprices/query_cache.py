@@ -0,0 +1,81 @@
+"""Result cache for repeated radius queries."""
+
+from collections import OrderedDict
+from collections.abc import Hashable
+
+from .fuel_locations import FuelLocation
+
+QUERY_CACHE_PRECISION = 4  # decimal places, roughly 11 metres
+QUERY_CACHE_SIZE = 128
+
+
+class RadiusQueryCache:
+    """Cache radius query results keyed by quantized coordinates.
+
+    Results are kept as (site, miles) pairs and serialized by the caller on
+    every hit, so a hit still reflects the current state of each site and
+    can be recorded as an access. Each entry stores the largest radius
+    searched at a point, smaller radius queries are answered by filtering
+    that result on distance. Entries are tagged with a version supplied by
+    the caller and are discarded when the version no longer matches, so
+    sources only need to bump a counter when their cache changes.
+    """
+
+    def __init__(self,
+                 precision: int = QUERY_CACHE_PRECISION,
+                 max_entries: int = QUERY_CACHE_SIZE):
+        """Create a new query cache."""
+        self.precision = precision
+        self.max_entries = max_entries
+        self._entries: OrderedDict[
+            tuple[float, float], tuple[Hashable, float, list[tuple[FuelLocation, float]]]
+        ] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _key(self, coordinates) -> tuple[float, float]:
+        """Return the quantized key for a point."""
+        return (
+            round(float(coordinates[0]), self.precision),
+            round(float(coordinates[1]), self.precision)
+        )
+
+    def get(self,
+            coordinates,
+            radius: float,
+            version: Hashable) -> list[tuple[FuelLocation, float]] | None:
+        """Return cached (site, miles) pairs for a query, or None on a miss."""
+        key = self._key(coordinates)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        cached_version, cached_radius, sites = entry
+        if cached_version != version:
+            del self._entries[key]
+            return None
+        if radius > cached_radius:
+            return None
+        self._entries.move_to_end(key)
+        if radius == cached_radius:
+            return list(sites)
+        return [(site, dist) for site, dist in sites if dist < radius]
+
+    def put(self,
+            coordinates,
+            radius: float,
+            version: Hashable,
+            sites: list[tuple[FuelLocation, float]]):
+        """Store the (site, miles) pairs found by a query."""
+        key = self._key(coordinates)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version and entry[1] > radius:
+            return
+        self._entries[key] = (version, radius, list(sites))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all cached results."""
+        self._entries.clear()
@@ -0,0 +1,169 @@
+"""Retention policies for raw provider payloads."""
+
+import json
+import zlib
+
+from collections.abc import Iterable, Iterator, Mapping
+
+from .const import (
+    PAYLOAD_RETENTION_COMPRESSED,
+    PAYLOAD_RETENTION_FULL,
+    PAYLOAD_RETENTION_NONE,
+    PAYLOAD_RETENTION_SELECTED
+)
+
+PAYLOAD_RETENTION_MODES = [
+    PAYLOAD_RETENTION_NONE,
+    PAYLOAD_RETENTION_SELECTED,
+    PAYLOAD_RETENTION_COMPRESSED,
+    PAYLOAD_RETENTION_FULL
+]
+
+
+class CompressedPayload(Mapping):
+    """A raw payload kept as compressed JSON and decoded on every access."""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, payload: dict):
+        """Compress a payload."""
+        self._data = zlib.compress(
+            json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+        )
+
+    @classmethod
+    def from_compressed(cls, data: bytes) -> 'CompressedPayload':
+        """Wrap data that was already compressed by a CompressedPayload."""
+        payload = cls.__new__(cls)
+        payload._data = data
+        return payload
+
+    @property
+    def compressed(self) -> bytes:
+        """Return the compressed payload."""
+        return self._data
+
+    def __len__(self) -> int:
+        return len(self.decode())
+
+    def __iter__(self) -> Iterator:
+        return iter(self.decode())
+
+    def __getitem__(self, key):
+        return self.decode()[key]
+
+    def __repr__(self) -> str:
+        return f"CompressedPayload({len(self._data)} bytes)"
+
+    def decode(self) -> dict:
+        """Return the original payload, the decoded copy is not kept."""
+        return json.loads(zlib.decompress(self._data))
+
+
+def plain_payload(value):
+    """Return a copy of a value with mappings as dicts and compressed payloads decoded.
+
+    Lists and mappings are copied all the way down, so the result is safe
+    to change or pass to json.dumps.
+    """
+    if isinstance(value, CompressedPayload):
+        return value.decode()
+    if isinstance(value, Mapping):
+        return {key: plain_payload(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [plain_payload(item) for item in value]
+    return value
+
+
+class FrozenDict(dict):
+    """A dict that can not be changed once created.
+
+    It is still a dict, so it can be passed to json.dumps or copied with
+    dict() as any other result.
+    """
+
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("FrozenDict can not be changed.")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+
+_EMPTY = FrozenDict()  # shared by every empty mapping, most fuels carry no props
+
+
+def frozen_payload(value):
+    """Return a read only copy of a value.
+
+    Mappings become FrozenDicts and lists tuples all the way down,
+    compressed payloads are kept as they are as they can not be changed.
+    Empty mappings all share one FrozenDict.
+    """
+    if isinstance(value, CompressedPayload):
+        return value
+    if isinstance(value, Mapping):
+        if len(value) == 0:
+            return _EMPTY
+        return FrozenDict((key, frozen_payload(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(frozen_payload(item) for item in value)
+    return value
+
+
+def contains_compressed(value) -> bool:
+    """Return True if a compressed payload is held anywhere in a value."""
+    if isinstance(value, CompressedPayload):
+        return True
+    if isinstance(value, Mapping):
+        return any(contains_compressed(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(contains_compressed(item) for item in value)
+    return False
+
+
+def select_keys(payload: dict, keys: Iterable[str]) -> dict:
+    """Return only the given keys of a payload, dotted keys select nested values."""
+    selected = {}
+    for key in keys:
+        path = key.split(".")
+        value = payload
+        for part in path:
+            if not isinstance(value, dict) or part not in value:
+                break
+            value = value[part]
+        else:
+            target = selected
+            for part in path[:-1]:
+                target = target.setdefault(part, {})
+            target[path[-1]] = value
+    return selected
+
+
+class PayloadRetention:
+    """Decide how much of a raw provider payload is kept in props.
+
+    none drops the payload, selected keeps only the configured keys,
+    compressed keeps everything as compressed JSON decoded lazily on access
+    and full keeps the payload untouched.
+    """
+
+    __slots__ = ("mode", "keys")
+
+    def __init__(self, mode: str = PAYLOAD_RETENTION_NONE, keys: Iterable[str] = ()):
+        """Create a new retention policy."""
+        if mode not in PAYLOAD_RETENTION_MODES:
+            raise ValueError("Invalid payload retention mode.", mode)
+        self.mode = mode
+        self.keys = tuple(keys)
+
+    def retain(self, payload: dict | None) -> dict | CompressedPayload | None:
+        """Return what should be stored for a payload."""
+        if payload is None or self.mode == PAYLOAD_RETENTION_NONE:
+            return None
+        if self.mode == PAYLOAD_RETENTION_SELECTED:
+            return select_keys(payload, self.keys) or None
+        if self.mode == PAYLOAD_RETENTION_COMPRESSED:
+            return CompressedPayload(payload)
+        return payload
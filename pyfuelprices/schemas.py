@@ -2,9 +2,43 @@
 
 import voluptuous as vol
 
-from .const import PROP_AREA_LONG, PROP_AREA_LAT, PROP_AREA_RADIUS
+from .const import (
+    PROP_AREA_LONG,
+    PROP_AREA_LAT,
+    PROP_AREA_RADIUS,
+    CONF_PAYLOAD_RETENTION,
+    CONF_PAYLOAD_KEYS,
+    CONF_FUEL_PAYLOAD_KEYS,
+    CONF_CACHE_TTL,
+    CONF_CACHE_MAX_SITES,
+    CONF_CACHE_MAX_BYTES,
+    CONF_PRICE_HISTORY_SIZE,
+    CONF_SNAPSHOT_PATH,
+    CONF_SHARED_SNAPSHOT_PUBLISH,
+    CONF_SHARED_SNAPSHOT_ATTACH
+)
+from .retention import PAYLOAD_RETENTION_MODES
 
 SOURCE_BASE_CONFIG = vol.Schema({}, extra=vol.ALLOW_EXTRA)
+# options understood by every source, validated apart from the source's own config
+SOURCE_COMMON_CONFIG_KEYS = (
+    CONF_PAYLOAD_RETENTION,
+    CONF_PAYLOAD_KEYS,
+    CONF_FUEL_PAYLOAD_KEYS,
+    CONF_CACHE_TTL,
+    CONF_CACHE_MAX_SITES,
+    CONF_CACHE_MAX_BYTES,
+    CONF_PRICE_HISTORY_SIZE
+)
+SOURCE_COMMON_CONFIG = vol.Schema({
+    vol.Optional(CONF_PAYLOAD_RETENTION): vol.In(PAYLOAD_RETENTION_MODES),
+    vol.Optional(CONF_PAYLOAD_KEYS): [str],
+    vol.Optional(CONF_FUEL_PAYLOAD_KEYS): [str],
+    vol.Optional(CONF_CACHE_TTL): vol.Any(None, vol.All(vol.Any(float, int), vol.Range(min=0))),
+    vol.Optional(CONF_CACHE_MAX_SITES): vol.Any(None, vol.All(int, vol.Range(min=0))),
+    vol.Optional(CONF_CACHE_MAX_BYTES): vol.Any(None, vol.All(int, vol.Range(min=0))),
+    vol.Optional(CONF_PRICE_HISTORY_SIZE): vol.All(int, vol.Range(min=0))
+}, extra=vol.ALLOW_EXTRA)
 AREA_CONFIG = vol.Schema({
     vol.Inclusive(PROP_AREA_LAT, "loc"): float,
     vol.Inclusive(PROP_AREA_LONG, "loc"): float,
@@ -18,7 +52,10 @@ BASE_CONFIG_SCHEMA = vol.Schema(
         vol.Required("areas", default=[]): list[AREA_CONFIG],
         vol.Optional("country_code", default=""): str,
         vol.Required("update_interval", default=24): vol.Any(float, int),
-        vol.Required("timeout", default=30): vol.Any(float, int)
+        vol.Required("timeout", default=30): vol.Any(float, int),
+        vol.Optional(CONF_SNAPSHOT_PATH): str,
+        vol.Optional(CONF_SHARED_SNAPSHOT_PUBLISH): str,
+        vol.Optional(CONF_SHARED_SNAPSHOT_ATTACH): str
     },
     extra=vol.ALLOW_EXTRA
 )
@@ -0,0 +1,642 @@
+"""Memory mapped station snapshots shared between processes.
+
+A single fetcher process publishes its caches as an immutable file of fixed
+width columns (coordinates, timestamps and one price column per fuel type)
+plus a table of every distinct string. Other processes map the file read
+only, so every reader shares the same pages and nothing is copied until a
+station is serialized. Each publish writes a new generation file and then
+moves a pointer file into place, readers swap to a generation as a whole.
+"""
+
+import heapq
+import json
+import logging
+import math
+import mmap
+import os
+import struct
+import time
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Hashable, Iterator, Mapping
+from datetime import datetime
+
+from .distances import within_radius
+from .fuel import Fuel
+from .fuel_locations import FuelLocation
+from .snapshot import decode_json_value, encode_json_value
+from .spatial import DEFAULT_CELL_SIZE, GridIndex
+
+_LOGGER = logging.getLogger(__name__)
+
+SHARED_SNAPSHOT_MAGIC = b"PFPSHARE"
+SHARED_SNAPSHOT_VERSION = 1
+SHARED_SNAPSHOT_POINTER = "current"
+SHARED_SNAPSHOT_KEEP = 2  # generations left on disk for readers still using them
+NO_STRING = 0xFFFFFFFF
+
+# native byte order, the file is only shared between processes on one host
+_BYTE_ORDER_CHECK = 0x01020304
+# magic, version, byte order, generation, stations, fuel types, cells,
+# strings, string bytes, cell size
+_HEADER = struct.Struct("=8sIIQIIIIQd")
+# per station columns holding an index into the string table
+_STRING_COLUMNS = (
+    "ids", "names", "addresses", "brands", "postcodes", "currencies", "props", "sources"
+)
+
+
+def _layout(stations: int,
+            fuels: int,
+            cells: int,
+            strings: int,
+            string_bytes: int) -> dict[str, tuple[int, str, int]]:
+    """Return name -> (offset, format, length) for every column of a file.
+
+    8 byte columns come first so every column is aligned to its item size.
+    """
+    sections = [
+        ("lat", "d", stations),
+        ("long", "d", stations),
+        ("last_updated", "d", stations),
+        ("next_update", "d", stations),
+        ("prices", "d", fuels * stations),
+        ("cell_keys", "q", cells),
+        *[(name, "I", stations) for name in _STRING_COLUMNS],
+        ("fuel_types", "I", fuels),
+        ("fuel_props", "I", fuels * stations),
+        ("id_order", "I", stations),
+        ("cell_starts", "I", cells + 1),
+        ("string_offsets", "I", strings + 1),
+        ("strings", "B", string_bytes)
+    ]
+    layout = {}
+    offset = _HEADER.size
+    for name, fmt, length in sections:
+        layout[name] = (offset, fmt, length)
+        offset += length * struct.calcsize(fmt)
+    return layout
+
+
+def _to_float(value) -> float:
+    """Convert a value into a float, returning NaN if invalid."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _timestamp(value: datetime | None) -> float:
+    """Convert an optional datetime into a timestamp, NaN when missing."""
+    return math.nan if value is None else value.timestamp()
+
+
+def _dumps(value) -> str | None:
+    """Encode props as JSON."""
+    if value is None:
+        return None
+    return json.dumps(value, separators=(",", ":"), default=encode_json_value)
+
+
+class _StringTable:
+    """Deduplicated UTF-8 strings addressed by index."""
+
+    def __init__(self):
+        self.index: dict[str, int] = {}
+        self.offsets = array("I", [0])
+        self.data = bytearray()
+
+    def add(self, value) -> int:
+        """Return the index of a string, adding it if needed."""
+        if value is None:
+            return NO_STRING
+        value = str(value)
+        index = self.index.get(value)
+        if index is None:
+            index = self.index[value] = len(self.index)
+            self.data += value.encode("utf-8")
+            self.offsets.append(len(self.data))
+        return index
+
+
+def build_shared_snapshot(sources: Mapping[str, Mapping[str, FuelLocation]],
+                          cell_size: float = DEFAULT_CELL_SIZE) -> bytearray:
+    """Encode the caches of every source into the shared snapshot format.
+
+    Stations are ordered by grid cell so each cell is a contiguous range of
+    rows, a second ordering by (source, id) allows lookups by site id.
+    """
+    grid = GridIndex(cell_size)
+    strings = _StringTable()
+    fuel_index: dict[str, int] = {}
+    rows = []
+    for source_id, cache in sources.items():
+        for location in cache.values():
+            lat = _to_float(location.lat)
+            long = _to_float(location.long)
+            if math.isnan(lat) or math.isnan(long):
+                cell = -1
+            else:
+                row, col = grid._cell(lat, long)
+                cell = row * grid._columns + col
+            # read once, the caches may change while this runs in a worker thread
+            fuels = [(fuel.fuel_type, fuel.cost, fuel.props) for fuel in tuple(location._fuels.values())]
+            for fuel_type, _, _ in fuels:
+                fuel_index.setdefault(fuel_type, len(fuel_index))
+            rows.append((cell, source_id, str(location._id), lat, long, location, fuels))
+    rows.sort(key=lambda row: row[:3])
+
+    count = len(rows)
+    columns = {
+        "lat": array("d"),
+        "long": array("d"),
+        "last_updated": array("d"),
+        "next_update": array("d"),
+        "prices": array("d", [math.nan]) * (len(fuel_index) * count),
+        "cell_keys": array("q"),
+        "fuel_types": array("I", [strings.add(fuel_type) for fuel_type in fuel_index]),
+        "fuel_props": array("I", [NO_STRING]) * (len(fuel_index) * count),
+        "cell_starts": array("I")
+    }
+    for name in _STRING_COLUMNS:
+        columns[name] = array("I")
+    for position, (cell, source_id, site_id, lat, long, location, fuels) in enumerate(rows):
+        if len(columns["cell_keys"]) == 0 or columns["cell_keys"][-1] != cell:
+            columns["cell_keys"].append(cell)
+            columns["cell_starts"].append(position)
+        columns["lat"].append(lat)
+        columns["long"].append(long)
+        columns["last_updated"].append(_timestamp(location.last_updated))
+        columns["next_update"].append(_timestamp(location.next_update))
+        columns["ids"].append(strings.add(site_id))
+        columns["names"].append(strings.add(location._name))
+        columns["addresses"].append(strings.add(location._address))
+        columns["brands"].append(strings.add(location._brand))
+        columns["postcodes"].append(strings.add(location._postal_code))
+        columns["currencies"].append(strings.add(location._currency))
+        columns["props"].append(strings.add(_dumps(location.props)))
+        columns["sources"].append(strings.add(source_id))
+        for fuel_type, cost, fuel_props in fuels:
+            cost = _to_float(0 if cost is None else cost)
+            cell_index = fuel_index[fuel_type] * count + position
+            # NaN marks a missing fuel, an unparseable cost is stored as 0
+            columns["prices"][cell_index] = 0.0 if math.isnan(cost) else cost
+            columns["fuel_props"][cell_index] = strings.add(_dumps(fuel_props))
+    columns["cell_starts"].append(count)
+    columns["id_order"] = array("I", sorted(range(count), key=lambda p: rows[p][1:3]))
+    columns["string_offsets"] = strings.offsets
+    columns["strings"] = strings.data
+
+    layout = _layout(
+        count, len(fuel_index), len(columns["cell_keys"]), len(strings.index), len(strings.data)
+    )
+    offset, fmt, length = layout["strings"]
+    data = bytearray(offset + length * struct.calcsize(fmt))
+    _HEADER.pack_into(
+        data, 0, SHARED_SNAPSHOT_MAGIC, SHARED_SNAPSHOT_VERSION, _BYTE_ORDER_CHECK, 0,
+        count, len(fuel_index), len(columns["cell_keys"]), len(strings.index),
+        len(strings.data), cell_size
+    )
+    for name, (offset, _, _) in layout.items():
+        column = memoryview(columns[name])
+        data[offset:offset + column.nbytes] = column
+    return data
+
+
+def generation_path(directory: str, generation: int) -> str:
+    """Return the file holding a snapshot generation."""
+    return os.path.join(directory, f"stations-{generation}.bin")
+
+
+def read_generation(directory: str) -> int:
+    """Return the generation currently published in a directory, 0 if none."""
+    try:
+        with open(os.path.join(directory, SHARED_SNAPSHOT_POINTER), encoding="ascii") as file:
+            return int(file.read().strip())
+    except (OSError, ValueError):
+        return 0
+
+
+def publish_shared_snapshot(directory: str,
+                            data: bytearray,
+                            keep: int = SHARED_SNAPSHOT_KEEP) -> int:
+    """Write a snapshot as the next generation and point readers at it.
+
+    The generation file and then the pointer are written next to their
+    targets and moved into place, so readers never see a partial file.
+    Older generations are removed, readers that mapped them keep their pages.
+    """
+    os.makedirs(directory, exist_ok=True)
+    generation = read_generation(directory) + 1
+    header = list(_HEADER.unpack_from(data))
+    header[3] = generation
+    _HEADER.pack_into(data, 0, *header)
+    path = generation_path(directory, generation)
+    with open(f"{path}.tmp", "wb") as file:
+        file.write(data)
+    os.replace(f"{path}.tmp", path)
+    pointer = os.path.join(directory, SHARED_SNAPSHOT_POINTER)
+    with open(f"{pointer}.tmp", "w", encoding="ascii") as file:
+        file.write(str(generation))
+    os.replace(f"{pointer}.tmp", pointer)
+    for old in range(generation - keep, 0, -1):
+        try:
+            os.remove(generation_path(directory, old))
+        except FileNotFoundError:
+            break
+        except OSError as err:
+            # still open by a reader on platforms that lock mapped files
+            _LOGGER.debug("Unable to remove shared snapshot generation %s: %s", old, err)
+    return generation
+
+
+class SharedSnapshot:
+    """A read only view over one mapped snapshot generation.
+
+    Columns are memoryviews straight over the mapping, stations are read
+    through SharedStation views and strings are only decoded on access.
+    """
+
+    def __init__(self, path: str):
+        """Map a snapshot file."""
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+        if len(view) < _HEADER.size:
+            raise ValueError("Shared snapshot is truncated.", path)
+        (magic, version, byte_order, self.generation, self.count, fuels, cells,
+         strings, string_bytes, self.cell_size) = _HEADER.unpack_from(view)
+        if (
+            magic != SHARED_SNAPSHOT_MAGIC
+            or version != SHARED_SNAPSHOT_VERSION
+            or byte_order != _BYTE_ORDER_CHECK
+        ):
+            raise ValueError("Unsupported shared snapshot.", path)
+        layout = _layout(self.count, fuels, cells, strings, string_bytes)
+        offset, fmt, length = layout["strings"]
+        if len(view) < offset + length * struct.calcsize(fmt):
+            raise ValueError("Shared snapshot is truncated.", path)
+        for name, (offset, fmt, length) in layout.items():
+            setattr(self, name, view[offset:offset + length * struct.calcsize(fmt)].cast(fmt))
+        self.fuel_index = {
+            self.string(index): column for column, index in enumerate(self.fuel_types)
+        }
+        self._sources: dict[int, str] = {}
+        self.grid = SharedGrid(self)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def string(self, index: int) -> str | None:
+        """Decode a string from the string table."""
+        if index == NO_STRING:
+            return None
+        return str(self.strings[self.string_offsets[index]:self.string_offsets[index + 1]], "utf-8")
+
+    def json(self, index: int):
+        """Decode a JSON value from the string table."""
+        if index == NO_STRING:
+            return None
+        return json.loads(self.string(index), object_hook=decode_json_value)
+
+    def source(self, position: int) -> str:
+        """Return the source id of a station."""
+        index = self.sources[position]
+        source_id = self._sources.get(index)
+        if source_id is None:
+            source_id = self._sources[index] = self.string(index)
+        return source_id
+
+    def key(self, position: int) -> tuple[str, int]:
+        """Return the (source_id, row) key of a station."""
+        return self.source(position), position
+
+    def station(self, key: tuple[str, int]) -> 'SharedStation':
+        """Return a view of the station for a key."""
+        return SharedStation(self, key[1])
+
+    def get(self, site_id: str, source_id: str) -> 'SharedStation | None':
+        """Return a station by its site id."""
+        target = (source_id, str(site_id))
+        index = bisect_left(
+            self.id_order, target, key=lambda p: (self.source(p), self.string(self.ids[p]))
+        )
+        if index < self.count:
+            position = self.id_order[index]
+            if (self.source(position), self.string(self.ids[position])) == target:
+                return SharedStation(self, position)
+        return None
+
+    def price(self, position: int, column: int) -> float:
+        """Return the price in a fuel column for a station, NaN when missing."""
+        return self.prices[column * self.count + position]
+
+    def _within(self, coordinates, radius: float, source_id: str) -> list[tuple[int, float]]:
+        """Return (row, miles) within radius, scanning the coordinate columns."""
+        rows = [
+            position for owner, position in self.grid.query_radius(
+                coordinates[0], coordinates[1], radius
+            )
+            if source_id in ("", owner)
+        ]
+        return [
+            (rows[index], dist) for index, dist in within_radius(
+                coordinates,
+                array("d", [self.lat[position] for position in rows]),
+                array("d", [self.long[position] for position in rows]),
+                radius
+            )
+        ]
+
+    def sites_within(self,
+                     coordinates,
+                     radius: float,
+                     source_id: str = "") -> list[tuple['SharedStation', float]]:
+        """Return (site, miles) within radius."""
+        return [
+            (SharedStation(self, position), dist)
+            for position, dist in self._within(coordinates, radius, source_id)
+        ]
+
+    def cheapest_sites(self,
+                       coordinates,
+                       radius: float,
+                       fuel_type: str,
+                       limit: int | None = None,
+                       source_id: str = "") -> list[tuple[float, float, 'SharedStation']]:
+        """Return (cost, miles, site) for a fuel within radius, cheapest first.
+
+        Costs are read from the price column, views are only created for
+        the stations returned.
+        """
+        column = self.fuel_index.get(fuel_type)
+        if column is None:
+            return []
+        matches = []
+        for position, dist in self._within(coordinates, radius, source_id):
+            cost = self.price(position, column)
+            if cost > 0:
+                matches.append((cost, dist, position))
+        if limit is None:
+            matches.sort()
+        else:
+            matches = heapq.nsmallest(limit, matches)
+        return [(cost, dist, SharedStation(self, position)) for cost, dist, position in matches]
+
+
+class _SharedCells(Mapping):
+    """The cell directory of a snapshot, mapping a cell to its station keys."""
+
+    def __init__(self, snapshot: SharedSnapshot, columns: int):
+        self._snapshot = snapshot
+        self._columns = columns
+
+    def __getitem__(self, cell: tuple[int, int] | None) -> list[tuple[str, int]]:
+        cell_key = -1 if cell is None else cell[0] * self._columns + cell[1]
+        cell_keys = self._snapshot.cell_keys
+        index = bisect_left(cell_keys, cell_key)
+        if index == len(cell_keys) or cell_keys[index] != cell_key:
+            raise KeyError(cell)
+        starts = self._snapshot.cell_starts
+        return list(map(self._snapshot.key, range(starts[index], starts[index + 1])))
+
+    def __iter__(self) -> Iterator[tuple[int, int] | None]:
+        for cell_key in self._snapshot.cell_keys:
+            yield None if cell_key < 0 else divmod(cell_key, self._columns)
+
+    def __len__(self) -> int:
+        return len(self._snapshot.cell_keys)
+
+
+class _SharedMembers(Mapping):
+    """Every station key of a snapshot, mapping a key to its cell."""
+
+    def __init__(self, snapshot: SharedSnapshot, columns: int):
+        self._snapshot = snapshot
+        self._columns = columns
+
+    def __getitem__(self, key: tuple[str, int]) -> tuple[int, int] | None:
+        try:
+            source_id, position = key
+        except (TypeError, ValueError):
+            raise KeyError(key) from None
+        if not (
+            isinstance(position, int)
+            and 0 <= position < self._snapshot.count
+            and self._snapshot.source(position) == source_id
+        ):
+            raise KeyError(key)
+        cell_key = self._snapshot.cell_keys[bisect_right(self._snapshot.cell_starts, position) - 1]
+        return None if cell_key < 0 else divmod(cell_key, self._columns)
+
+    def __iter__(self) -> Iterator[tuple[str, int]]:
+        return map(self._snapshot.key, range(self._snapshot.count))
+
+    def __len__(self) -> int:
+        return self._snapshot.count
+
+
+class SharedGrid(GridIndex):
+    """A read only GridIndex over the cell directory of a snapshot.
+
+    Stations of a cell are a contiguous range of rows in the file, so
+    queries reuse the GridIndex walks without building any index.
+    """
+
+    def __init__(self, snapshot: SharedSnapshot):
+        """Create a grid over a mapped snapshot."""
+        super().__init__(snapshot.cell_size)
+        self._cells = _SharedCells(snapshot, self._columns)
+        self._members = _SharedMembers(snapshot, self._columns)
+
+    def insert(self, key: Hashable, lat, long):
+        raise TypeError("Shared snapshots are read only.")
+
+    def remove(self, key: Hashable):
+        raise TypeError("Shared snapshots are read only.")
+
+    def clear(self):
+        raise TypeError("Shared snapshots are read only.")
+
+
+def _string(name: str) -> property:
+    """Return a read only property decoding a string column for the view's row."""
+    def getter(self):
+        return self._snapshot.string(getattr(self._snapshot, name)[self._row])
+
+    return property(getter)
+
+
+def _float(name: str) -> property:
+    """Return a read only property reading a float column for the view's row."""
+    def getter(self):
+        return getattr(self._snapshot, name)[self._row]
+
+    return property(getter)
+
+
+def _datetime(name: str) -> property:
+    """Return a read only property converting a timestamp column for the view's row."""
+    def getter(self):
+        value = getattr(self._snapshot, name)[self._row]
+        return None if math.isnan(value) else datetime.fromtimestamp(value)
+
+    return property(getter)
+
+
+class SharedStation(FuelLocation):
+    """A read only FuelLocation backed by a row of a mapped snapshot."""
+
+    __slots__ = ("_snapshot", "_row", "_props")
+
+    def __init__(self, snapshot: SharedSnapshot, row: int):
+        """Create a view, fields are never copied out of the snapshot."""
+        # FuelLocation.__init__ is not called as it would assign every field.
+        self._snapshot = snapshot
+        self._row = row
+        self._props = None
+        self._serialized = None
+        self._owner = None
+        self.area_check = None
+
+    _id = _string("ids")
+    _name = _string("names")
+    _address = _string("addresses")
+    _brand = _string("brands")
+    _postal_code = _string("postcodes")
+    _currency = _string("currencies")
+    lat = _float("lat")
+    long = _float("long")
+    last_updated = _datetime("last_updated")
+    next_update = _datetime("next_update")
+
+    @property
+    def props(self) -> dict | None:
+        if self._props is None:
+            self._props = self._snapshot.json(self._snapshot.props[self._row])
+        return self._props
+
+    @property
+    def last_access(self) -> None:
+        """Shared stations are never evicted, so reads are not recorded."""
+        return None
+
+    @last_access.setter
+    def last_access(self, value):
+        """Reads are not recorded."""
+
+    @property
+    def _fuels(self) -> '_SharedFuels':
+        return _SharedFuels(self._snapshot, self._row)
+
+
+class _SharedFuels(Mapping):
+    """The fuels of a single snapshot row, keyed by fuel type."""
+
+    __slots__ = ("_snapshot", "_row")
+
+    def __init__(self, snapshot: SharedSnapshot, row: int):
+        self._snapshot = snapshot
+        self._row = row
+
+    def __getitem__(self, fuel_type: str) -> 'SharedFuel':
+        column = self._snapshot.fuel_index.get(fuel_type)
+        if column is None or math.isnan(self._snapshot.price(self._row, column)):
+            raise KeyError(fuel_type)
+        return SharedFuel(self._snapshot, self._row, column)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter([
+            fuel_type for fuel_type, column in self._snapshot.fuel_index.items()
+            if not math.isnan(self._snapshot.price(self._row, column))
+        ])
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+class SharedFuel(Fuel):
+    """A read only Fuel backed by the price columns of a mapped snapshot."""
+
+    __slots__ = ("_snapshot", "_row", "_column")
+
+    def __init__(self, snapshot: SharedSnapshot, row: int, column: int):
+        """Create a view, fields are never copied out of the snapshot."""
+        # Fuel.__init__ is not called as it would assign every field.
+        self._snapshot = snapshot
+        self._row = row
+        self._column = column
+
+    @property
+    def _fuel_type(self) -> str:
+        return self._snapshot.string(self._snapshot.fuel_types[self._column])
+
+    @property
+    def _cost(self) -> float:
+        return self._snapshot.price(self._row, self._column)
+
+    @property
+    def _props(self) -> dict | None:
+        return self._snapshot.json(
+            self._snapshot.fuel_props[self._column * self._snapshot.count + self._row]
+        )
+
+    @property
+    def _owner(self):
+        """Snapshots only hold current prices, there is no history to look up."""
+        return None
+
+
+class SharedSnapshotReader:
+    """Attach to the snapshots published into a directory.
+
+    The pointer file is checked at most once per check_interval seconds,
+    a new generation is mapped and swapped in with a single assignment so
+    queries that already hold the previous generation finish against it.
+    """
+
+    def __init__(self, directory: str, check_interval: float = 1.0):
+        """Attach to a directory, mapping the current generation if any."""
+        self.directory = directory
+        self.check_interval = check_interval
+        self._snapshot: SharedSnapshot | None = None
+        self._checked: float | None = None
+        self.refresh()
+
+    @property
+    def generation(self) -> int:
+        """Return the generation in use, 0 before anything was published."""
+        return 0 if self._snapshot is None else self._snapshot.generation
+
+    def refresh(self) -> bool:
+        """Swap to the latest published generation, returns True if it changed."""
+        self._checked = time.monotonic()
+        generation = read_generation(self.directory)
+        if generation == 0 or generation == self.generation:
+            return False
+        try:
+            snapshot = SharedSnapshot(generation_path(self.directory, generation))
+        except (OSError, ValueError) as err:
+            _LOGGER.warning("Unable to attach to shared snapshot generation %s: %s",
+                            generation, err)
+            return False
+        self._snapshot = snapshot
+        _LOGGER.debug("Attached to shared snapshot generation %s with %s stations",
+                      generation, len(snapshot))
+        return True
+
+    def current(self) -> SharedSnapshot | None:
+        """Return the latest generation, checking for a new one when due."""
+        if self._checked is None or time.monotonic() - self._checked >= self.check_interval:
+            self.refresh()
+        return self._snapshot
+
+    def query_index(self, source_id: str = "") -> tuple[GridIndex, Callable]:
+        """Return the grid of the latest generation and a function resolving its keys."""
+        snapshot = self.current()
+        if snapshot is None:
+            return GridIndex(), lambda key: None
+        if source_id == "":
+            return snapshot.grid, snapshot.station
+        return snapshot.grid, lambda key: snapshot.station(key) if key[0] == source_id else None
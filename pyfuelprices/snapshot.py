@@ -0,0 +1,126 @@
+"""Persistent snapshots of source caches for warm starts."""
+
+import base64
+import gzip
+import json
+import logging
+import os
+
+from array import array
+from collections.abc import Mapping
+from datetime import datetime
+
+from .fuel import Fuel
+from .fuel_locations import FuelLocation
+from .retention import CompressedPayload
+
+_LOGGER = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+COMPRESSED_PAYLOAD_KEY = "__compressed_payload__"
+
+
+def encode_json_value(value):
+    """Encode values the json module does not support."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, CompressedPayload):
+        # kept compressed so it is restored exactly as it was retained
+        return {COMPRESSED_PAYLOAD_KEY: base64.b64encode(value.compressed).decode("ascii")}
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, array):
+        return value.tolist()
+    return str(value)
+
+
+def decode_json_value(value: dict):
+    """Restore values encoded by encode_json_value."""
+    if len(value) == 1 and COMPRESSED_PAYLOAD_KEY in value:
+        return CompressedPayload.from_compressed(base64.b64decode(value[COMPRESSED_PAYLOAD_KEY]))
+    return value
+
+
+def _datetime(value: str | None) -> datetime | None:
+    """Decode an optional ISO formatted datetime."""
+    return None if value is None else datetime.fromisoformat(value)
+
+
+def location_to_record(location: FuelLocation) -> dict:
+    """Convert a cached location into a snapshot record."""
+    return {
+        "id": location._id,
+        "name": location._name,
+        "address": location._address,
+        "lat": location.lat,
+        "long": location.long,
+        "brand": location._brand,
+        "currency": location._currency,
+        "postal_code": location._postal_code,
+        "last_updated": location.last_updated,
+        "next_update": location.next_update,
+        "props": location.props,
+        "fuels": [[f.fuel_type, f.cost, f.props] for f in tuple(location._fuels.values())]
+    }
+
+
+def location_from_record(location_cls: type[FuelLocation], record: dict) -> FuelLocation:
+    """Create a location from a snapshot record."""
+    location = location_cls.create(
+        site_id=record["id"],
+        name=record["name"],
+        address=record["address"],
+        lat=record["lat"],
+        long=record["long"],
+        brand=record["brand"],
+        available_fuels=[Fuel(fuel_type, cost, props) for fuel_type, cost, props in record["fuels"]],
+        last_updated=_datetime(record["last_updated"]),
+        postal_code=record["postal_code"],
+        currency=record["currency"],
+        props=record["props"]
+    )
+    # not every location class accepts next_update in create
+    location.next_update = _datetime(record["next_update"])
+    return location
+
+
+def write_snapshot(path: str, sources: dict[str, dict]):
+    """Write source states to a gzip compressed JSON file.
+
+    The locations of each state are converted to records here, so the
+    whole snapshot can be written from a worker thread. The file is
+    written next to the target and moved into place, so a crash never
+    leaves a partial snapshot behind.
+    """
+    sources = {
+        source_id: {
+            **state,
+            "locations": [location_to_record(location) for location in state["locations"]]
+        }
+        for source_id, state in sources.items()
+    }
+    payload = json.dumps(
+        {"version": SNAPSHOT_VERSION, "sources": sources},
+        separators=(",", ":"),
+        default=encode_json_value
+    ).encode("utf-8")
+    temp_path = f"{path}.tmp"
+    with gzip.open(temp_path, "wb", compresslevel=6) as file:
+        file.write(payload)
+    os.replace(temp_path, path)
+
+
+def read_snapshot(path: str) -> dict[str, dict]:
+    """Read source states from a snapshot, returning nothing if it is missing or invalid."""
+    try:
+        with gzip.open(path, "rb") as file:
+            snapshot = json.loads(file.read(), object_hook=decode_json_value)
+    except FileNotFoundError:
+        return {}
+    except (OSError, EOFError, ValueError) as err:
+        _LOGGER.warning("Ignoring unreadable snapshot %s: %s", path, err)
+        return {}
+    if not isinstance(snapshot, dict) or snapshot.get("version") != SNAPSHOT_VERSION:
+        _LOGGER.warning("Ignoring snapshot %s with an unsupported version", path)
+        return {}
+    return snapshot.get("sources", {})
@@ -1,26 +1,141 @@
 """Data sources and translators for pyfuelprices."""
 
 import asyncio
+import heapq
 import logging
+import math
+from collections.abc import Callable, Hashable
 from datetime import timedelta, datetime
 from typing import final
-from geopy import (
-    distance
-)
 import aiohttp
 
 from pyfuelprices.const import (
+    PROP_FUEL_LOCATION_DYNAMIC_BUILD,
     PROP_FUEL_LOCATION_PREVENT_CACHE_CLEANUP,
     PROP_AREA_LAT,
     PROP_AREA_LONG,
-    PROP_AREA_RADIUS
+    PROP_AREA_RADIUS,
+    CONF_PAYLOAD_RETENTION,
+    CONF_PAYLOAD_KEYS,
+    CONF_FUEL_PAYLOAD_KEYS,
+    CONF_CACHE_TTL,
+    CONF_CACHE_MAX_SITES,
+    CONF_CACHE_MAX_BYTES,
+    CONF_PRICE_HISTORY_SIZE,
+    PAYLOAD_RETENTION_NONE
 )
+from pyfuelprices.access import ACCESS_CLOCK
+from pyfuelprices.areas import attribute_sites, expansion_areas, plan_areas
+from pyfuelprices.delta import UpdateDelta
+from pyfuelprices.distances import within_radius, sites_within_radius
 from pyfuelprices.fuel_locations import FuelLocation, Fuel
+from pyfuelprices.history import PriceHistory
 from pyfuelprices.enum import SupportsConfigType
-from pyfuelprices.schemas import SOURCE_BASE_CONFIG
+from pyfuelprices.eviction import CacheEvictor
+from pyfuelprices.price_index import PriceIndex
+from pyfuelprices.query_cache import RadiusQueryCache
+from pyfuelprices.retention import CompressedPayload, PayloadRetention
+from pyfuelprices.schemas import (
+    SOURCE_BASE_CONFIG,
+    SOURCE_COMMON_CONFIG,
+    SOURCE_COMMON_CONFIG_KEYS
+)
+from pyfuelprices.snapshot import location_from_record
+from pyfuelprices.spatial import GridIndex
 
 _LOGGER = logging.getLogger(__name__)
 
+
+async def nearest_locations(tree: GridIndex,
+                            resolve: Callable[[Hashable], FuelLocation | None],
+                            coordinates,
+                            k: int,
+                            fuel_type: str | None = None,
+                            max_radius: float | None = None) -> list[dict]:
+    """Return the k nearest locations in a spatial index.
+
+    The index is walked outward ring by ring and the walk stops as soon as
+    k matches are closer than anything left unvisited.
+    """
+    radius = math.inf if max_radius is None else max_radius
+    nearest: list[tuple[float, FuelLocation]] = []
+    if k <= 0:
+        return []
+    for keys, bound in tree.walk_rings(coordinates[0], coordinates[1]):
+        candidates = [site for site in map(resolve, keys) if site is not None]
+        for site, dist in sites_within_radius(coordinates, candidates, radius):
+            if fuel_type is not None:
+                await site.dynamic_build_fuels()
+                try:
+                    if site.get_fuel(fuel_type).cost <= 0:
+                        continue
+                except ValueError:
+                    continue
+            nearest.append((dist, site))
+        nearest = heapq.nsmallest(k, nearest, key=lambda item: item[0])
+        if len(nearest) == k and nearest[-1][0] <= bound:
+            break
+        if bound >= radius:
+            break
+    locations = []
+    for dist, site in nearest:
+        site.last_access = ACCESS_CLOCK.tick
+        if fuel_type is None:
+            await site.dynamic_build_fuels()
+        location = site.as_result(distance=dist)
+        if fuel_type is not None:
+            location["cost"] = site.get_fuel(fuel_type).cost
+        locations.append(location)
+    return locations
+
+
+class LocationCache(dict):
+    """A location cache that counts its changes.
+
+    Sources note the version they last indexed, so sites added, replaced or
+    removed directly in the cache are found without comparing every entry.
+    """
+
+    __slots__ = ("version",)
+
+    def __init__(self, *args, **kwargs):
+        """Create a new location cache."""
+        super().__init__(*args, **kwargs)
+        self.version = 0
+
+    def __setitem__(self, key, value):
+        self.version += 1
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self.version += 1
+        super().__delitem__(key)
+
+    def __ior__(self, other):
+        self.version += 1
+        return super().__ior__(other)
+
+    def clear(self):
+        self.version += 1
+        super().clear()
+
+    def pop(self, *args):
+        self.version += 1
+        return super().pop(*args)
+
+    def popitem(self):
+        self.version += 1
+        return super().popitem()
+
+    def setdefault(self, key, default=None):
+        self.version += 1
+        return super().setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        self.version += 1
+        super().update(*args, **kwargs)
+
+
 class Source:
     """Base source, all instances inherit this."""
 
@@ -31,16 +146,35 @@ class Source:
     _raw_data = None
     _timeout: int = 30
     _configured_areas: list[dict] = []
+    _area_generation: int = 0
+    _area_members: set[str] | None = None
+    _fetched: dict[str, FuelLocation] | None = None
+    area_results: list[tuple[dict, set[str] | Exception]] = []
     _client_session: aiohttp.ClientSession = None
     update_interval: timedelta = None
     next_update: datetime = datetime.now()
     provider_name: str = ""
     location_cache: dict[str, FuelLocation] = None
+    _indexed_version: int | None = None  # location cache version the indexes reflect
+    location_tree: GridIndex | None = None
+    shared_location_tree: GridIndex | None = None
+    query_cache: RadiusQueryCache | None = None
+    price_index: PriceIndex | None = None
+    cache_version: int = 0
     configuration: dict | None = None
     attr_config_type: SupportsConfigType = SupportsConfigType.NONE
     attr_config = SOURCE_BASE_CONFIG
     country_code: str | list[str]
     enabled: bool = True
+    fetch_on_miss: bool = False
+    max_area_radius: float | None = None
+    payload_retention: str = PAYLOAD_RETENTION_NONE
+    payload_keys: tuple[str, ...] = ()
+    fuel_payload_keys: tuple[str, ...] = ()
+    cache_ttl: timedelta | None = timedelta(days=2)
+    cache_max_sites: int | None = None
+    cache_max_bytes: int | None = None
+    price_history_size: int = 0  # price changes kept per fuel, 0 disables history
     available_for_setup: bool = True
     auto_country_mapping: bool = True
 
@@ -67,61 +201,463 @@ class Source:
             self.next_update = datetime.now()
         self._validate_config(configuration)
         self.configuration = configuration
+        common = SOURCE_COMMON_CONFIG(configuration or {})
+        mode = common.get(CONF_PAYLOAD_RETENTION, self.payload_retention)
+        self._payload_retention = PayloadRetention(
+            mode, common.get(CONF_PAYLOAD_KEYS, self.payload_keys)
+        )
+        self._fuel_payload_retention = PayloadRetention(
+            mode, common.get(CONF_FUEL_PAYLOAD_KEYS, self.fuel_payload_keys)
+        )
+        if CONF_CACHE_TTL in common:
+            self.cache_ttl = (
+                None if common[CONF_CACHE_TTL] is None
+                else timedelta(hours=common[CONF_CACHE_TTL])
+            )
+        self.cache_max_sites = common.get(CONF_CACHE_MAX_SITES, self.cache_max_sites)
+        self.cache_max_bytes = common.get(CONF_CACHE_MAX_BYTES, self.cache_max_bytes)
+        self.price_history_size = common.get(CONF_PRICE_HISTORY_SIZE, self.price_history_size)
+        # each instance indexes its own copy of the class level cache
+        self.location_cache = LocationCache(self.location_cache or {})
+        self._indexed_version = self.location_cache.version
+        self.location_tree = GridIndex()
+        self.query_cache = RadiusQueryCache()
+        self.price_index = PriceIndex(
+            on_change=self._price_changed, cell_of=self.location_tree.cell_of
+        )
+        self._evictor = CacheEvictor(self.cache_max_sites, self.cache_max_bytes)
+        self._delta = UpdateDelta()
+        # kept apart from the fuels as most sources keep no history
+        self._price_histories: dict[str, dict[str, PriceHistory]] = {}
 
     @final
     def _check_if_coord_in_area(self, coordinates) -> bool:
         """Check to see if given coordinates are in a configured area."""
-        for area in self._configured_areas:
-            if distance.distance(
-                coordinates,
-                (area[PROP_AREA_LAT], area[PROP_AREA_LONG])
-            ).miles <= area[PROP_AREA_RADIUS]:
-                return True
-        return False
+        if len(self._configured_areas) == 0:
+            return False
+        return len(within_radius(
+            coordinates,
+            [float(a[PROP_AREA_LAT]) for a in self._configured_areas],
+            [float(a[PROP_AREA_LONG]) for a in self._configured_areas],
+            [a[PROP_AREA_RADIUS] for a in self._configured_areas],
+            inclusive=True
+        )) > 0
+
+    @final
+    @property
+    def configured_areas(self) -> list[dict]:
+        """Return the configured areas."""
+        return self._configured_areas
+
+    @final
+    @configured_areas.setter
+    def configured_areas(self, new_val: list[dict]):
+        """Set the configured areas, invalidating stored area membership."""
+        self._configured_areas = new_val or []
+        self._area_generation += 1
+        self._area_members = None
+        # sites that were pinned by the old areas may be evictable again
+        for site_id, site in self.location_cache.items():
+            self._track_eviction(site_id, site)
+
+    @final
+    def _site_in_area(self, site: FuelLocation) -> bool:
+        """Return True if a site is in a configured area, recomputed only if it has moved."""
+        check = (self._area_generation, site.lat, site.long)
+        if site.area_check is None or site.area_check[:3] != check:
+            try:
+                in_area = self._check_if_coord_in_area((site.lat, site.long))
+            except (TypeError, ValueError):
+                in_area = False
+            site.area_check = (*check, in_area)
+        return site.area_check[3]
+
+    @final
+    def _update_area_membership(self, site_id: str, site: FuelLocation):
+        """Recompute area membership for a site if it is new or has moved."""
+        if self._site_in_area(site):
+            self._area_members.add(site_id)
+        else:
+            self._area_members.discard(site_id)
+
+    @final
+    def sites_in_area(self) -> dict[str, FuelLocation]:
+        """Return all cached sites within a configured area.
+
+        Membership is stored on each site when it is inserted or moves, the
+        full cache is only checked again after the configured areas change.
+        """
+        if self._area_members is None:
+            self._area_members = set()
+            for site_id, site in self.location_cache.items():
+                self._update_area_membership(site_id, site)
+        sites = {}
+        for site_id in list(self._area_members):
+            site = self.location_cache.get(site_id)
+            if site is None:
+                self._area_members.discard(site_id)
+                continue
+            sites[site_id] = site
+        return sites
 
     async def get_site(self, site_id) -> FuelLocation:
         """Return an individual fuel location from the remote API."""
         await self.location_cache[site_id].dynamic_build_fuels()
         return self.location_cache[site_id]
 
+    @final
+    async def _cache_location(self, location: FuelLocation) -> FuelLocation:
+        """Insert or update a location in the cache and spatial index."""
+        site_id = location.id
+        indexed = self._cache_indexed()
+        if site_id not in self.location_cache:
+            self.location_cache[site_id] = location
+            self._delta.site_added(site_id)
+        else:
+            cached = self.location_cache[site_id]
+            old = (cached.lat, cached.long)
+            await cached.update(location)
+            self._delta.site_moved(site_id, old, (cached.lat, cached.long))
+        cached = self.location_cache[site_id]
+        self._index_location(site_id, cached)
+        if indexed:
+            self._indexed_version = self.location_cache.version
+        if self._fetched is not None:
+            self._fetched[site_id] = cached
+        return cached
+
+    @final
+    def _index_location(self, site_id: str, site: FuelLocation):
+        """Place a cached location into the spatial indexes."""
+        self.cache_version += 1
+        site._owner = self
+        self.location_tree.insert(site_id, site.lat, site.long)
+        fuels = site.available_fuels
+        self.price_index.track(site_id, fuels)
+        for fuel in fuels:
+            self._start_history(site_id, fuel)
+        self._track_eviction(site_id, site)
+        if self._area_members is not None:
+            self._update_area_membership(site_id, site)
+        if self.shared_location_tree is not None:
+            self.shared_location_tree.insert(
+                (self.provider_name, site_id), site.lat, site.long
+            )
+
+    @final
+    def _start_history(self, site_id: str, fuel: Fuel):
+        """Start recording the price changes of a cached fuel if history is enabled."""
+        if self.price_history_size <= 0:
+            return
+        histories = self._price_histories.setdefault(site_id, {})
+        if fuel.fuel_type not in histories:
+            history = histories[fuel.fuel_type] = PriceHistory(self.price_history_size)
+            history.append(fuel.cost)
+
+    @final
+    def history_for(self, site_id: str, fuel_type: str) -> PriceHistory | None:
+        """Return the price history kept for a fuel of a cached site."""
+        return self._price_histories.get(site_id, {}).get(fuel_type)
+
+    @final
+    def _fuel_changed(self, site_id: str, fuel: Fuel, old_fuel_type: str, old_cost: float):
+        """Called by a cached location after one of its fuels was updated."""
+        # results cached by the query cache hold the old price
+        self.cache_version += 1
+        if old_fuel_type == fuel.fuel_type and old_cost == fuel.cost:
+            return
+        self.price_index.fuel_updated(site_id, old_fuel_type, fuel, old_cost)
+        if old_fuel_type != fuel.fuel_type:
+            self._price_histories.get(site_id, {}).pop(old_fuel_type, None)
+            self._start_history(site_id, fuel)
+            return
+        history = self.history_for(site_id, fuel.fuel_type)
+        if history is not None:
+            history.append(fuel.cost)
+
+    @final
+    def _fuel_added(self, site_id: str, fuel: Fuel):
+        """Called by a cached location after a new fuel was added to it."""
+        self.cache_version += 1
+        self.price_index.add(site_id, fuel)
+        self._start_history(site_id, fuel)
+        site = self.location_cache.get(site_id)
+        if site is not None:
+            self._track_eviction(site_id, site)
+
+    @final
+    def _fuel_removed(self, site_id: str, fuel_type: str):
+        """Called by a cached location after its fuels were replaced without a fuel type."""
+        self.cache_version += 1
+        self.price_index.remove_fuel(site_id, fuel_type)
+        self._price_histories.get(site_id, {}).pop(fuel_type, None)
+
+    @final
+    def _price_changed(self,
+                       site_id: str,
+                       fuel_type: str,
+                       old: float | None,
+                       new: float | None):
+        """Record a price change reported by the price index."""
+        self._delta.price_changed(site_id, fuel_type, old, new)
+
+    @property
+    def has_changes(self) -> bool:
+        """Return if the cache changed since the last delta was taken."""
+        return bool(self._delta)
+
+    @final
+    def take_delta(self) -> UpdateDelta:
+        """Return the changes made to the cache since the last call.
+
+        Changes are collected as responses are parsed, from inserts,
+        FuelLocation.update, Fuel.update and evictions, so consumers only
+        need to touch the rows that changed.
+        """
+        delta, self._delta = self._delta, UpdateDelta()
+        return delta
+
+    @final
+    def _track_eviction(self, site_id: str, site: FuelLocation):
+        """Record a cached site with the evictor."""
+        self._evictor.track(
+            site_id,
+            site,
+            ACCESS_CLOCK.tick,
+            ttl_exempt=(site.props or {}).get(PROP_FUEL_LOCATION_PREVENT_CACHE_CLEANUP, False)
+        )
+
+    @final
+    def _remove_location(self, site_id: str):
+        """Remove a site from the cache and every index."""
+        indexed = self._cache_indexed()
+        site = self.location_cache.pop(site_id, None)
+        if site is not None:
+            self._delta.site_removed(site_id)
+            if site._owner is self:
+                site._owner = None
+        self.location_tree.remove(site_id)
+        self.price_index.remove(site_id)
+        self._price_histories.pop(site_id, None)
+        self._evictor.discard(site_id)
+        if self._area_members is not None:
+            self._area_members.discard(site_id)
+        if self.shared_location_tree is not None:
+            self.shared_location_tree.remove((self.provider_name, site_id))
+        self.cache_version += 1
+        if indexed:
+            self._indexed_version = self.location_cache.version
+
+    @final
+    def _cache_indexed(self) -> bool:
+        """Return True if the indexes reflect every change made to the location cache."""
+        cache = self.location_cache
+        return isinstance(cache, LocationCache) and cache.version == self._indexed_version
+
+    @final
+    def share_location_tree(self, tree: GridIndex):
+        """Mirror this source's locations into a cross-source spatial index."""
+        self.shared_location_tree = tree
+        for site_id, site in self.location_cache.items():
+            tree.insert((self.provider_name, site_id), site.lat, site.long)
+
+    @final
+    def sync_location_tree(self):
+        """Rebuild the spatial indexes if the location cache was changed directly."""
+        if self._cache_indexed():
+            return
+        if not isinstance(self.location_cache, LocationCache):
+            self.location_cache = LocationCache(self.location_cache)
+        self._indexed_version = self.location_cache.version
+        self.cache_version += 1
+        self.price_index.clear()
+        self._evictor.clear()
+        indexed = set(self.location_tree)
+        for site_id in indexed:
+            self.location_tree.remove(site_id)
+            if self.shared_location_tree is not None:
+                self.shared_location_tree.remove((self.provider_name, site_id))
+            if site_id not in self.location_cache:
+                self._delta.site_removed(site_id)
+                self._price_histories.pop(site_id, None)
+        for site_id, site in self.location_cache.items():
+            if site_id not in indexed:
+                self._delta.site_added(site_id)
+            self._index_location(site_id, site)
+
     async def search_sites(self, coordinates, radius: float) -> list[dict]:
-        """Return all available sites within a given radius."""
-        locations = []
-        for site in self.location_cache.values():
-            dist = distance.distance(coordinates,
-                                (
-                                    site.lat,
-                                    site.long
-                                )).miles
-            if dist < radius:
-                await site.dynamic_build_fuels()
-                locations.append(
-                    {
-                        **site.__dict__,
-                        "distance": dist
-                    }
-                )
-        return locations
+        """Return all available sites within a given radius.
+
+        Sources that support fetch on miss will query the API for the area
+        when nothing is cached nearby.
+        """
+        locations = await self._search_location_cache(coordinates, radius)
+        if len(locations) > 0 or not self.fetch_on_miss:
+            return locations
+        await self._fetch_point(coordinates, radius)
+        return await self._search_location_cache(coordinates, radius)
+
+    @final
+    async def find_sites(self,
+                         coordinates,
+                         radius: float,
+                         fetch: bool = True) -> list[tuple[FuelLocation, float]]:
+        """Return (site, miles) for all sites within a given radius without serializing.
+
+        Follows the same fetch on miss behaviour as search_sites unless fetch
+        is False, in which case only the local cache is searched.
+        """
+        sites = await self._sites_in_radius(coordinates, radius)
+        if len(sites) > 0 or not self.fetch_on_miss or not fetch:
+            return sites
+        await self._fetch_point(coordinates, radius)
+        return await self._sites_in_radius(coordinates, radius)
+
+    @final
+    async def _fetch_point(self, coordinates, radius: float):
+        """Fetch a single point and radius from the API."""
+        await self.fetch_areas([{
+            PROP_AREA_LAT: coordinates[0],
+            PROP_AREA_LONG: coordinates[1],
+            PROP_AREA_RADIUS: radius
+        }])
+
+    async def fetch_areas(self, areas: list[dict]):
+        """Populate the cache for areas that returned no results."""
+        await self.update(areas=areas, force=True)
+
+    @final
+    async def fetch_annulus(self, coordinates, inner: float, outer: float):
+        """Fetch the ring between inner and outer miles of a point."""
+        await self.fetch_areas(expansion_areas(
+            float(coordinates[0]), float(coordinates[1]), inner, outer, self.max_area_radius
+        ))
+
+    @final
+    async def _sites_in_radius(self, coordinates, radius: float) -> list[tuple[FuelLocation, float]]:
+        """Return (site, miles) for all cached sites within a given radius."""
+        self.sync_location_tree()
+        keys = list(self.location_tree.query_radius(coordinates[0], coordinates[1], radius))
+        sites = sites_within_radius(coordinates, [
+            self.location_cache[site_id] for site_id in keys
+            if site_id in self.location_cache
+        ], radius)
+        for site, _ in sites:
+            site.last_access = ACCESS_CLOCK.tick
+            await site.dynamic_build_fuels()
+        return sites
+
+    @final
+    async def _search_location_cache(self, coordinates, radius: float) -> list[dict]:
+        """Return all cached sites within a given radius.
+
+        Results are cached until this source's cache changes, sites that are
+        built on access are never cached so they can still refresh.
+        """
+        self.sync_location_tree()
+        sites = self.query_cache.get(coordinates, radius, self.cache_version)
+        if sites is not None:
+            for site, _ in sites:
+                site.last_access = ACCESS_CLOCK.tick
+        else:
+            sites = await self._sites_in_radius(coordinates, radius)
+            if not any(
+                (site.props or {}).get(PROP_FUEL_LOCATION_DYNAMIC_BUILD, False)
+                for site, _ in sites
+            ):
+                self.query_cache.put(coordinates, radius, self.cache_version, sites)
+        return [
+            site.as_result(distance=dist)
+            for site, dist in sites
+        ]
+
+    async def find_nearest(self,
+                           coordinates,
+                           k: int,
+                           fuel_type: str | None = None,
+                           max_radius: float | None = None) -> list[dict]:
+        """Return the k nearest sites, optionally only those selling a fuel type."""
+        self.sync_location_tree()
+        return await nearest_locations(
+            tree=self.location_tree,
+            resolve=self.location_cache.get,
+            coordinates=coordinates,
+            k=k,
+            fuel_type=fuel_type,
+            max_radius=max_radius
+        )
+
+    @final
+    def cheapest_sites(self,
+                       coordinates,
+                       radius: float,
+                       fuel_type: str,
+                       limit: int | None = None) -> list[tuple[float, float, FuelLocation]]:
+        """Return (cost, miles, site) for a fuel within radius, cheapest first.
+
+        Prices of the grid cells touching the radius are merged from the
+        lowest upward and the walk stops once limit sites have been found
+        inside the radius.
+        """
+        self.sync_location_tree()
+        cells = self.location_tree.cells_in_radius(coordinates[0], coordinates[1], radius)
+        sites = []
+        for cost, site_id in self.price_index.cheapest(fuel_type, cells):
+            if limit is not None and len(sites) >= limit:
+                break
+            site = self.location_cache.get(site_id)
+            if site is None:
+                continue
+            for _, dist in sites_within_radius(coordinates, [site], radius):
+                site.last_access = ACCESS_CLOCK.tick
+                sites.append((cost, dist, site))
+        return sites
+
+    async def find_cheapest(self,
+                            coordinates,
+                            radius: float,
+                            fuel_type: str,
+                            limit: int | None = None) -> list[dict]:
+        """Return sites selling a fuel within radius, cheapest first."""
+        return [
+            site.as_result(cost=cost, distance=dist)
+            for cost, dist, site in self.cheapest_sites(coordinates, radius, fuel_type, limit)
+        ]
 
     async def update_area(self, area: dict) -> bool:
         """Update a given area."""
         raise NotImplementedError("Not implemented.")
 
     async def update(self, areas=None, force=False) -> list[FuelLocation]:
-        """Update hooks for the data source."""
+        """Update hooks for the data source.
+
+        Overlapping areas are fetched once through a covering area. The
+        results are attributed back to the areas asked for in area_results
+        as (area, ids of the sites cached inside it) or (area, exception)
+        when the covering request failed.
+        """
         _LOGGER.debug("Starting update hook for %s to url %s", self.provider_name, self._url)
         areas = areas or self._configured_areas
-        self._clear_cache()
+        self.evict_cache()
         if self.next_update > datetime.now() and not force:
             _LOGGER.debug("Ignoring update request")
             return
+        plan = plan_areas(areas, self.max_area_radius)
         coros = [
-            self.update_area(a) for a in areas
+            self.update_area(a) for a, _ in plan
         ]
-        results = await asyncio.gather(*coros, return_exceptions=True)
-        for result in results:
+        self._fetched = {}
+        try:
+            results = await asyncio.gather(*coros, return_exceptions=True)
+        finally:
+            fetched, self._fetched = self._fetched, None
+        self.area_results = []
+        for (_, covered), result in zip(plan, results):
             if isinstance(result, Exception):
-                _LOGGER.error("Update area failed: %s", result)
+                _LOGGER.error("Update area failed for %s: %s", covered, result)
+                self.area_results.extend((area, result) for area in covered)
+                continue
+            self.area_results.extend(zip(covered, attribute_sites(covered, fetched)))
         self.next_update = datetime.now() + self.update_interval
         return list(self.location_cache.values())
 
@@ -130,17 +666,124 @@ class Source:
         raise NotImplementedError("This function is not available for this module.")
 
     @final
-    def _clear_cache(self):
-        """Remove data for fuel stations that have not been accessed."""
-        for x in range(len(self.location_cache)):
-            last_access = list(self.location_cache.values())[x].last_access
-            if last_access is not None:
-                if last_access <= datetime.now()-timedelta(days=2):
-                    if not list(self.location_cache.values())[x].props.get(
-                        PROP_FUEL_LOCATION_PREVENT_CACHE_CLEANUP,
-                        False
-                    ):
-                        list(self.location_cache.values())[x].available_fuels = []
+    def evict_cache(self) -> int:
+        """Evict expired and least recently used sites, returning how many were removed.
+
+        Sites that have not been accessed within cache_ttl are removed unless
+        they are marked to prevent cache cleanup, then the least recently used
+        sites are removed until cache_max_sites and cache_max_bytes are met.
+        Sites inside a configured area are never evicted. Ages are measured
+        in access clock ticks, which the scheduler advances once per cycle.
+        """
+        evicted = 0
+        for site_id in self._evictor.candidates(
+            self.location_cache,
+            None if self.cache_ttl is None else ACCESS_CLOCK.expiry_tick(self.cache_ttl),
+            lambda _, site: self._site_in_area(site)
+        ):
+            self._remove_location(site_id)
+            evicted += 1
+        if evicted > 0:
+            _LOGGER.debug("Evicted %s sites from %s", evicted, self.provider_name)
+        return evicted
+
+    @final
+    def snapshot(self) -> dict:
+        """Return the state of this source for a persistent snapshot.
+
+        Locations are listed as they are cached, write_snapshot converts
+        them to records off the event loop. Price histories are copied as
+        (timestamps, prices) per site and fuel type.
+        """
+        return {
+            "next_update": None if self.next_update is None else self.next_update.isoformat(),
+            "locations": list(self.location_cache.values()),
+            "histories": {
+                site_id: {fuel_type: history.slice() for fuel_type, history in histories.items()}
+                for site_id, histories in self._price_histories.items()
+            }
+        }
+
+    @final
+    def load_snapshot(self, state: dict) -> int:
+        """Restore a snapshot, returning how many locations were added.
+
+        Locations that are already cached are newer than the snapshot and
+        are kept. The next update time is restored so a source that is not
+        yet due is not fetched again straight after a restart, as are the
+        price histories of restored fuels if this source keeps history.
+        """
+        if state.get("next_update") is not None:
+            self.next_update = datetime.fromisoformat(state["next_update"])
+        restored = 0
+        indexed = self._cache_indexed()
+        for record in state.get("locations", []):
+            if record["id"] in self.location_cache:
+                continue
+            try:
+                location = self.restore_location(record)
+            except (KeyError, TypeError, ValueError) as err:
+                _LOGGER.debug("Skipping invalid snapshot record for %s: %s",
+                              self.provider_name, err)
+                continue
+            self.location_cache[location.id] = location
+            self._delta.site_added(location.id)
+            self._index_location(location.id, location)
+            self._restore_histories(location.id, state.get("histories", {}).get(location.id, {}))
+            restored += 1
+        if indexed:
+            self._indexed_version = self.location_cache.version
+        return restored
+
+    @final
+    def _restore_histories(self, site_id: str, histories: dict):
+        """Replace the histories started for a restored site with the snapshot ones."""
+        for fuel_type, record in histories.items():
+            if self.history_for(site_id, fuel_type) is None:
+                continue
+            try:
+                self._price_histories[site_id][fuel_type] = PriceHistory.restore(
+                    self.price_history_size, *record
+                )
+            except (TypeError, ValueError, OverflowError) as err:
+                _LOGGER.debug("Skipping invalid snapshot history for %s: %s", site_id, err)
+
+    def restore_location(self, record: dict) -> FuelLocation:
+        """Create a location from a snapshot record."""
+        return location_from_record(FuelLocation, record)
+
+    @final
+    def cache_stats(self, hot_ticks: int = 1) -> dict:
+        """Return the size of the cache and how many sites are in the hot set.
+
+        A site is hot if it was read within the last hot_ticks access clock
+        ticks, including the current one.
+        """
+        oldest_hot = ACCESS_CLOCK.tick - hot_ticks + 1
+        hot = 0
+        never = 0
+        for site in self.location_cache.values():
+            if site.last_access is None:
+                never += 1
+            elif site.last_access >= oldest_hot:
+                hot += 1
+        return {
+            "tick": ACCESS_CLOCK.tick,
+            "sites": len(self.location_cache),
+            "estimated_bytes": self._evictor.total_bytes,
+            "hot_sites": hot,
+            "never_accessed": never
+        }
+
+    @final
+    def retain_payload(self, payload: dict | None) -> dict | CompressedPayload | None:
+        """Return the part of a raw station payload to keep in props."""
+        return self._payload_retention.retain(payload)
+
+    @final
+    def retain_fuel_payload(self, payload: dict | None) -> dict | CompressedPayload | None:
+        """Return the part of a raw fuel payload to keep in the fuel props."""
+        return self._fuel_payload_retention.retain(payload)
 
     def parse_fuels(self, fuels) -> list[Fuel]:
         """Parses the fuels response from the update hook.
@@ -154,6 +797,12 @@ class Source:
             return True
         if self.attr_config is None:
             return True
+        if configuration is not None:
+            # common options apply to every source and are validated separately
+            configuration = {
+                k: v for k, v in configuration.items()
+                if k not in SOURCE_COMMON_CONFIG_KEYS
+            }
         self.attr_config(configuration)
 
 class UpdateFailedError(Exception):
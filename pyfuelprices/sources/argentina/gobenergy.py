@@ -9,8 +9,7 @@ from pyfuelprices.const import (
     PROP_FUEL_LOCATION_PREVENT_CACHE_CLEANUP,
     PROP_FUEL_LOCATION_SOURCE_ID,
     PROP_AREA_LAT,
-    PROP_AREA_LONG,
-    PROP_AREA_RADIUS
+    PROP_AREA_LONG
 )
 from pyfuelprices.sources import Source
 from pyfuelprices.fuel import Fuel
@@ -29,6 +28,7 @@ class GobEnergySource(Source):
     update_interval = timedelta(hours=12) # hardcoded due to slow servers
     provider_name=AR_GOB_ENERGY_ID
     location_cache: dict[str, FuelLocation] = {}
+    fetch_on_miss = True
     _url: str = AR_GOB_DATASOURCE
 
     async def _send_request(self, url, body) -> str:
@@ -43,25 +43,17 @@ class GobEnergySource(Source):
                             url,
                             response)
 
-    async def search_sites(self, coordinates, radius: float) -> list[dict]:
-        """Return all available sites within a given radius."""
-        # first query the API to populate cache / update data in case this data is unavailable.
-        data = await super().search_sites(coordinates, radius)
-        if len(data)>0:
-            return data
-        await self.update(
-            areas=[{
-                PROP_AREA_LAT: coordinates[0],
-                PROP_AREA_LONG: coordinates[1],
-                PROP_AREA_RADIUS: radius
-            }],
-            force=True
-        )
-        return await super().search_sites(coordinates, radius)
-
     async def update_area(self, area: dict) -> bool:
         """Update a given area."""
         try:
+            country_code = await geocoder.country_code_lookup(
+                (area[PROP_AREA_LAT], area[PROP_AREA_LONG])
+            )
+            if country_code != "ar":
+                _LOGGER.debug("Skipping area %s as not in AR.",
+                            area)
+                return False
+            # province and town are required by the API
             geocode = await geocoder.geocode_reverse_lookup(
                 (area[PROP_AREA_LAT], area[PROP_AREA_LONG])
             )
@@ -69,10 +61,6 @@ class GobEnergySource(Source):
             _LOGGER.warning("Timeout occured while geocoding area %s.",
                             area)
             return False
-        if geocode.raw["address"]["country_code"] != "ar":
-            _LOGGER.debug("Skipping area %s as not in AR.",
-                        area)
-            return False
         response = json.loads(await self._send_request(
             url=self._url,
             body={
@@ -117,10 +105,7 @@ class GobEnergySource(Source):
                     },
                     next_update=self.next_update
                 )
-            if site_id not in self.location_cache:
-                self.location_cache[site_id] = location
-            else:
-                await self.location_cache[site_id].update(location)
+            await self._cache_location(location)
         return list(self.location_cache.values())
 
     def parse_fuels(self, fuels) -> list[Fuel]:
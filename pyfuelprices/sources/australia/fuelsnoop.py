@@ -27,6 +27,7 @@ class FuelSnoopSource(Source):
     provider_name = "fuelsnoop"
     _fuel_products: list[str] = []
     location_cache: dict[str, FuelLocation] = {}
+    fetch_on_miss = True
     location_tree = None
 
     async def _send_request(self, url, body):
@@ -41,22 +42,6 @@ class FuelSnoopSource(Source):
                             url,
                             response)
 
-    async def search_sites(self, coordinates, radius: float) -> list[dict]:
-        """Return all available sites within a given radius."""
-        # first query the API to populate cache / update data in case this data is unavailable.
-        data = await super().search_sites(coordinates, radius)
-        if len(data)>0:
-            return data
-        await self.update(
-            areas=[{
-                PROP_AREA_LAT: coordinates[0],
-                PROP_AREA_LONG: coordinates[1],
-                PROP_AREA_RADIUS: radius
-            }],
-            force=True
-        )
-        return await super().search_sites(coordinates, radius)
-
     async def update_area(self, area)  -> bool:
         """Update a given area."""
         _LOGGER.debug("Searching FuelSnoop for FuelLocations at area %s",
@@ -104,15 +89,11 @@ class FuelSnoopSource(Source):
                 PROP_FUEL_LOCATION_SOURCE: self.provider_name,
                 PROP_FUEL_LOCATION_SOURCE_ID: station["id"],
                 PROP_FUEL_LOCATION_PREVENT_CACHE_CLEANUP: True,
-                "data": station
+                "data": self.retain_payload(station)
             }
         )
         loc.next_update = self.next_update + self.update_interval
-        if site_id not in self.location_cache:
-            self.location_cache[site_id] = loc
-        else:
-            await self.location_cache[site_id].update(loc)
-        return self.location_cache[site_id]
+        return await self._cache_location(loc)
 
     def parse_fuels(self, fuels: dict) -> list[Fuel]:
         output = []
@@ -125,6 +106,6 @@ class FuelSnoopSource(Source):
             output.append(Fuel(
                 fuel_type=k,
                 cost=f["price"]/100,
-                props=f
+                props=self.retain_fuel_payload(f)
             ))
         return output
@@ -64,7 +64,7 @@ class FuelWatchSource(Source):
             available_fuels=[Fuel(
                 fuel_type=station["productFuelType"],
                 cost=station["product"].get("priceToday", 0),
-                props=station["product"]
+                props=self.retain_fuel_payload(station["product"])
             )],
             postal_code=station['address']['postCode'],
             currency="",
@@ -72,7 +72,7 @@ class FuelWatchSource(Source):
                 PROP_FUEL_LOCATION_SOURCE: self.provider_name,
                 PROP_FUEL_LOCATION_SOURCE_ID: station["id"],
                 PROP_FUEL_LOCATION_PREVENT_CACHE_CLEANUP: True,
-                "data": station
+                "data": self.retain_payload(station)
             }
         )
         loc.next_update = self.next_update + self.update_interval
@@ -80,20 +80,13 @@ class FuelWatchSource(Source):
 
     def _update_fuel_station_prices(self, station, site_id):
         """Internal method to update station prices."""
-        try:
-            self.location_cache[site_id].get_fuel(station["productFuelType"]).update(
+        self.location_cache[site_id].add_or_update_fuel(
+            Fuel(
                 fuel_type=station["productFuelType"],
                 cost=station["product"].get("priceToday", 0),
-                props=station["product"]
-            )
-        except ValueError:
-            self.location_cache[site_id].available_fuels.append(
-                Fuel(
-                    fuel_type=station["productFuelType"],
-                    cost=station["product"].get("priceToday", 0),
-                    props=station["product"]
-                )
+                props=self.retain_fuel_payload(station["product"])
             )
+        )
 
     async def update(self, areas=None, force=False) -> list[FuelLocation]:
         """Custom update handler to look all products."""
@@ -113,7 +106,7 @@ class FuelWatchSource(Source):
                         self._update_fuel_station_prices(station, site_id)
                         continue
                     loc = self._parse_raw_fuel_station(station, site_id)
-                    self.location_cache[loc.id] = loc
+                    await self._cache_location(loc)
                     continue
             self.next_update += self.update_interval
             return list(self.location_cache.values())
@@ -27,6 +27,8 @@ class PetrolSpySource(Source):
     provider_name = "petrolspy"
     _fuel_products: list[str] = []
     location_cache: dict[str, FuelLocation] = {}
+    fetch_on_miss = True
+    max_area_radius = 15.0
     location_tree = None
 
     async def _send_request(self, url):
@@ -40,24 +42,19 @@ class PetrolSpySource(Source):
                             url,
                             response)
 
-    async def search_sites(self, coordinates, radius: float) -> list[dict]:
-        """Return all available sites within a given radius."""
-        # first query the API to populate cache / update data in case this data is unavailable.
-        data = await super().search_sites(coordinates, radius)
-        if len(data)>0:
-            return data
-        if radius > 15.0:
-            _LOGGER.warning("Radius %s too large for this provider. Limiting to %s", radius, 15.0)
-            radius = 15.0
+    async def fetch_areas(self, areas: list[dict]):
+        """Populate the cache for areas that returned no results."""
+        for area in areas:
+            if area[PROP_AREA_RADIUS] > self.max_area_radius:
+                _LOGGER.warning("Radius %s too large for this provider. Limiting to %s",
+                                area[PROP_AREA_RADIUS], self.max_area_radius)
         await self.update(
-            areas=[{
-                PROP_AREA_LAT: coordinates[0],
-                PROP_AREA_LONG: coordinates[1],
-                PROP_AREA_RADIUS: radius
-            }],
+            areas=[
+                {**a, PROP_AREA_RADIUS: min(a[PROP_AREA_RADIUS], self.max_area_radius)}
+                for a in areas
+            ],
             force=True
         )
-        return await super().search_sites(coordinates, radius)
 
     async def update_area(self, area) -> bool:
         """Update a given area."""
@@ -104,15 +101,11 @@ class PetrolSpySource(Source):
                 PROP_FUEL_LOCATION_SOURCE: self.provider_name,
                 PROP_FUEL_LOCATION_SOURCE_ID: station["id"],
                 PROP_FUEL_LOCATION_PREVENT_CACHE_CLEANUP: True,
-                "data": station
+                "data": self.retain_payload(station)
             }
         )
         loc.next_update = self.next_update + self.update_interval
-        if site_id not in self.location_cache:
-            self.location_cache[site_id] = loc
-        else:
-            await self.location_cache[site_id].update(loc)
-        return self.location_cache[site_id]
+        return await self._cache_location(loc)
 
     def parse_fuels(self, fuels: dict) -> list[Fuel]:
         output = []
@@ -121,6 +114,6 @@ class PetrolSpySource(Source):
             output.append(Fuel(
                 fuel_type=k,
                 cost=f["amount"]/100,
-                props=f
+                props=self.retain_fuel_payload(f)
             ))
         return output
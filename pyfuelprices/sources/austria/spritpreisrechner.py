@@ -12,9 +12,9 @@ from pyfuelprices.const import (
     PROP_FUEL_LOCATION_SOURCE_ID,
     PROP_AREA_LAT,
     PROP_AREA_LONG,
-    PROP_AREA_RADIUS,
     DESKTOP_USER_AGENT,
 )
+from pyfuelprices.areas import plan_areas
 from pyfuelprices.fuel_locations import FuelLocation, Fuel
 from pyfuelprices.sources import Source
 from pyfuelprices.helpers import geocoder
@@ -36,6 +36,7 @@ class SpripreisrechnerATSource(Source):
     provider_name = "spritpreisrechner"
     _headers = {"User-Agent": DESKTOP_USER_AGENT}
     location_cache: dict[str, FuelLocation] = {}
+    fetch_on_miss = True
     location_tree = None
     _regions = []
 
@@ -64,7 +65,7 @@ class SpripreisrechnerATSource(Source):
                 Fuel(
                     fuel_type=f["label"],
                     cost=f["amount"],
-                    props=f
+                    props=self.retain_fuel_payload(f)
                 ) for f in station["prices"]
             ],
             postal_code=station["location"]["postalCode"],
@@ -73,7 +74,7 @@ class SpripreisrechnerATSource(Source):
                 PROP_FUEL_LOCATION_SOURCE: self.provider_name,
                 PROP_FUEL_LOCATION_SOURCE_ID: station["id"],
                 PROP_FUEL_LOCATION_PREVENT_CACHE_CLEANUP: True,
-                "data": station,
+                "data": self.retain_payload(station),
             },
         )
         loc.next_update = self.next_update + self.update_interval
@@ -83,14 +84,9 @@ class SpripreisrechnerATSource(Source):
         """Internal method to update station prices."""
         if len(station["prices"]) > 0:
             fuel = station["prices"][0]
-            try:
-                self.location_cache[site_id].get_fuel(fuel["label"]).update(
-                    fuel_type=fuel["label"], cost=fuel["amount"], props=fuel
-                )
-            except ValueError:
-                self.location_cache[site_id].available_fuels.append(
-                    Fuel(fuel_type=fuel["label"], cost=fuel["amount"], props=fuel)
-                )
+            self.location_cache[site_id].add_or_update_fuel(
+                Fuel(fuel_type=fuel["label"], cost=fuel["amount"], props=self.retain_fuel_payload(fuel))
+            )
             self.location_cache[site_id].last_updated = datetime.now()
             self.location_cache[site_id].next_update = self.next_update + self.update_interval
 
@@ -98,11 +94,11 @@ class SpripreisrechnerATSource(Source):
         """Update given areas."""
         _LOGGER.debug("Searching FuelGR for FuelLocations at area %s", area)
         parser_coords = (area[PROP_AREA_LAT], area[PROP_AREA_LONG])
-        geocoded = await geocoder.geocode_reverse_lookup(parser_coords)
-        if geocoded is None:
+        country_code = await geocoder.country_code_lookup(parser_coords)
+        if country_code is None:
             _LOGGER.debug("Geocode failed, skipping area %s", area)
             return False
-        if geocoded.raw["address"]["country_code"] not in ["at"]:
+        if country_code not in ["at"]:
             _LOGGER.debug("Geocode not within AT, skipping area %s", area)
             return False
         for fuel in CONST_FUELS:
@@ -125,26 +121,13 @@ class SpripreisrechnerATSource(Source):
             )
             await self.parse_response(json.loads(await self._send_request(url)))
 
-    async def search_sites(self, coordinates, radius: float) -> list[dict]:
-        """Return all available sites within a given radius."""
-        # first query the API to populate cache / update data in case this data is unavailable.
-        data = await super().search_sites(coordinates, radius)
-        if len(data)>0:
-            return data
-        await self.update(
-            areas=[{
-                PROP_AREA_LAT: coordinates[0],
-                PROP_AREA_LONG: coordinates[1],
-                PROP_AREA_RADIUS: radius
-            }],
-            force=True
-        )
-        return await super().search_sites(coordinates, radius)
-
     async def update(self, areas=None, force: bool | None = None) -> list[FuelLocation]:
         """Custom update handler to query each region."""
         if (datetime.now() > self.next_update) or force:
-            coros = [self.update_area(x) for x in areas]
+            coros = [
+                self.update_area(x)
+                for x, _ in plan_areas(areas or self._configured_areas, self.max_area_radius)
+            ]
             if len(self._regions) == 0:
                 await self._load_regions()
             coros.extend(
@@ -163,7 +146,7 @@ class SpripreisrechnerATSource(Source):
                 self._update_fuel_station_prices(station, site_id)
                 continue
             loc = self._parse_raw_fuel_station(station, site_id)
-            self.location_cache[loc.id] = loc
+            await self._cache_location(loc)
             continue
 
     def parse_fuels(self, fuels) -> list[Fuel]:
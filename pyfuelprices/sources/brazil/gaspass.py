@@ -33,6 +33,7 @@ class GasPassSource(Source):
 
     provider_name = "gaspass"
     location_cache: dict[str, FuelLocation] = {}
+    fetch_on_miss = True
 
     def __init__(self, configured_areas = None, update_interval = ..., client_session = None, configuration = None):
         if update_interval.seconds < 3600:
@@ -66,33 +67,17 @@ class GasPassSource(Source):
                 )
             return await response.text()
 
-    async def search_sites(self, coordinates, radius: float) -> list[dict]:
-        """Return all available sites within a given radius."""
-        # first query the API to populate cache / update data in case this data is unavailable.
-        data = await super().search_sites(coordinates, radius)
-        if len(data)>0:
-            return data
-        await self.update(
-            areas=[{
-                PROP_AREA_LAT: coordinates[0],
-                PROP_AREA_LONG: coordinates[1],
-                PROP_AREA_RADIUS: radius
-            }],
-            force=True
-        )
-        return await super().search_sites(coordinates, radius)
-
     async def update_area(self, area) -> bool:
         """Update a given area."""
         try:
-            geocode = await geocoder.geocode_reverse_lookup(
+            country_code = await geocoder.country_code_lookup(
                 (area[PROP_AREA_LAT], area[PROP_AREA_LONG])
             )
         except geopyexc.GeocoderTimedOut:
             _LOGGER.warning("Timeout occured while geocoding area %s.",
                             area)
             return False
-        if geocode.raw["address"]["country_code"] != "br":
+        if country_code != "br":
             _LOGGER.debug("Skipping area %s as not in BR.",
                         area)
             return False
@@ -137,10 +122,7 @@ class GasPassSource(Source):
     async def parse_response(self, response) -> list[FuelLocation]:
         for station_raw in response.get("response", []):
             station = self._parse_raw(station_raw)
-            if station.id not in self.location_cache:
-                self.location_cache[station.id] = station
-            else:
-                await self.location_cache[station.id].update(station)
+            await self._cache_location(station)
         return list(self.location_cache.values())
 
     def parse_fuels(self, fuels: dict[str, object]) -> list[Fuel]:
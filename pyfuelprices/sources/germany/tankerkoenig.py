@@ -35,6 +35,7 @@ class TankerKoenigSource(Source):
     }
     provider_name = "tankerkoenig"
     location_cache: dict[str, FuelLocation] = {}
+    fetch_on_miss = True
     update_interval = timedelta(days=1)
     # location_tree = None
 
@@ -56,25 +57,17 @@ class TankerKoenigSource(Source):
                             url,
                             response)
 
-    async def search_sites(self, coordinates, radius: float) -> list[dict]:
-        """Return all available sites within a given radius."""
-        # first query the API to populate cache / update data in case this data is unavailable.
-        data = await super().search_sites(coordinates, radius)
-        if len(data)>0:
-            return data
-        await self.update(
-            areas=[{
-                PROP_AREA_LAT: coordinates[0],
-                PROP_AREA_LONG: coordinates[1],
-                PROP_AREA_RADIUS: radius
-            }],
-            force=True
-        )
-        return await super().search_sites(coordinates, radius)
-
     async def update_area(self, area) -> bool:
         """Update a given area."""
         try:
+            country_code = await geocoder.country_code_lookup(
+                (area[PROP_AREA_LAT], area[PROP_AREA_LONG])
+            )
+            if country_code != "de":
+                _LOGGER.debug("Skipping area %s as not in DE.",
+                            area)
+                return False
+            # postcode is required by the API
             geocode = await geocoder.geocode_reverse_lookup(
                 (area[PROP_AREA_LAT], area[PROP_AREA_LONG])
             )
@@ -82,10 +75,6 @@ class TankerKoenigSource(Source):
             _LOGGER.warning("Timeout occured while geocoding area %s.",
                             area)
             return False
-        if geocode.raw["address"]["country_code"] != "de":
-            _LOGGER.debug("Skipping area %s as not in DE.",
-                        area)
-            return False
         response_raw = json.loads(await self._send_request(
             postcode=geocode.raw["address"]["postcode"],
             radius=area[PROP_AREA_RADIUS]
@@ -127,10 +116,7 @@ class TankerKoenigSource(Source):
     async def parse_response(self, response) -> list[FuelLocation]:
         for station_raw in response.get("stations", []):
             station = self._parse_raw(station_raw)
-            if station.id not in self.location_cache:
-                self.location_cache[station.id] = station
-            else:
-                await self.location_cache[station.id].update(station)
+            await self._cache_location(station)
         return list(self.location_cache.values())
 
     def parse_fuels(self, fuels: dict[str, object]) -> list[Fuel]:
@@ -34,6 +34,7 @@ class FuelGrSource(Source):
     update_interval = timedelta(days=1) # update once per day to prevent API spam.
     provider_name = "fuelgr"
     location_cache: dict[str, FuelLocation] = {}
+    fetch_on_miss = True
     location_tree = None
     _parser_coords = None
 
@@ -52,31 +53,21 @@ class FuelGrSource(Source):
         """Return a single site."""
         return self.location_cache[site_id]
 
-    async def search_sites(self, coordinates, radius: float) -> list[dict]:
-        """Return all available sites (radius not used)"""
-        # first query the API to populate the cache / update data
-        data = await super().search_sites(coordinates, radius)
-        if len(data)>0:
-            return data
-        await self.update_area(
-            {
-                PROP_AREA_LAT: coordinates[0],
-                PROP_AREA_LONG: coordinates[1]
-            }
-        )
-        return await super().search_sites(coordinates, radius)
+    async def fetch_areas(self, areas: list[dict]):
+        """Populate the cache for areas that returned no results (radius not used)."""
+        await asyncio.gather(*[self.update_area(a) for a in areas])
 
     async def update_area(self, area: dict) -> bool:
         """Used by asyncio to update areas."""
         try:
-            geocode = await geocoder.geocode_reverse_lookup(
+            country_code = await geocoder.country_code_lookup(
                 (area[PROP_AREA_LAT], area[PROP_AREA_LONG])
             )
         except geopyexc.GeocoderTimedOut:
             _LOGGER.warning("Timeout occured while geocoding area %s.",
                             area)
             return False
-        if geocode.raw["address"]["country_code"] != "gr":
+        if country_code != "gr":
             _LOGGER.debug("Skipping area %s as not in GR.",
                         area)
             return False
@@ -135,18 +126,14 @@ class FuelGrSource(Source):
             ),
             currency="EUR",
             props={
-                "data": station,
+                "data": self.retain_payload(station),
                 PROP_FUEL_LOCATION_PREVENT_CACHE_CLEANUP: True,
                 PROP_FUEL_LOCATION_SOURCE: self.provider_name,
                 PROP_FUEL_LOCATION_SOURCE_ID: station["@id"]
             },
             next_update=self.next_update
         )
-        if site_id not in self.location_cache:
-            self.location_cache[site_id] = loc
-        else:
-            await self.location_cache[site_id].update(loc)
-        return self.location_cache[site_id]
+        return await self._cache_location(loc)
 
     async def parse_response(self, response) -> list[FuelLocation]:
         """Convert fuel stations into fuel objects."""
@@ -161,7 +148,7 @@ class FuelGrSource(Source):
                 Fuel(
                     fuel_type=FUELGR_FUEL_TYPE_MAPPING.get(f["@type"], f["fn"]),
                     cost=float(f["pr"]),
-                    props=f
+                    props=self.retain_fuel_payload(f)
                 )
             )
 
@@ -30,6 +30,7 @@ class ANWBOnderwegDataSource(Source):
 
     provider_name="anwbonderweg"
     location_cache: dict[str, FuelLocation] = {}
+    fetch_on_miss = True
     auto_country_mapping = False
 
     def _build_request_url(self,lat: float, long: float, radius: float):
@@ -65,24 +66,6 @@ class ANWBOnderwegDataSource(Source):
         await self.parse_response(await response.json())
         return True
 
-    async def search_sites(self, coordinates, radius: float) -> list[dict]:
-        """Return all available sites within the bounding-box-filter"""
-        # first query the API to populate cache / update data in case this data is unavailable.
-        data = await super().search_sites(coordinates, radius)
-        if len(data)>0:
-            return data
-        await self.update(
-            areas=[
-                {
-                    PROP_AREA_LAT: coordinates[0],
-                    PROP_AREA_LONG: coordinates[1],
-                    PROP_AREA_RADIUS: radius
-                }
-            ],
-            force=True
-        )
-        return await super().search_sites(coordinates, radius)
-
     async def parse_response(self, response: dict):
         """Parse response data."""
         i = 0
@@ -116,11 +99,7 @@ class ANWBOnderwegDataSource(Source):
             },
         )
         loc.next_update = self.next_update + self.update_interval
-        if site_id not in self.location_cache:
-            self.location_cache[site_id] = loc
-        else:
-            await self.location_cache[site_id].update(loc)
-        return self.location_cache[site_id]
+        return await self._cache_location(loc)
 
 
 
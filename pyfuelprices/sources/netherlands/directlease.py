@@ -20,6 +20,8 @@ from pyfuelprices.const import (
 from pyfuelprices._version import __version__ as VERSION
 from pyfuelprices.sources import ServiceBlocked, Source, UpdateFailedError
 from pyfuelprices.fuel_locations import Fuel, FuelLocation
+from pyfuelprices.interning import intern_string
+from pyfuelprices.snapshot import location_from_record
 
 from .const import DIRECTLEASE_API_PLACES, DIRECTLEASE_API_STATION
 
@@ -47,8 +49,13 @@ def _checksum_generator(url: str) -> str:
 class DirectLeaseFuelLocation(FuelLocation):
     """DirectLease custom fuel location."""
 
-    next_update: datetime = datetime.now()
-    _client_session: aiohttp.ClientSession
+    __slots__ = ("_client_session",)
+
+    def __init__(self):
+        """Create an empty location, use create to populate one."""
+        super().__init__()
+        self.next_update = datetime.now()
+        self._client_session: aiohttp.ClientSession | None = None
 
     @classmethod
     def create(cls,
@@ -72,10 +79,10 @@ class DirectLeaseFuelLocation(FuelLocation):
         location._name = name
         location.lat = lat
         location.long = long
-        location._brand = brand
+        location._brand = intern_string(brand)
         location.available_fuels = available_fuels
         location._postal_code = postal_code
-        location._currency = currency
+        location._currency = intern_string(currency)
         location.last_updated = last_updated
         location.props = props
         location._client_session = client_session
@@ -84,10 +91,10 @@ class DirectLeaseFuelLocation(FuelLocation):
     async def dynamic_build_fuels(self):
         """Dynamic requests to build fuels."""
         _LOGGER.debug("Update requested for station %s", self._id)
-        if (len(self.available_fuels) != 0 and self.next_update > datetime.now()):
+        if (len(self._fuels) != 0 and self.next_update > datetime.now()):
             _LOGGER.debug("Update skipped, next update required at %s, current fuel count %s",
                           self.next_update,
-                          len(self.available_fuels))
+                          len(self._fuels))
             return None
 
         request_url = DIRECTLEASE_API_STATION.format(
@@ -112,8 +119,9 @@ class DirectLeaseFuelLocation(FuelLocation):
                     # opportunity to build extra location data too
                     self._postal_code = response.get("postalCode", "Unknown")
                     self._address = response.get("address", "Unknown")
-                    self._brand = response.get("brand", "Unknown")
+                    self._brand = intern_string(response.get("brand", "Unknown"))
                     self._name = response.get("name", "Unknown")
+                    self._serialized = None
                     for fuel_raw in response["fuels"]:
                         _LOGGER.debug("Parsing fuel %s", fuel_raw)
                         f_type = re.search(r"\(([^)]+)\)", fuel_raw["name"])
@@ -139,7 +147,7 @@ class DirectLeaseFuelLocation(FuelLocation):
                                 )
                         except ValueError:
                             if fuel_raw.get("price", None) is not None:
-                                self.available_fuels.append(
+                                self.add_or_update_fuel(
                                     Fuel(
                                         fuel_type=f_type,
                                         cost=fuel_raw["price"]/1000,
@@ -184,6 +192,12 @@ class DirectLeaseTankServiceParser(Source):
             update_interval=timedelta(days=1)
         super().__init__(configured_areas, update_interval, client_session, configuration)
 
+    def restore_location(self, record: dict) -> DirectLeaseFuelLocation:
+        """Restore a location along with the state used by its dynamic builds."""
+        location = location_from_record(DirectLeaseFuelLocation, record)
+        location._client_session = self._client_session
+        return location
+
     async def get_site(self, site_id) -> FuelLocation:
         await self.location_cache[site_id].dynamic_build_fuels()
         return self.location_cache[site_id]
@@ -226,6 +240,9 @@ class DirectLeaseTankServiceParser(Source):
         )
 
     async def update(self, areas=None, force=None) -> list[FuelLocation]:
+        if self.next_update > datetime.now() and not force:
+            _LOGGER.debug("Ignoring update request")
+            return list(self.location_cache.values())
         try:
             await self._update()
         except UpdateFailedError as err:
@@ -278,14 +295,12 @@ class DirectLeaseTankServiceParser(Source):
                     loc.name = f"Unknown site {loc.props[PROP_FUEL_LOCATION_SOURCE_ID]}"
                 if loc.brand is None:
                     loc.brand = "Unknown"
-                self.location_cache[site_id] = loc
+                await self._cache_location(loc)
 
-        for site in self.location_cache.values():
-            if (self._check_if_coord_in_area((
-                    site.lat, site.long)) or (
-                    len(site.available_fuels)>0
-                )):
-                await site.dynamic_build_fuels()
+        # sites outside of the configured areas refresh themselves when they
+        # are next accessed, as dynamic builds check next_update.
+        for site in self.sites_in_area().values():
+            await site.dynamic_build_fuels()
 
         return list(self.location_cache.values())
 
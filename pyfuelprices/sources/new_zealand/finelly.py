@@ -37,6 +37,7 @@ class FinellyDataSource(Source):
 
     provider_name="finelly"
     location_cache: dict[str, FuelLocation] = {}
+    fetch_on_miss = True
     attr_config_type = SupportsConfigType.REQUIRES_ONLY
     attr_config = CONFIG
 
@@ -67,24 +68,6 @@ class FinellyDataSource(Source):
         await self.parse_response(await response.json())
         return True
 
-    async def search_sites(self, coordinates, radius: float) -> list[dict]:
-        """Return all available sites within a given radius."""
-        # first query the API to populate cache / update data in case this data is unavailable.
-        data = await super().search_sites(coordinates, radius)
-        if len(data)>0:
-            return data
-        await self.update(
-            areas=[
-                {
-                    PROP_AREA_LAT: coordinates[0],
-                    PROP_AREA_LONG: coordinates[1],
-                    PROP_AREA_RADIUS: radius
-                }
-            ],
-            force=True
-        )
-        return await super().search_sites(coordinates, radius)
-
     async def parse_response(self, response: dict):
         """Parse response data."""
         for station in response:
@@ -113,11 +96,7 @@ class FinellyDataSource(Source):
             }
         )
         loc.next_update = self.next_update + self.update_interval
-        if site_id not in self.location_cache:
-            self.location_cache[site_id] = loc
-        else:
-            await self.location_cache[site_id].update(loc)
-        return self.location_cache[site_id]
+        return await self._cache_location(loc)
 
     def parse_fuels(self, fuels: list[dict]):
         """Parse fuels."""
@@ -125,6 +104,6 @@ class FinellyDataSource(Source):
             Fuel(
                 fuel_type=x.get("petrolType"),
                 cost=x.get("price"),
-                props=x
+                props=self.retain_fuel_payload(x)
             ) for x in fuels
         ]
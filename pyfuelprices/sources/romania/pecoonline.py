@@ -94,11 +94,7 @@ class PecoOnlineSource(Source):
                 PROP_FUEL_LOCATION_SOURCE_ID: station['objectId']
             }
         )
-        if site_id not in self.location_cache:
-            self.location_cache[site_id] = loc
-        else:
-            await self.location_cache[site_id].update(loc)
-        return self.location_cache[site_id]
+        return await self._cache_location(loc)
 
     async def parse_response(self, response) -> list[FuelLocation]:
         """Convert fuel stations into fuel objects."""
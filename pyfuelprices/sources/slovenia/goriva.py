@@ -25,6 +25,7 @@ class GorivaSource(Source):
 
     provider_name="goriva"
     location_cache: dict[str, FuelLocation] = {}
+    fetch_on_miss = True
     _url: str = "https://goriva.si/api/v1/search/?position={LAT},{LONG}&radius={RADIUS}&franchise=&name=&o="
 
     async def _send_request(self, url: str, lat, long, radius) -> str:
@@ -43,34 +44,17 @@ class GorivaSource(Source):
                             url,
                             response)
 
-    async def search_sites(self, coordinates, radius: float) -> list[dict]:
-        """Return all available sites within a given radius."""
-        # first query the API to populate cache / update data in case this data is unavailable.
-        data = await super().search_sites(coordinates, radius)
-        if len(data)>0:
-            return data
-        await self.update(
-            areas=[{
-                PROP_AREA_LAT: coordinates[0],
-                PROP_AREA_LONG: coordinates[1],
-                PROP_AREA_RADIUS: radius
-            }],
-            force=True
-        )
-        data = await super().search_sites(coordinates, radius)
-        return data
-
     async def update_area(self, area) -> bool:
         """Update a given area."""
         try:
-            geocode = await geocoder.geocode_reverse_lookup(
+            country_code = await geocoder.country_code_lookup(
                 (area[PROP_AREA_LAT], area[PROP_AREA_LONG])
             )
         except geopyexc.GeocoderTimedOut:
             _LOGGER.warning("Timeout occured while geocoding area %s.",
                             area)
             return False
-        if geocode.raw["address"]["country_code"] != "si":
+        if country_code != "si":
             _LOGGER.debug("Skipping area %s as not in SI.",
                         area)
             return False
@@ -106,10 +90,7 @@ class GorivaSource(Source):
                     },
                     next_update=self.next_update
                 )
-            if site_id not in self.location_cache:
-                self.location_cache[site_id] = location
-            else:
-                await self.location_cache[site_id].update(location)
+            await self._cache_location(location)
         return list(self.location_cache.values())
 
     def parse_fuels(self, fuels) -> list[Fuel]:
@@ -70,19 +70,19 @@ class ComparisSource(Source):
     async def update_area(self, area) -> bool:
         """Update a given area."""
         try:
-            geocode = await geocoder.geocode_reverse_lookup(
+            country_code = await geocoder.country_code_lookup(
                 (area[PROP_AREA_LAT], area[PROP_AREA_LONG])
             )
         except geopyexc.GeocoderTimedOut:
             _LOGGER.warning("Timeout occured while geocoding area %s.",
                             area)
             return False
-        if geocode.raw["address"]["country_code"] != "ch":
+        if country_code != "ch":
             _LOGGER.debug("Skipping area %s as not in CH.",
                         area)
             return False
         response_raw = json.loads(await self._send_request(
-            postcode=geocode.raw["address"]["postcode"],
+            postcode=None,
             radius=area[PROP_AREA_RADIUS]
         ))
         if len(response_raw) != 0:
@@ -136,10 +136,7 @@ class ComparisSource(Source):
         for station_raw in response:
             station = self._parse_raw(station_raw)
             if station: #If station information is not valid, then none is returned
-                if station.id not in self.location_cache:
-                    self.location_cache[station.id] = station
-                else:
-                    await self.location_cache[station.id].update(station)
+                await self._cache_location(station)
         return list(self.location_cache.values())
 
     def parse_fuels(self, fuels: dict[str, object]) -> list[Fuel]:
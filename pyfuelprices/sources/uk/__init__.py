@@ -99,10 +99,7 @@ class CMAParserMixIn(object):
                     },
                     next_update=self.next_update
                 )
-            if site_id not in self.location_cache:
-                self.location_cache[site_id] = location
-            else:
-                await self.location_cache[site_id].update(location)
+            await self._cache_location(location)
         return list(self.location_cache.values())
 
     def parse_fuels(self: "Source", fuels) -> list[Fuel]:
@@ -69,8 +69,5 @@ class CostcoUKSource(Source):
                 },
                 next_update=self.next_update
             )
-            if site_id not in self.location_cache:
-                self.location_cache[site_id] = location
-            else:
-                await self.location_cache[site_id].update(location)
+            await self._cache_location(location)
         return list(self.location_cache.values())
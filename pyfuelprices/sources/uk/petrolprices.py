@@ -14,6 +14,7 @@ from pyfuelprices.const import (
     PROP_FUEL_LOCATION_SOURCE_ID
 )
 
+from pyfuelprices.areas import plan_areas
 from pyfuelprices.sources import Source, FuelLocation, Fuel
 
 from .const import (
@@ -41,24 +42,7 @@ class PetrolPricesUKSource(Source):
     _fs_update_lock: asyncio.Lock = asyncio.Lock()
     provider_name = "petrolprices"
     location_cache = {}
-
-    async def search_sites(self, coordinates, radius: float) -> list[dict]:
-        """Return all available sites within a given radius."""
-        # first query the API to populate cache / update data in case this data is unavailable.
-        data = await super().search_sites(coordinates, radius)
-        if len(data)>0:
-            return data
-        await self.update(
-            areas=[
-                {
-                    PROP_AREA_LAT: coordinates[0],
-                    PROP_AREA_LONG: coordinates[1],
-                    PROP_AREA_RADIUS: radius
-                }
-            ],
-            force=True
-        )
-        return await super().search_sites(coordinates, radius)
+    fetch_on_miss = True
 
     async def _send_request(self, url, method) -> None | dict:
         """Send a HTTP request."""
@@ -124,18 +108,21 @@ class PetrolPricesUKSource(Source):
     async def update(self, areas=None, force=False):
         """Update PetrolPrices data."""
         areas = areas or self._configured_areas
-        self._clear_cache()
+        self.evict_cache()
         if self.next_update > datetime.now() and not force:
             _LOGGER.debug("Ignoring update request")
             return
-        coros = [
-            self.update_area(a, ft, code) for a in areas
+        plan = [
+            (a, covered, ft, code) for a, covered in plan_areas(areas, self.max_area_radius)
             for ft, code in CONST_PETROLPRICES_FUEL_MAP.items()
         ]
-        results = await asyncio.gather(*coros)
-        for result in results:
+        results = await asyncio.gather(
+            *[self.update_area(a, ft, code) for a, _, ft, code in plan],
+            return_exceptions=True
+        )
+        for (_, covered, ft, _), result in zip(plan, results):
             if isinstance(result, Exception):
-                _LOGGER.exception("Error updating area: %s", result)
+                _LOGGER.error("Error updating %s for %s: %s", ft, covered, result)
         self.next_update = datetime.now() + self.update_interval
         return list(self.location_cache.values())
 
@@ -162,7 +149,7 @@ class PetrolPricesUKSource(Source):
             postal_code=station["postcode"],
             currency="GBP",
             props={
-                "data": station,
+                "data": self.retain_payload(station),
                 PROP_FUEL_LOCATION_PREVENT_CACHE_CLEANUP: True,
                 PROP_FUEL_LOCATION_SOURCE: self.provider_name,
                 PROP_FUEL_LOCATION_SOURCE_ID: station['idstation']
@@ -170,11 +157,7 @@ class PetrolPricesUKSource(Source):
             next_update=self.next_update+self.update_interval
         )
         async with self._fs_update_lock:
-            if site_id not in self.location_cache:
-                self.location_cache[site_id] = loc
-            else:
-                await self.location_cache[site_id].update(loc)
-        return self.location_cache[site_id]
+            return await self._cache_location(loc)
 
     async def parse_response(self, response: dict) -> list[FuelLocation]:
         """Parse a fuel response."""
@@ -10,7 +10,8 @@ from pyfuelprices.const import (
     PROP_AREA_LONG,
     PROP_FUEL_LOCATION_SOURCE,
     PROP_FUEL_LOCATION_PREVENT_CACHE_CLEANUP,
-    PROP_FUEL_LOCATION_SOURCE_ID
+    PROP_FUEL_LOCATION_SOURCE_ID,
+    PAYLOAD_RETENTION_SELECTED
 )
 from pyfuelprices.sources import Source
 from pyfuelprices.fuel_locations import Fuel, FuelLocation
@@ -30,6 +31,10 @@ class PodPointSource(Source):
         "User-Agent": "POD Point Native Mobile App/3.27.12 (Android/14)"
     }
     location_cache: dict[str, FuelLocation] = {}
+    fetch_on_miss = True
+    # the location address is only available in the raw payload
+    payload_retention = PAYLOAD_RETENTION_SELECTED
+    payload_keys = ("address",)
 
     async def _send_request(self, url) -> dict:
         """Send a request to the API and return the raw response."""
@@ -42,31 +47,21 @@ class PodPointSource(Source):
                             url,
                             response)
 
-    async def search_sites(self, coordinates, radius: float) -> list[dict]:
-        """Return all available sites (radius not used)"""
-        # first query the API to populate the cache / update data
-        data = await super().search_sites(coordinates, radius)
-        if len(data)>0:
-            return data
-        await self.update_area(
-            {
-                PROP_AREA_LAT: coordinates[0],
-                PROP_AREA_LONG: coordinates[1]
-            }
-        )
-        return await super().search_sites(coordinates, radius)
+    async def fetch_areas(self, areas: list[dict]):
+        """Populate the cache for areas that returned no results (radius not used)."""
+        await asyncio.gather(*[self.update_area(a) for a in areas])
 
     async def update_area(self, area: dict) -> bool:
         """Update a single area."""
         try:
-            geocode = await geocoder.geocode_reverse_lookup(
+            country_code = await geocoder.country_code_lookup(
                 (area[PROP_AREA_LAT], area[PROP_AREA_LONG])
             )
         except geopyexc.GeocoderTimedOut:
             _LOGGER.warning("Timeout occured while geocoding area %s.",
                             area)
             return False
-        if geocode.raw["address"]["country_code"] != "gb":
+        if country_code != "gb":
             _LOGGER.debug("Skipping area %s as not in GB.",
                         area)
             return False
@@ -97,7 +92,7 @@ class PodPointSource(Source):
             postal_code=response["address"]["postcode"],
             next_update=self.next_update,
             props={
-                **response,
+                "data": self.retain_payload(response),
                 PROP_FUEL_LOCATION_SOURCE: self.provider_name,
                 PROP_FUEL_LOCATION_SOURCE_ID: response["id"],
                 PROP_FUEL_LOCATION_PREVENT_CACHE_CLEANUP: True
@@ -113,10 +108,7 @@ class PodPointSource(Source):
             fs.add_or_update_fuel(pod)
             fs.next_update=self.next_update
             fs.last_updated=datetime.now()
-        if site_id not in self.location_cache:
-            self.location_cache[site_id] = fs
-        else:
-            self.location_cache.get(site_id).update(fs)
+        await self._cache_location(fs)
         _LOGGER.debug("Parsed object %s", response["id"])
 
     def parse_fuels(self, fuels: list[dict]):
@@ -145,7 +137,7 @@ class PodPointSource(Source):
             fuels_parsed.append(Fuel(
                 fuel_type=f"EV-{connector['power']} kW",
                 cost=f["price"]["cost"][0]["price"]/100,
-                props=f
+                props=self.retain_fuel_payload(f)
             ))
         return fuels_parsed
 
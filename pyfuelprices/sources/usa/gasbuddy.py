@@ -3,8 +3,9 @@ import logging
 import json
 import uuid
 
-from geopy import distance
+from array import array
 
+from pyfuelprices.distances import within_radius
 from pyfuelprices.fuel_locations import Fuel, FuelLocation
 
 from pyfuelprices.const import (
@@ -13,7 +14,8 @@ from pyfuelprices.const import (
     PROP_AREA_RADIUS,
     PROP_FUEL_LOCATION_SOURCE,
     PROP_FUEL_LOCATION_PREVENT_CACHE_CLEANUP,
-    PROP_FUEL_LOCATION_SOURCE_ID
+    PROP_FUEL_LOCATION_SOURCE_ID,
+    PAYLOAD_RETENTION_SELECTED
 )
 from pyfuelprices.helpers import geocoder
 from pyfuelprices.sources import Source
@@ -43,6 +45,10 @@ class GasBuddyUSASource(Source):
     }
     provider_name = "gasbuddy"
     location_cache = {}
+    fetch_on_miss = True
+    # the location address is only available in the raw payload
+    payload_retention = PAYLOAD_RETENTION_SELECTED
+    payload_keys = ("info.address",)
 
     async def _send_request(self, url) -> str:
         """Send a request to the API and return the raw response."""
@@ -74,30 +80,19 @@ class GasBuddyUSASource(Source):
             station=json.loads(response_raw)["station"]
         )
 
-    async def search_sites(self, coordinates, radius: float) -> list[dict]:
-        """Return all available sites within a given radius."""
-        # first query the API to populate cache / update data in case this data is unavailable.
-        data = await super().search_sites(coordinates, radius)
-        if len(data)>0:
-            return data
-        await self.update(
-            areas=[{
-                PROP_AREA_LAT: coordinates[0],
-                PROP_AREA_LONG: coordinates[1],
-                PROP_AREA_RADIUS: radius
-            }]
-        )
-        return await super().search_sites(coordinates, radius)
+    async def fetch_areas(self, areas: list[dict]):
+        """Populate the cache for areas that returned no results."""
+        await self.update(areas=areas)
 
     async def update_area(self, area) -> bool:
         """Update a given area."""
         coords = (area[PROP_AREA_LAT], area[PROP_AREA_LONG])
         radius = area[PROP_AREA_RADIUS]
-        geocoded = await geocoder.geocode_reverse_lookup(coords)
-        if geocoded is None:
+        country_code = await geocoder.country_code_lookup(coords)
+        if country_code is None:
             _LOGGER.debug("Geocode failed, skipping area %s", area)
             return False
-        if geocoded.raw["address"]["country_code"] not in ["us", "ca"]:
+        if country_code not in ["us", "ca"]:
             _LOGGER.debug("Geocode not within USA, skipping area %s", area)
             return False
         _LOGGER.debug("Searching GasBuddy for FuelLocations at area %s",
@@ -138,29 +133,27 @@ class GasBuddyUSASource(Source):
             postal_code=info['address']['postal_code'],
             currency="USD",
             props={
-                "data": station,
+                "data": self.retain_payload(station),
                 PROP_FUEL_LOCATION_PREVENT_CACHE_CLEANUP: True,
                 PROP_FUEL_LOCATION_SOURCE: self.provider_name,
                 PROP_FUEL_LOCATION_SOURCE_ID: station["id"]
             },
             next_update=self.next_update
         )
-        if site_id not in self.location_cache:
-            self.location_cache[site_id] = loc
-        else:
-            await self.location_cache[site_id].update(loc)
-        return self.location_cache[site_id]
+        return await self._cache_location(loc)
 
     async def _parse_response(self, response, coords, radius) -> list[FuelLocation]:
         if response.get("stations", None) is not None:
             response = response["stations"]
-        for station in response:
-            info = station["info"]
-            if distance.distance(
-                coords,
-                (info["latitude"], info["longitude"])
-            ).miles <= radius:
-                await self.parse_raw_fuel_station(station=station)
+        matches = within_radius(
+            coords,
+            array("d", [float(s["info"]["latitude"]) for s in response]),
+            array("d", [float(s["info"]["longitude"]) for s in response]),
+            radius,
+            inclusive=True
+        )
+        for index, _ in matches:
+            await self.parse_raw_fuel_station(station=response[index])
 
         return list(self.location_cache.values())
 
@@ -173,7 +166,7 @@ class GasBuddyUSASource(Source):
             fuel_parsed.append(Fuel(
                 fuel_type=fuel["fuel_product"],
                 cost=0 if cost is None else cost["price"],
-                props=fuel
+                props=self.retain_fuel_payload(fuel)
             ))
         return fuel_parsed
 
@@ -0,0 +1,215 @@
+"""Spatial indexing for fuel locations."""
+
+import math
+
+from collections.abc import Hashable, Iterator
+
+from .distances import EARTH_RADIUS_MILES, bounding_box
+
+DEFAULT_CELL_SIZE = 0.1  # degrees, roughly 7 miles of latitude
+
+
+def _to_float(value) -> float | None:
+    """Convert a coordinate into a float, returning None if invalid."""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    if math.isnan(value):
+        return None
+    return value
+
+
+class GridIndex:
+    """A uniform latitude / longitude grid index.
+
+    Each key is placed into exactly one cell, cells are stored sparsely so
+    memory grows with the number of stations rather than the area covered.
+    Keys with coordinates that cannot be parsed are kept aside and are
+    always returned as candidates so callers can still apply their own checks.
+    """
+
+    def __init__(self, cell_size: float = DEFAULT_CELL_SIZE):
+        """Create a new grid index."""
+        self.cell_size = cell_size
+        self._columns = int(round(360 / cell_size))
+        self._rows = int(round(180 / cell_size))
+        self._cells: dict[tuple[int, int], set[Hashable]] = {}
+        self._members: dict[Hashable, tuple[int, int] | None] = {}
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __contains__(self, key) -> bool:
+        return key in self._members
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._members)
+
+    def _cell(self, lat: float, long: float) -> tuple[int, int]:
+        """Return the cell for a given coordinate."""
+        row = min(max(int((lat + 90.0) // self.cell_size), 0), self._rows - 1)
+        col = int((long + 180.0) // self.cell_size) % self._columns
+        return row, col
+
+    def insert(self, key: Hashable, lat, long):
+        """Insert or move a key in the index."""
+        lat = _to_float(lat)
+        long = _to_float(long)
+        cell = None
+        if lat is not None and long is not None:
+            cell = self._cell(lat, long)
+        if key in self._members:
+            if self._members[key] == cell:
+                return
+            self.remove(key)
+        self._members[key] = cell
+        self._cells.setdefault(cell, set()).add(key)
+
+    def remove(self, key: Hashable):
+        """Remove a key from the index."""
+        cell = self._members.pop(key, None)
+        bucket = self._cells.get(cell)
+        if bucket is None:
+            return
+        bucket.discard(key)
+        if len(bucket) == 0:
+            del self._cells[cell]
+
+    def clear(self):
+        """Remove all keys from the index."""
+        self._cells.clear()
+        self._members.clear()
+
+    def _bbox_cells(self,
+                    lat_min: float,
+                    lon_min: float,
+                    lat_max: float,
+                    lon_max: float) -> tuple[int, int, int, int]:
+        """Return (row_min, row_max, col_min, col_span) covering a bounding box."""
+        row_min = self._cell(max(lat_min, -90.0), 0)[0]
+        row_max = self._cell(min(lat_max, 90.0), 0)[0]
+        if lon_max - lon_min >= 360.0:
+            return row_min, row_max, 0, self._columns
+        col_min = int((lon_min + 180.0) // self.cell_size)
+        col_span = min(int((lon_max + 180.0) // self.cell_size) - col_min + 1, self._columns)
+        return row_min, row_max, col_min, col_span
+
+    def cell_of(self, key: Hashable) -> tuple[int, int] | None:
+        """Return the cell holding a key, None if it is not indexed or has no valid coordinates."""
+        return self._members.get(key)
+
+    def _occupied_cells(self,
+                        lat_min: float,
+                        lon_min: float,
+                        lat_max: float,
+                        lon_max: float) -> Iterator[tuple[int, int] | None]:
+        """Yield the occupied cells intersecting a bounding box, None first if occupied."""
+        if None in self._cells:
+            yield None
+        row_min, row_max, col_min, col_span = self._bbox_cells(lat_min, lon_min, lat_max, lon_max)
+        rows = row_max - row_min + 1
+        if rows * col_span > len(self._cells):
+            # sparse index, cheaper to walk the occupied cells than the box
+            for cell in self._cells:
+                if cell is None:
+                    continue
+                if row_min <= cell[0] <= row_max and (
+                    (cell[1] - col_min) % self._columns < col_span
+                ):
+                    yield cell
+            return
+        for row in range(row_min, row_max + 1):
+            for col in range(col_min, col_min + col_span):
+                cell = (row, col % self._columns)
+                if cell in self._cells:
+                    yield cell
+
+    def query_bbox(self,
+                   lat_min: float,
+                   lon_min: float,
+                   lat_max: float,
+                   lon_max: float) -> Iterator[Hashable]:
+        """Yield all keys in cells intersecting a bounding box."""
+        for cell in self._occupied_cells(lat_min, lon_min, lat_max, lon_max):
+            yield from self._cells[cell]
+
+    def query_radius(self, lat, long, radius: float) -> Iterator[Hashable]:
+        """Yield candidate keys within radius (miles) of a point.
+
+        Candidates are taken from every cell touching the bounding box of the
+        circle, callers must still apply an exact distance check.
+        """
+        yield from self.query_bbox(*bounding_box(float(lat), float(long), radius))
+
+    def cells_in_radius(self, lat, long, radius: float) -> list[tuple[int, int] | None]:
+        """Return the occupied cells touching a radius (miles) of a point.
+
+        The cell of keys without valid coordinates (None) is included when
+        occupied so callers can still apply their own checks.
+        """
+        return list(self._occupied_cells(*bounding_box(float(lat), float(long), radius)))
+
+    def _in_block(self, cell: tuple[int, int], row0: int, col0: int, ring: int) -> bool:
+        """Return True if a cell is within ring cells of (row0, col0)."""
+        if abs(cell[0] - row0) > ring:
+            return False
+        col_delta = (cell[1] - col0) % self._columns
+        return min(col_delta, self._columns - col_delta) <= ring
+
+    def _ring_bound(self, lat: float, long: float, row0: int, col0: int, ring: int) -> float:
+        """Return the minimum distance (miles) to any cell outside a ring."""
+        bounds = []
+        lat_south = (row0 - ring) * self.cell_size - 90.0
+        lat_north = (row0 + ring + 1) * self.cell_size - 90.0
+        if lat_south > -90.0:
+            bounds.append(math.radians(max(lat - lat_south, 0.0)) * EARTH_RADIUS_MILES)
+        if lat_north < 90.0:
+            bounds.append(math.radians(max(lat_north - lat, 0.0)) * EARTH_RADIUS_MILES)
+        if 2 * ring + 1 < self._columns:
+            lon_west = (col0 - ring) * self.cell_size - 180.0
+            lon_east = (col0 + ring + 1) * self.cell_size - 180.0
+            lon_delta = max(min(long - lon_west, lon_east - long), 0.0)
+            if lon_delta >= 90.0:
+                bounds.append(math.radians(90.0 - abs(lat)) * EARTH_RADIUS_MILES)
+            else:
+                bounds.append(math.asin(
+                    math.cos(math.radians(lat)) * math.sin(math.radians(lon_delta))
+                ) * EARTH_RADIUS_MILES)
+        return min(bounds, default=math.inf)
+
+    def walk_rings(self, lat, long) -> Iterator[tuple[list[Hashable], float]]:
+        """Yield keys ring by ring moving outward from a point.
+
+        Each step yields the keys from the next ring of cells and a lower
+        bound (miles, spherical) on the distance of every key not yet
+        yielded, allowing nearest neighbour searches to stop early. Keys
+        without valid coordinates are never yielded.
+        """
+        lat = float(lat)
+        long = (float(long) + 180.0) % 360.0 - 180.0
+        row0, col0 = self._cell(lat, long)
+        remaining = len(self._members) - len(self._cells.get(None, ()))
+        ring = 0
+        while remaining > 0:
+            if 8 * ring > len(self._cells) or 2 * ring + 1 >= self._columns:
+                # rings are now larger than the occupied cells, finish in one pass
+                yield [
+                    key for cell, keys in self._cells.items()
+                    if cell is not None and not self._in_block(cell, row0, col0, ring - 1)
+                    for key in keys
+                ], math.inf
+                return
+            keys = []
+            for row in range(row0 - ring, row0 + ring + 1):
+                if row < 0 or row >= self._rows:
+                    continue
+                if ring == 0 or abs(row - row0) == ring:
+                    cols = range(col0 - ring, col0 + ring + 1)
+                else:
+                    cols = (col0 - ring, col0 + ring)
+                for col in cols:
+                    keys.extend(self._cells.get((row, col % self._columns), ()))
+            remaining -= len(keys)
+            yield keys, self._ring_bound(lat, long, row0, col0, ring)
+            ring += 1
@@ -45,6 +45,7 @@ setuptools.setup(
     package_data={
         'pyfuelprices': [
             'py.typed',
+            'data/countries.json.gz',
         ]
     },
     classifiers=[
@@ -0,0 +1,72 @@
+"""Shared fixtures for pyfuelprices tests."""
+
+from datetime import datetime
+
+import pytest
+
+from pyfuelprices import FuelPrices, SOURCE_MAP
+from pyfuelprices.const import (
+    PROP_AREA_LAT,
+    PROP_AREA_LONG,
+    PROP_AREA_RADIUS,
+    PROP_FUEL_LOCATION_SOURCE,
+    PROP_FUEL_LOCATION_SOURCE_ID
+)
+from pyfuelprices.fuel_locations import Fuel, FuelLocation
+from pyfuelprices.sources import Source
+
+GRID_STEPS = 2  # sites are placed on a (2 * GRID_STEPS + 1) square grid around an area
+GRID_SPACING = 0.01  # degrees between sites
+
+
+class GridSource(Source):
+    """A source placing a small grid of sites around each area it is asked for."""
+
+    provider_name = "testgrid"
+    country_code = "ZZ"
+    location_cache: dict[str, FuelLocation] = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prices: dict[str, float] = {}
+        self.requested: list[dict] = []
+
+    async def update_area(self, area: dict) -> bool:
+        self.requested.append(area)
+        for row in range(-GRID_STEPS, GRID_STEPS + 1):
+            for column in range(-GRID_STEPS, GRID_STEPS + 1):
+                lat = round(area[PROP_AREA_LAT] + row * GRID_SPACING, 6)
+                long = round(area[PROP_AREA_LONG] + column * GRID_SPACING, 6)
+                site_id = f"{lat}_{long}"
+                await self._cache_location(FuelLocation.create(
+                    site_id=site_id,
+                    name=f"Site {site_id}",
+                    address="Test",
+                    lat=lat,
+                    long=long,
+                    brand="Test",
+                    available_fuels=[Fuel("E10", self.prices.get(site_id, 1.5), {})],
+                    last_updated=datetime.now(),
+                    currency="GBP",
+                    props={
+                        PROP_FUEL_LOCATION_SOURCE: self.provider_name,
+                        PROP_FUEL_LOCATION_SOURCE_ID: site_id,
+                        "data": self.retain_payload({"id": site_id, "grid": [row, column]})
+                    }
+                ))
+        return True
+
+
+@pytest.fixture
+def grid_source(monkeypatch) -> type[GridSource]:
+    """Register GridSource with an empty cache."""
+    monkeypatch.setattr(GridSource, "location_cache", {})
+    monkeypatch.setattr(FuelPrices, "configured_sources", {})
+    monkeypatch.setattr(FuelPrices, "_accessed_sites", {})
+    monkeypatch.setitem(SOURCE_MAP, GridSource.provider_name, (GridSource, 1, 0, 0))
+    return GridSource
+
+
+def area(lat: float, long: float, radius: float = 2.0) -> dict:
+    """Return an area dict."""
+    return {PROP_AREA_LAT: lat, PROP_AREA_LONG: long, PROP_AREA_RADIUS: radius}
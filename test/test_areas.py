@@ -0,0 +1,91 @@
+"""Tests for area planning."""
+
+import math
+
+from types import SimpleNamespace
+
+from geopy import distance
+
+from pyfuelprices.areas import attribute_sites, plan_areas
+from pyfuelprices.const import PROP_AREA_LAT, PROP_AREA_LONG, PROP_AREA_RADIUS
+
+
+def _area(lat: float, long: float, radius: float) -> dict:
+    return {PROP_AREA_LAT: lat, PROP_AREA_LONG: long, PROP_AREA_RADIUS: radius}
+
+
+def _site(lat: float, long: float) -> SimpleNamespace:
+    return SimpleNamespace(lat=lat, long=long)
+
+
+def _boundary(area: dict, count: int = 72):
+    """Yield points on the edge of an area."""
+    for step in range(count):
+        point = distance.distance(miles=area[PROP_AREA_RADIUS]).destination(
+            (area[PROP_AREA_LAT], area[PROP_AREA_LONG]), 360 * step / count
+        )
+        yield point.latitude, point.longitude
+
+
+def _covered(point, plan: list[dict]) -> bool:
+    return any(
+        distance.distance(point, (a[PROP_AREA_LAT], a[PROP_AREA_LONG])).miles <= a[PROP_AREA_RADIUS]
+        for a in plan
+    )
+
+
+def test_contained_area_is_dropped():
+    outer = _area(52.0, -0.75, 10.0)
+    inner = _area(52.01, -0.76, 2.0)
+    assert plan_areas([inner, outer]) == [(outer, [inner, outer])]
+
+
+def test_disjoint_areas_are_kept():
+    first = _area(52.0, -0.75, 2.0)
+    second = _area(53.0, -1.75, 2.0)
+    assert plan_areas([first, second]) == [(first, [first]), (second, [second])]
+
+
+def test_merged_area_covers_originals():
+    areas = [
+        _area(52.041627, -0.759651, 5.0),
+        _area(52.06, -0.74, 5.0),
+        _area(-31.95, 115.86, 8.0),
+        _area(-31.93, 115.88, 7.5),
+        _area(64.1, -21.9, 4.0),
+        _area(64.11, -21.87, 4.0),
+    ]
+    plan = plan_areas(areas)
+    assert [covered for _, covered in plan] == [areas[0:2], areas[2:4], areas[4:6]]
+    for area in areas:
+        for point in _boundary(area):
+            assert _covered(point, [covering for covering, _ in plan])
+
+
+def test_merge_respects_max_radius():
+    areas = [_area(52.041627, -0.759651, 5.0), _area(52.06, -0.74, 5.0)]
+    assert plan_areas(areas, max_radius=5.5) == [(area, [area]) for area in areas]
+    merged = plan_areas(areas, max_radius=6.0)
+    assert len(merged) == 1
+    assert merged[0][0][PROP_AREA_RADIUS] <= 6.0
+    assert merged[0][1] == areas
+
+
+def test_areas_without_radius_pass_through():
+    area = {"name": "no radius"}
+    assert plan_areas([area]) == [(area, [area])]
+    assert math.isclose(plan_areas([_area(1.0, 1.0, 1.0)])[0][0][PROP_AREA_RADIUS], 1.0)
+
+
+def test_sites_are_attributed_to_each_area():
+    first = _area(52.0, -0.75, 1.0)
+    second = _area(52.01, -0.75, 1.0)
+    sites = {
+        "both": _site(52.005, -0.75),
+        "first": _site(51.995, -0.75),
+        "second": _site(52.02, -0.75),
+        "neither": _site(53.0, -0.75),
+    }
+    assert attribute_sites([first, second, {"name": "no radius"}], sites) == [
+        {"both", "first"}, {"both", "second"}, set()
+    ]
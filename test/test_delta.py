@@ -0,0 +1,64 @@
+"""Tests for change-only deltas."""
+
+import asyncio
+
+import aiohttp
+
+from pyfuelprices.delta import UpdateDelta
+
+from conftest import GridSource, area
+
+POINT = (52.0, -0.75)
+SITE_ID = "52.0_-0.75"
+
+
+def test_changes_are_merged():
+    delta = UpdateDelta()
+    assert not delta
+    delta.price_changed("a", "E10", 1.5, 1.4)
+    delta.price_changed("a", "E10", 1.4, 1.3)
+    delta.price_changed("b", "E10", 1.5, 1.4)
+    delta.price_changed("b", "E10", 1.4, 1.5)
+    delta.site_moved("c", (1, 1), (2, 2))
+    delta.site_moved("c", (2, 2), (3, 3))
+    assert delta.prices == {"a": {"E10": (1.5, 1.3)}}
+    assert delta.relocated == {"c": ((1, 1), (3, 3))}
+
+    delta.site_added("d")
+    delta.price_changed("d", "E10", None, 1.5)
+    delta.site_removed("a")
+    delta.site_removed("d")
+    assert delta.added == set()
+    assert delta.removed == {"a"}
+    assert delta.prices == {}
+
+
+def test_source_deltas_follow_the_cache(grid_source):
+    async def run():
+        async with aiohttp.ClientSession() as session:
+            src = GridSource(client_session=session)
+            await src.update_area(area(*POINT))
+            delta = src.take_delta()
+            assert len(delta.added) == 25 and not delta.removed and not delta.prices
+            assert not src.has_changes
+
+            # unchanged responses leave the delta empty
+            await src.update_area(area(*POINT))
+            assert not src.take_delta()
+
+            src.prices[SITE_ID] = 1.4
+            await src.update_area(area(*POINT))
+            assert src.take_delta().prices == {SITE_ID: {"E10": (1.5, 1.4)}}
+
+            # the provider moves the site back to its reported coordinates
+            src.location_cache[SITE_ID].lat = 52.001
+            await src.update_area(area(*POINT))
+            assert src.take_delta().relocated == {SITE_ID: ((52.001, -0.75), (52.0, -0.75))}
+
+            src._remove_location(SITE_ID)
+            delta = src.take_delta()
+            assert delta.removed == {SITE_ID} and not delta.added
+            await src.update_area(area(*POINT))
+            assert src.take_delta().added == {SITE_ID}
+
+    asyncio.run(run())
@@ -0,0 +1,66 @@
+"""Tests for the cache evictor."""
+
+from datetime import datetime
+
+from pyfuelprices.eviction import CacheEvictor
+from pyfuelprices.fuel_locations import FuelLocation
+
+
+def _cache(count: int) -> dict[str, FuelLocation]:
+    return {
+        str(index): FuelLocation.create(
+            site_id=str(index),
+            name="Site",
+            address="Test",
+            lat=52.0,
+            long=-0.75,
+            brand="Test",
+            available_fuels=[],
+            last_updated=datetime(2024, 1, 1)
+        )
+        for index in range(count)
+    }
+
+
+def _evict(evictor: CacheEvictor, cache: dict, expiry_tick=None, pinned=frozenset()) -> list[str]:
+    evicted = []
+    for key in evictor.candidates(cache, expiry_tick, lambda key, _: key in pinned):
+        del cache[key]
+        evicted.append(key)
+    return evicted
+
+
+def test_least_recently_used_sites_are_evicted_first():
+    cache = _cache(5)
+    evictor = CacheEvictor(max_sites=3)
+    for tick, (key, site) in enumerate(cache.items()):
+        evictor.track(key, site, tick)
+    # a read after tracking moves the site to the back of the queue
+    cache["0"].last_access = 10
+    assert _evict(evictor, cache, pinned={"1"}) == ["2", "3"]
+    assert set(cache) == {"0", "1", "4"}
+    assert len(evictor) == 3
+
+
+def test_only_expiring_sites_follow_the_ttl():
+    cache = _cache(4)
+    evictor = CacheEvictor()
+    for key, site in cache.items():
+        evictor.track(key, site, 1, ttl_exempt=key == "0")
+    cache["1"].last_access = 5
+    assert _evict(evictor, cache, expiry_tick=5, pinned={"2"}) == ["3"]
+    assert _evict(evictor, cache, expiry_tick=6) == ["1"]
+    assert set(cache) == {"0", "2"}
+
+
+def test_refreshed_sites_are_not_expired():
+    cache = _cache(2)
+    evictor = CacheEvictor()
+    for key, site in cache.items():
+        evictor.track(key, site, 1)
+    # "0" is refreshed by every update but never read
+    for tick in range(2, 10):
+        evictor.track("0", cache["0"], tick)
+    assert _evict(evictor, cache, expiry_tick=5) == ["1"]
+    assert _evict(evictor, cache, expiry_tick=9) == []
+    assert _evict(evictor, cache, expiry_tick=10) == ["0"]
@@ -0,0 +1,92 @@
+"""Tests for FuelLocation and its dict forms."""
+
+import json
+
+from datetime import datetime
+
+import pytest
+
+from pyfuelprices.fuel import Fuel
+from pyfuelprices.fuel_locations import FuelLocation
+from pyfuelprices.retention import CompressedPayload
+
+RAW = {"id": 1, "opening": {"monday": ["06:00", "22:00"]}}
+
+
+def _location() -> FuelLocation:
+    return FuelLocation.create(
+        site_id="a",
+        name="Site",
+        address="High Street",
+        lat=52.0,
+        long=-0.75,
+        brand="Test",
+        available_fuels=[Fuel("E10", 1.5, CompressedPayload({"grade": 95}))],
+        last_updated=datetime(2024, 1, 1),
+        props={"source": "test", "data": CompressedPayload(RAW)}
+    )
+
+
+def test_to_dict_decodes_compressed_payloads():
+    payload = _location().to_dict()
+    assert payload["props"]["data"] == RAW
+    assert payload["fuel_details"]["E10"] == {"grade": 95}
+    assert json.loads(json.dumps(payload))["props"]["data"] == RAW
+
+
+def test_serialized_is_reused_until_changed():
+    location = _location()
+    first = location.serialized()
+    assert location.serialized() is first
+    location.get_fuel("E10").update("E10", 1.4, location.get_fuel("E10").props)
+    assert location.serialized() is not first
+    assert location.serialized()["available_fuels"] == {"E10": 1.4}
+    location.last_updated = datetime(2024, 1, 2)
+    assert location.serialized()["last_updated"] == "2024-01-02T00:00:00"
+
+    # empty mappings share one read only dict
+    location.available_fuels = [Fuel("E10", 1.5, {}), Fuel("B7", 1.6, {})]
+    details = location.serialized()["fuel_details"]
+    assert details == {"E10": {}, "B7": {}} and details["E10"] is details["B7"]
+
+
+def test_dict_forms_do_not_share_state():
+    location = _location()
+    location.props["data"] = {"opening": {"monday": ["06:00", "22:00"]}}
+    location.props = dict(location.props)
+    frozen = location.serialized()
+    for change in (
+        lambda: frozen["available_fuels"].__setitem__("E10", 0),
+        lambda: frozen["props"].__setitem__("source", "changed"),
+        lambda: frozen["props"]["data"]["opening"].__setitem__("monday", None),
+        lambda: frozen["props"]["data"]["opening"]["monday"].append("23:00"),
+    ):
+        with pytest.raises((TypeError, AttributeError)):
+            change()
+
+    payload = location.to_dict()
+    payload["available_fuels"]["E10"] = 0
+    payload["fuel_details"]["E10"]["grade"] = 98
+    payload["props"]["data"]["opening"]["monday"].append("23:00")
+    assert location.serialized() is frozen
+    assert location.to_dict()["props"]["data"]["opening"]["monday"] == ["06:00", "22:00"]
+    assert location.to_dict()["available_fuels"] == {"E10": 1.5}
+    assert location.to_dict()["fuel_details"]["E10"] == {"grade": 95}
+
+
+def test_results_share_the_serialized_form():
+    location = _location()
+    location.props = {"source": "test", "data": {"id": 1}}
+    location.available_fuels = [Fuel("E10", 1.5, {"grade": 95})]
+    result = location.as_result(distance=1.0)
+    assert result["distance"] == 1.0
+    assert result["props"] is location.serialized()["props"]
+    assert result["fuel_details"] is location.serialized()["fuel_details"]
+    with pytest.raises(TypeError):
+        result["props"]["data"]["id"] = 2
+    assert json.loads(json.dumps(result))["props"] == {"source": "test", "data": {"id": 1}}
+
+    # compressed payloads are only decoded for sites holding them
+    compressed = _location().as_result()
+    assert compressed["props"]["data"] == RAW
+    assert compressed["fuel_details"]["E10"] == {"grade": 95}
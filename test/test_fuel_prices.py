@@ -0,0 +1,220 @@
+"""End to end tests for FuelPrices."""
+
+import asyncio
+import json
+
+import aiohttp
+import pytest
+
+import pyfuelprices
+
+from pyfuelprices import FuelPrices
+from pyfuelprices.access import ACCESS_CLOCK
+from pyfuelprices.const import PROP_AREA_LAT, PROP_AREA_LONG
+from pyfuelprices.fuel import Fuel
+from pyfuelprices.paging import encode_cursor
+from pyfuelprices.shared import read_generation
+from pyfuelprices.snapshot import write_snapshot
+
+from conftest import GRID_SPACING, area
+
+HOME = area(52.0, -0.75)
+AWAY = area(53.0, -1.75)
+
+
+def _run(config: dict, test):
+    """Create FuelPrices from a config and run a coroutine function against it."""
+    async def run():
+        async with aiohttp.ClientSession() as session:
+            await test(FuelPrices.create(client_session=session, configuration=config))
+
+    asyncio.run(run())
+
+
+def test_sources_receive_configured_areas(grid_source):
+    async def test(fuel_prices: FuelPrices):
+        src = fuel_prices.configured_sources["testgrid"]
+        assert src.configured_areas == [HOME]
+        fuel_prices.configured_areas = [AWAY]
+        assert src.configured_areas == [AWAY]
+
+    _run({"providers": {"testgrid": {}}, "areas": [HOME]}, test)
+
+
+def test_update_pins_sites_in_configured_areas(grid_source):
+    async def test(fuel_prices: FuelPrices):
+        src = fuel_prices.configured_sources["testgrid"]
+        deltas = await fuel_prices.update()
+        home_sites = set(src.location_cache)
+        assert len(home_sites) == 25
+        assert deltas["testgrid"].added == home_sites
+        assert len(src.sites_in_area()) > 0
+
+        # sites outside the configured areas are only kept until they expire
+        await src.fetch_areas([AWAY])
+        assert len(src.location_cache) == 50
+        assert len(src.take_delta().added) == 25
+        deltas = await fuel_prices.update()
+        assert set(src.location_cache) == home_sites
+        assert len(deltas["testgrid"].removed) == 25
+
+        # sites pinned by the old areas expire once the areas change
+        fuel_prices.configured_areas = [AWAY]
+        await fuel_prices.update()
+        await fuel_prices.update()
+        assert len(src.location_cache) == 0
+
+    _run({"providers": {"testgrid": {"cache_ttl_hours": 0}}, "areas": [HOME]}, test)
+
+
+def test_queries_across_sources(grid_source):
+    async def test(fuel_prices: FuelPrices):
+        await fuel_prices.update()
+        point = (HOME[PROP_AREA_LAT], HOME[PROP_AREA_LONG])
+        locations = await fuel_prices.find_fuel_locations_from_point(point, 0.75)
+        assert len(locations) == 5
+        nearest = await fuel_prices.find_nearest(point, 3)
+        assert [loc["distance"] for loc in nearest] == sorted(loc["distance"] for loc in nearest)
+        assert nearest[0]["distance"] == 0
+        assert nearest[2]["distance"] < GRID_SPACING * 70
+
+    _run({"providers": {"testgrid": {}}, "areas": [HOME]}, test)
+
+
+def test_results_are_plain_json(grid_source):
+    async def test(fuel_prices: FuelPrices):
+        await fuel_prices.update()
+        point = (HOME[PROP_AREA_LAT], HOME[PROP_AREA_LONG])
+        for locations in (
+            await fuel_prices.find_fuel_locations_from_point(point, 1.0),
+            await fuel_prices.find_fuel_from_point(point, 1.0, "E10"),
+            await fuel_prices.find_cheapest_fuel(point, 1.0, "E10"),
+            await fuel_prices.find_nearest(point, 2),
+        ):
+            assert len(locations) > 0
+            decoded = json.loads(json.dumps(locations))
+            assert decoded[0]["props"]["data"]["id"] == locations[0]["id"]
+
+    _run({
+        "providers": {"testgrid": {"payload_retention": "compressed"}},
+        "areas": [HOME]
+    }, test)
+
+
+def test_every_query_records_access(grid_source):
+    async def test(fuel_prices: FuelPrices):
+        await fuel_prices.update()
+        src = fuel_prices.configured_sources["testgrid"]
+        point = (HOME[PROP_AREA_LAT], HOME[PROP_AREA_LONG])
+        queries = {
+            "radius": lambda: fuel_prices.find_fuel_locations_from_point(point, 0.75),
+            "nearest": lambda: fuel_prices.find_nearest(point, 3),
+            "points": lambda: fuel_prices.find_fuel_from_points([{
+                **area(*point, 0.75), "fuel_type": "E10"
+            }]),
+            "route": lambda: fuel_prices.find_fuel_along_route(
+                [point, (point[0] + GRID_SPACING, point[1])], 0.1, "E10"
+            ),
+        }
+        for name, query in queries.items():
+            for _ in range(2):  # the second radius query is served from the query cache
+                ACCESS_CLOCK.advance()
+                locations = await query()
+                if name == "points":
+                    locations = locations[0]
+                assert len(locations) > 0, name
+                assert all(
+                    src.location_cache[loc["id"]].last_access == ACCESS_CLOCK.tick
+                    for loc in locations
+                ), name
+
+    _run({"providers": {"testgrid": {}}, "areas": [HOME]}, test)
+
+
+def test_snapshot_is_loaded_and_only_saved_after_changes(grid_source, monkeypatch, tmp_path):
+    config = {"providers": {"testgrid": {}}, "areas": [HOME], "snapshot_path": str(tmp_path / "snapshot")}
+    writes = []
+    monkeypatch.setattr(pyfuelprices, "write_snapshot", lambda *args: writes.append(args))
+
+    async def first(fuel_prices: FuelPrices):
+        await fuel_prices.update()
+        await fuel_prices.update()
+        assert len(writes) == 1
+        fuel_prices.configured_sources["testgrid"].location_cache[
+            f"{HOME[PROP_AREA_LAT]}_{HOME[PROP_AREA_LONG]}"
+        ].add_or_update_fuel(Fuel("E10", 1.4, {}))
+        await fuel_prices.update()
+        assert len(writes) == 2
+        write_snapshot(*writes[-1])
+
+    _run(config, first)
+    monkeypatch.setattr(grid_source, "location_cache", {})
+
+    async def restart(fuel_prices: FuelPrices):
+        src = fuel_prices.configured_sources["testgrid"]
+        assert len(src.location_cache) == 0
+        deltas = await fuel_prices.update()
+        assert len(deltas["testgrid"].added) == 25
+        assert src.requested == []
+        assert (await fuel_prices.find_fuel_from_point(
+            (HOME[PROP_AREA_LAT], HOME[PROP_AREA_LONG]), 0.1, "E10"
+        ))[0]["cost"] == 1.4
+
+    _run(config, restart)
+
+
+def test_shared_snapshot_is_only_published_after_changes(grid_source, tmp_path):
+    async def test(fuel_prices: FuelPrices):
+        await fuel_prices.update()
+        await fuel_prices.update()
+        assert read_generation(str(tmp_path)) == 1
+        site = next(iter(fuel_prices.configured_sources["testgrid"].location_cache.values()))
+        site.add_or_update_fuel(Fuel("E10", 1.4, {}))
+        await fuel_prices.update()
+        assert read_generation(str(tmp_path)) == 2
+
+        reader = FuelPrices.create(client_session=fuel_prices.client_session, configuration={})
+        reader.attach_shared_snapshot(str(tmp_path))
+        assert (await reader.find_fuel_from_point(
+            (site.lat, site.long), 0.01, "E10"
+        ))[0]["cost"] == 1.4
+
+    _run({"providers": {"testgrid": {}}, "areas": [HOME], "shared_snapshot_publish": str(tmp_path)}, test)
+
+
+def test_cursor_pages_cover_all_results(grid_source):
+    async def test(fuel_prices: FuelPrices):
+        await fuel_prices.update()
+        src = fuel_prices.configured_sources["testgrid"]
+        # a few equal prices so pages also have to break ties
+        for index, site_id in enumerate(sorted(src.location_cache)):
+            src.location_cache[site_id].add_or_update_fuel(Fuel("E10", 1.4 + (index % 7) / 100, {}))
+        point = (HOME[PROP_AREA_LAT], HOME[PROP_AREA_LONG])
+        for query, order in (
+            (fuel_prices.find_fuel_locations_from_point, lambda loc: (loc["distance"], loc["id"])),
+            (lambda *args, **kwargs: fuel_prices.find_fuel_from_point(*args[:2], "E10", **kwargs),
+             lambda loc: (loc["cost"], loc["distance"], loc["id"])),
+        ):
+            everything = await query(point, 5.0)
+            pages = []
+            cursor = None
+            while True:
+                page = await query(point, 5.0, limit=4, cursor=cursor)
+                if len(page) == 0:
+                    break
+                pages.append(page)
+                cursor = page[-1]["cursor"]
+            paged = [loc for page in pages for loc in page]
+            assert len(pages) == 7
+            assert [loc["id"] for loc in paged] == [loc["id"] for loc in sorted(everything, key=order)]
+            assert [loc["id"] for loc in await query(point, 5.0, limit=4, offset=8)] == [
+                loc["id"] for loc in pages[2]
+            ]
+
+        with pytest.raises(ValueError):
+            await fuel_prices.find_fuel_locations_from_point(point, 5.0, cursor="not a cursor")
+        for key in (["1.4", 0.5, "52.0_-0.75"], [1.4, 0.5], [1.4, 0.5, 7]):
+            with pytest.raises(ValueError):
+                await fuel_prices.find_fuel_from_point(point, 5.0, "E10", cursor=encode_cursor(key))
+
+    _run({"providers": {"testgrid": {}}, "areas": [HOME]}, test)
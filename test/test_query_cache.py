@@ -0,0 +1,78 @@
+"""Tests for cached radius queries."""
+
+import asyncio
+
+import aiohttp
+
+from pyfuelprices.access import ACCESS_CLOCK
+from pyfuelprices.fuel import Fuel
+from pyfuelprices.query_cache import RadiusQueryCache
+
+from conftest import GridSource, area
+
+POINT = (52.0, -0.75)
+
+
+def _run(test):
+    """Run a coroutine function against an empty GridSource."""
+    async def run():
+        async with aiohttp.ClientSession() as session:
+            src = GridSource(client_session=session)
+            await src.update_area(area(*POINT))
+            await test(src)
+
+    asyncio.run(run())
+
+
+def _prices(locations: list[dict]) -> dict:
+    return {loc["id"]: loc["available_fuels"].get("E10") for loc in locations}
+
+
+def test_smaller_radius_is_served_from_cache():
+    cache = RadiusQueryCache()
+    sites = [("a", 0.5), ("b", 1.5)]
+    cache.put(POINT, 2.0, 1, sites)
+    assert cache.get(POINT, 2.0, 1) == sites
+    assert cache.get(POINT, 1.0, 1) == [sites[0]]
+    assert cache.get(POINT, 3.0, 1) is None
+    assert cache.get(POINT, 1.0, 2) is None
+    assert len(cache) == 0
+
+
+def test_price_update_invalidates_cached_results(grid_source):
+    async def test(src: GridSource):
+        before = _prices(await src.search_sites(POINT, 1.0))
+        site_id = next(iter(before))
+        site = src.location_cache[site_id]
+        assert before[site_id] == 1.5
+
+        # as parsers refreshing prices on cached sites do
+        site.add_or_update_fuel(Fuel("E10", 1.4, {}))
+        assert _prices(await src.search_sites(POINT, 1.0))[site_id] == 1.4
+        site.get_fuel("E10").update("E10", 1.3, {})
+        assert _prices(await src.search_sites(POINT, 1.0))[site_id] == 1.3
+        site.get_fuel("E10").update("E10", 1.3, {"pump": 1})
+        locations = await src.search_sites(POINT, 1.0)
+        assert [loc["fuel_details"]["E10"] for loc in locations if loc["id"] == site_id] == [{"pump": 1}]
+
+    _run(test)
+
+
+def test_removed_sites_are_not_cached_results(grid_source):
+    async def test(src: GridSource):
+        locations = await src.search_sites(POINT, 1.0)
+        site_id = locations[0]["id"]
+        src._remove_location(site_id)
+        assert site_id not in _prices(await src.search_sites(POINT, 1.0))
+
+    _run(test)
+
+
+def test_cached_results_record_access(grid_source):
+    async def test(src: GridSource):
+        locations = await src.search_sites(POINT, 1.0)
+        ACCESS_CLOCK.advance()
+        assert await src.search_sites(POINT, 1.0) == locations
+        assert {src.location_cache[loc["id"]].last_access for loc in locations} == {ACCESS_CLOCK.tick}
+
+    _run(test)
@@ -0,0 +1,128 @@
+"""Tests for the cache bookkeeping of sources."""
+
+import asyncio
+
+from datetime import datetime
+
+import aiohttp
+
+from pyfuelprices.distances import haversine
+from pyfuelprices.fuel import Fuel
+from pyfuelprices.fuel_locations import FuelLocation
+from pyfuelprices.snapshot import read_snapshot, write_snapshot
+from pyfuelprices.spatial import GridIndex
+
+from conftest import GridSource, area
+
+POINT = (52.0, -0.75)
+
+
+def _run(test, configuration: dict | None = None):
+    """Run a coroutine function against a GridSource caching one area."""
+    async def run():
+        async with aiohttp.ClientSession() as session:
+            src = GridSource(client_session=session, configuration=configuration)
+            await src.update_area(area(*POINT))
+            src.take_delta()
+            await test(src)
+
+    asyncio.run(run())
+
+
+def test_fuel_added_to_cached_site_is_tracked(grid_source):
+    async def test(src: GridSource):
+        site_id = "52.0_-0.75"
+        site = src.location_cache[site_id]
+        site.add_or_update_fuel(Fuel("B7", 1.6, {}))
+
+        cheapest = src.cheapest_sites(POINT, 1.0, "B7")
+        assert [(cost, s.id) for cost, _, s in cheapest] == [(1.6, site_id)]
+        assert site.get_fuel("B7").history is not None
+        assert src.take_delta().prices == {site_id: {"B7": (None, 1.6)}}
+
+        site.get_fuel("B7").update("B7", 1.55, {})
+        assert src.cheapest_sites(POINT, 1.0, "B7")[0][0] == 1.55
+        assert list(site.price_history("B7")[1]) == [1600, 1550]
+        assert src.take_delta().prices == {site_id: {"B7": (1.6, 1.55)}}
+
+        site.available_fuels = [Fuel("E10", 1.5, {})]
+        assert src.cheapest_sites(POINT, 1.0, "B7") == []
+        assert src.take_delta().prices == {site_id: {"B7": (1.55, None)}}
+
+    _run(test, {"price_history_size": 4})
+
+
+def test_snapshot_restores_price_history(grid_source, tmp_path):
+    async def test(src: GridSource):
+        site_id = "52.0_-0.75"
+        src.location_cache[site_id].get_fuel("E10").update("E10", 1.45, {})
+        write_snapshot(str(tmp_path / "snapshot"), {"testgrid": src.snapshot()})
+
+        restored = GridSource(client_session=src._client_session, configuration={"price_history_size": 4})
+        restored.location_cache = {}
+        assert restored.load_snapshot(read_snapshot(str(tmp_path / "snapshot"))["testgrid"]) == 25
+        site = restored.location_cache[site_id]
+        assert list(site.price_history("E10")[1]) == [1500, 1450]
+        site.get_fuel("E10").update("E10", 1.4, {})
+        assert list(site.price_history("E10")[1]) == [1500, 1450, 1400]
+
+    _run(test, {"price_history_size": 4})
+
+
+def test_sites_replaced_directly_are_reindexed(grid_source):
+    async def test(src: GridSource):
+        shared = GridIndex()
+        src.share_location_tree(shared)
+        site_id = "52.0_-0.75"
+        moved = FuelLocation.create(
+            site_id=site_id,
+            name="Moved",
+            address="Test",
+            lat=40.0,
+            long=10.0,
+            brand="Test",
+            available_fuels=[Fuel("E10", 1.2, {})],
+            last_updated=datetime.now()
+        )
+        # the cache keeps its length, only the entry is replaced
+        src.location_cache[site_id] = moved
+        assert [loc["name"] for loc in await src.search_sites((40.0, 10.0), 1.0)] == ["Moved"]
+        assert site_id not in {loc["id"] for loc in await src.search_sites(POINT, 1.0)}
+        assert list(shared.query_radius(40.0, 10.0, 1.0)) == [("testgrid", site_id)]
+        assert src.cheapest_sites((40.0, 10.0), 1.0, "E10")[0][2] is moved
+
+    _run(test)
+
+
+def test_update_attributes_results_to_configured_areas(grid_source):
+    outer = area(*POINT, 1.0)
+    inner = area(POINT[0] + 0.005, POINT[1], 0.5)
+    failing = area(40.0, 10.0, 1.0)
+
+    class FailingGridSource(GridSource):
+        async def update_area(self, area: dict) -> bool:
+            if area is failing:
+                raise ValueError("unavailable")
+            return await super().update_area(area)
+
+    def within(site_ids, centre, radius):
+        return {
+            site_id for site_id in site_ids
+            if haversine(*centre, *map(float, site_id.split("_"))) < radius
+        }
+
+    async def run():
+        async with aiohttp.ClientSession() as session:
+            src = FailingGridSource(client_session=session)
+            await src.update(areas=[inner, outer, failing], force=True)
+            # the inner area is fetched through the outer one
+            assert src.requested == [outer]
+            results = {id(a): result for a, result in src.area_results}
+            assert results[id(outer)] == within(src.location_cache, POINT, 1.0)
+            assert results[id(inner)] == within(
+                src.location_cache, (POINT[0] + 0.005, POINT[1]), 0.5
+            )
+            assert results[id(inner)] < results[id(outer)]
+            assert isinstance(results[id(failing)], ValueError)
+
+    asyncio.run(run())
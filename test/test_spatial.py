@@ -0,0 +1,100 @@
+"""Tests for the spatial index against brute force searches."""
+
+import asyncio
+import random
+
+from datetime import datetime
+
+import pytest
+
+from pyfuelprices.distances import sites_within_radius
+from pyfuelprices.fuel import Fuel
+from pyfuelprices.fuel_locations import FuelLocation
+from pyfuelprices.price_index import PriceIndex
+from pyfuelprices.sources import nearest_locations
+from pyfuelprices.spatial import GridIndex
+
+# clusters away from and across the antimeridian and close to a pole
+CENTRES = [(52.0, -0.75), (-33.9, 179.95), (89.5, 10.0)]
+
+
+def _sites(count: int = 300) -> dict[str, FuelLocation]:
+    generator = random.Random(1)
+    sites = {}
+    for index in range(count):
+        lat, long = CENTRES[index % len(CENTRES)]
+        lat = min(lat + generator.uniform(-0.5, 0.5), 90.0)
+        long = (long + generator.uniform(-0.5, 0.5) + 180.0) % 360.0 - 180.0
+        sites[str(index)] = FuelLocation.create(
+            site_id=str(index),
+            name="Site",
+            address="Test",
+            lat=lat,
+            long=long,
+            brand="Test",
+            available_fuels=[Fuel("E10", 1.5, {})] if index % 2 else [],
+            last_updated=datetime(2024, 1, 1)
+        )
+    return sites
+
+
+def _index(sites: dict[str, FuelLocation]) -> GridIndex:
+    tree = GridIndex()
+    for site_id, site in sites.items():
+        tree.insert(site_id, site.lat, site.long)
+    return tree
+
+
+@pytest.mark.parametrize("coordinates", CENTRES + [(-33.9, -179.95)])
+@pytest.mark.parametrize("radius", [0.5, 5.0, 25.0])
+def test_radius_query_matches_brute_force(coordinates, radius):
+    sites = _sites()
+    tree = _index(sites)
+    candidates = [sites[key] for key in tree.query_radius(*coordinates, radius)]
+    expected = {site.id for site, _ in sites_within_radius(coordinates, sites.values(), radius)}
+    assert {site.id for site, _ in sites_within_radius(coordinates, candidates, radius)} == expected
+
+
+@pytest.mark.parametrize("coordinates", CENTRES + [(-33.9, -179.95), (0.0, 0.0)])
+@pytest.mark.parametrize("fuel_type", [None, "E10"])
+def test_nearest_matches_brute_force(coordinates, fuel_type):
+    sites = _sites()
+    tree = _index(sites)
+    ranked = sorted(
+        (dist, site.id)
+        for site, dist in sites_within_radius(coordinates, sites.values(), 20000.0)
+        if fuel_type is None or fuel_type in site._fuels
+    )
+    for k in (1, 10, 150):
+        nearest = asyncio.run(nearest_locations(tree, sites.get, coordinates, k, fuel_type))
+        assert [loc["id"] for loc in nearest] == [site_id for _, site_id in ranked[:k]]
+
+
+@pytest.mark.parametrize("coordinates", CENTRES + [(-33.9, -179.95)])
+@pytest.mark.parametrize("radius", [0.5, 5.0, 25.0])
+def test_cheapest_in_cells_matches_brute_force(coordinates, radius):
+    sites = _sites()
+    tree = _index(sites)
+    prices = PriceIndex(cell_of=tree.cell_of)
+    generator = random.Random(2)
+    costs = {site_id: round(generator.uniform(1.2, 1.8), 2) for site_id in sites}
+    for site_id, cost in costs.items():
+        prices.set(site_id, "E10", cost)
+    # repricing a moved site places all of its fuels in its new cell
+    prices.set("0", "B7", 1.6)
+    tree.insert("0", *coordinates)
+    sites["0"].lat, sites["0"].long = coordinates
+    prices.set("0", "E10", 1.1)
+    costs["0"] = 1.1
+    assert list(prices.cheapest("B7", tree.cells_in_radius(*coordinates, 0.1))) == [(1.6, "0")]
+
+    within = {site.id for site, _ in sites_within_radius(coordinates, sites.values(), radius)}
+    expected = sorted((costs[site_id], site_id) for site_id in within)
+    cheapest = [
+        (cost, site_id) for cost, site_id in prices.cheapest(
+            "E10", tree.cells_in_radius(*coordinates, radius)
+        )
+        if site_id in within
+    ]
+    assert cheapest == expected
+    assert len(prices) == len(sites) + 1